@@ -0,0 +1,88 @@
+import argparse
+import os
+import statistics
+import pandas as pd
+
+from bench_engine import (BATCH_POOL, BATCH_SIZES, budget_for, fit_batch_costs, kem_calls,
+                          kem_input_pool, null_call_cost, sample_batched)
+from bench_env import isolate_process
+from bench_keypool import pool_keypairs
+from bench_registry import load
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+
+# -------------------------------
+# Sweep batch sizes for every selected operation of one backend
+# One row per (operation, batch size). PerCallSlope_ms / BlockOverhead_ms
+# come from a linear fit of block time over batch size for that
+# operation. The slope still holds the per-iteration loop and call
+# dispatch; NullCall_ms is that cost alone (same loop around a no-op
+# function), fitted the same way into NullSlope_ms, so Intrinsic_ms =
+# PerCallSlope_ms - NullSlope_ms is the algorithm.
+# -------------------------------
+def benchmark_batched(backend, ops, batch_sizes=BATCH_SIZES):
+    gen, enc_func, dec_func = load(backend)
+    keypairs = pool_keypairs(backend)
+    calls, _ = kem_calls(gen, enc_func, dec_func, keypairs)
+    pool = kem_input_pool(gen, enc_func, min(max(batch_sizes), BATCH_POOL), keypairs)
+    budget = budget_for(backend["name"]) / len(batch_sizes)
+
+    rows = []
+    for op in ops:
+        func = calls[op][0]
+        arity = len(pool[op][0])
+        op_rows = []
+        for batch_size in batch_sizes:
+            samples = sample_batched(func, pool[op], batch_size, budget=budget)
+            op_rows.append({
+                "Algorithm": backend["name"],
+                "Operation": op,
+                "BatchSize": batch_size,
+                "Blocks": len(samples),
+                "PerOp_ms": statistics.median(samples),
+                "PerOpMin_ms": min(samples),
+                "NullCall_ms": null_call_cost(arity, batch_size),
+            })
+
+        sizes = [r["BatchSize"] for r in op_rows]
+        slope, block_overhead = fit_batch_costs(sizes, [r["PerOp_ms"] for r in op_rows])
+        null_slope, _ = fit_batch_costs(sizes, [r["NullCall_ms"] for r in op_rows])
+        intrinsic = slope - null_slope
+        for row in op_rows:
+            row["PerCallSlope_ms"] = slope
+            row["NullSlope_ms"] = null_slope
+            row["Intrinsic_ms"] = intrinsic
+            row["BlockOverhead_ms"] = block_overhead
+            row["HarnessShare"] = (row["PerOp_ms"] - intrinsic) / row["PerOp_ms"]
+        rows.extend(op_rows)
+        print(f"{backend['name']} {op}: intrinsic {intrinsic:.5f} ms/op "
+              f"(slope {slope:.5f} - loop {null_slope:.5f}), per-block overhead {block_overhead:.5f} ms")
+    return rows
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-op cost for a sweep of batch sizes")
+    add_selection_args(parser)
+    parser.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)),
+                        help="comma separated batch sizes (default: $BENCH_BATCH_SIZES)")
+    args = parser.parse_args(argv)
+    backends, ops = parse_selection(parser, args)
+    batch_sizes = tuple(int(b) for b in args.batch_sizes.split(","))
+    isolate_process()
+
+    rows = []
+    for backend in backends:
+        rows.extend(benchmark_batched(backend, ops, batch_sizes))
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "batch_benchmark.csv")
+    save_results(pd.DataFrame(rows), csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
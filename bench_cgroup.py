@@ -0,0 +1,244 @@
+import os
+
+# -------------------------------
+# Throttling configuration
+# BENCH_THROTTLE=tag keeps throttled samples and counts them,
+# BENCH_THROTTLE=reject drops them before the statistics are computed.
+# BENCH_CGROUP_CHUNK_MS: cpu.stat is read between chunks of samples of
+# at least this length (~ one CFS period), never inside a timed call.
+# -------------------------------
+THROTTLE_POLICY = os.environ.get("BENCH_THROTTLE", "tag")
+CHUNK_NS = int(float(os.environ.get("BENCH_CGROUP_CHUNK_MS", "10")) * 1e6)
+
+_ROOT = "/sys/fs/cgroup"
+_files = None
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _first_existing(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+# -------------------------------
+# Locate the accounting files of this process's cgroup
+# cgroup v2 (Docker on current distros): one unified hierarchy.
+# cgroup v1 fallback: cpu and memory controllers in separate mounts,
+# throttled_time in ns and max_usage_in_bytes instead of memory.peak.
+# -------------------------------
+def _locate():
+    v2_path, v1_paths = None, {}
+    for line in (_read("/proc/self/cgroup") or "").splitlines():
+        hierarchy, controllers, path = line.split(":", 2)
+        if hierarchy == "0" and not controllers:
+            v2_path = path
+        for controller in controllers.split(","):
+            v1_paths[controller] = path
+
+    if v2_path is not None and os.path.exists(os.path.join(_ROOT, "cgroup.controllers")):
+        base = _first_existing(os.path.join(_ROOT, v2_path.lstrip("/")), _ROOT)
+        return {
+            "version": 2,
+            "cpu.stat": _first_existing(os.path.join(base, "cpu.stat")),
+            "memory.current": _first_existing(os.path.join(base, "memory.current")),
+            "memory.peak": _first_existing(os.path.join(base, "memory.peak")),
+        }
+
+    def v1(controller, mounts, name):
+        path = v1_paths.get(controller, "/").lstrip("/")
+        return _first_existing(*(os.path.join(_ROOT, mount, path, name) for mount in mounts),
+                               *(os.path.join(_ROOT, mount, name) for mount in mounts))
+
+    return {
+        "version": 1,
+        "cpu.stat": v1("cpu", ["cpu", "cpu,cpuacct"], "cpu.stat"),
+        "memory.current": v1("memory", ["memory"], "memory.usage_in_bytes"),
+        "memory.peak": v1("memory", ["memory"], "memory.max_usage_in_bytes"),
+    }
+
+
+def cgroup_files():
+    global _files
+    if _files is None:
+        _files = _locate()
+    return _files
+
+
+# -------------------------------
+# Read throttling counters and memory usage of this cgroup
+# Returns None when no cpu.stat is available (no cgroup, macOS, ...).
+# -------------------------------
+def snapshot():
+    files = cgroup_files()
+    stat_text = _read(files["cpu.stat"]) if files["cpu.stat"] else None
+    if stat_text is None:
+        return None
+
+    stat = {}
+    for line in stat_text.splitlines():
+        key, value = line.split()
+        stat[key] = int(value)
+    throttled_usec = stat.get("throttled_usec")
+    if throttled_usec is None:
+        throttled_usec = stat.get("throttled_time", 0) // 1000  # v1 reports ns
+
+    def memory(name):
+        text = _read(files[name]) if files[name] else None
+        return int(text) if text and text.strip().isdigit() else None
+
+    return {
+        "nr_periods": stat.get("nr_periods", 0),
+        "nr_throttled": stat.get("nr_throttled", 0),
+        "throttled_usec": throttled_usec,
+        "memory_current": memory("memory.current"),
+        "memory_peak": memory("memory.peak"),
+    }
+
+
+# -------------------------------
+# Difference of two snapshots (counters) plus memory after / peak
+# -------------------------------
+def delta(before, after):
+    if before is None or after is None:
+        return None
+    memory_delta = None
+    if before["memory_current"] is not None and after["memory_current"] is not None:
+        memory_delta = after["memory_current"] - before["memory_current"]
+    return {
+        "nr_periods": after["nr_periods"] - before["nr_periods"],
+        "nr_throttled": after["nr_throttled"] - before["nr_throttled"],
+        "throttled_usec": after["throttled_usec"] - before["throttled_usec"],
+        "memory_delta": memory_delta,
+        "memory_peak": after["memory_peak"],
+    }
+
+
+# -------------------------------
+# Drop samples tagged as throttled (BENCH_THROTTLE=reject)
+# Keeps everything if every sample was throttled, so there is a result.
+# -------------------------------
+def drop_throttled(wall, cpu, throttled):
+    keep = [i for i, hit in enumerate(throttled) if not hit]
+    if not keep or len(keep) == len(wall):
+        return wall, cpu
+    return [wall[i] for i in keep], [cpu[i] for i in keep]
+
+
+# -------------------------------
+# CSV columns for one operation
+# -------------------------------
+def throttle_columns(op, throttled, cgroup_delta):
+    columns = {f"{op}_throttled_n": sum(throttled)}
+    if cgroup_delta is not None:
+        columns[f"{op}_nr_throttled"] = cgroup_delta["nr_throttled"]
+        columns[f"{op}_throttled_ms"] = cgroup_delta["throttled_usec"] / 1000
+        columns[f"{op}_mem_delta_bytes"] = cgroup_delta["memory_delta"]
+        columns[f"{op}_mem_peak_bytes"] = cgroup_delta["memory_peak"]
+    return columns
+
+
+def _write(path, value):
+    with open(path, "w") as f:
+        f.write(str(value))
+
+
+# -------------------------------
+# Directory for the job cgroups under cgroup v2
+# "No internal processes": cpu / memory can only be enabled for the
+# children of a cgroup that holds no processes itself (the root is
+# exempt), and this process's own cgroup holds at least this process.
+# Tried in order: the root if we are in it; next to our cgroup (its
+# parent holds only cgroups); our own cgroup after moving this process
+# into a leaf of its own (pqc-orchestrator, left for the next run), which
+# works when nothing else runs there (a container, a delegated scope).
+# The result is cached; raises OSError if none works.
+# -------------------------------
+_v2_parent = None
+
+
+def _v2_job_parent():
+    global _v2_parent
+    if _v2_parent is not None:
+        return _v2_parent
+    own = os.path.dirname(cgroup_files()["cpu.stat"])
+    candidates = [own] if os.path.samefile(own, _ROOT) else [os.path.dirname(own)]
+    for parent in candidates:
+        try:
+            _write(os.path.join(parent, "cgroup.subtree_control"), "+cpu +memory")
+            _v2_parent = parent
+            return parent
+        except OSError:
+            pass
+
+    leaf = os.path.join(own, "pqc-orchestrator")
+    os.makedirs(leaf, exist_ok=True)
+    _write(os.path.join(leaf, "cgroup.procs"), os.getpid())
+    try:
+        _write(os.path.join(own, "cgroup.subtree_control"), "+cpu +memory")
+    except OSError:
+        _write(os.path.join(own, "cgroup.procs"), os.getpid())
+        remove_cgroup([leaf])
+        raise
+    _v2_parent = own
+    return own
+
+
+# -------------------------------
+# Create a child cgroup with a CPU quota and memory limit
+# Used by run_profiles.py to emulate docker --cpus / --memory locally.
+# Returns the list of created directories (processes join by writing
+# their pid to <dir>/cgroup.procs), or None if cgroups are not writable
+# (no root, no delegation, other processes in our cgroup v2 cgroup, ...).
+# -------------------------------
+def create_limited_cgroup(name, cpus, memory_bytes, period_us=100_000):
+    files = cgroup_files()
+    created = []
+    try:
+        if files["version"] == 2:
+            parent = _v2_job_parent()
+            path = os.path.join(parent, name)
+            os.makedirs(path, exist_ok=True)
+            created.append(path)
+            _write(os.path.join(path, "cpu.max"), f"{int(cpus * period_us)} {period_us}")
+            _write(os.path.join(path, "memory.max"), memory_bytes)
+        else:
+            cpu_parent = os.path.dirname(files["cpu.stat"])
+            memory_parent = os.path.dirname(files["memory.current"])
+            cpu_path = os.path.join(cpu_parent, name)
+            memory_path = os.path.join(memory_parent, name)
+            os.makedirs(cpu_path, exist_ok=True)
+            created.append(cpu_path)
+            _write(os.path.join(cpu_path, "cpu.cfs_period_us"), period_us)
+            _write(os.path.join(cpu_path, "cpu.cfs_quota_us"), int(cpus * period_us))
+            os.makedirs(memory_path, exist_ok=True)
+            created.append(memory_path)
+            _write(os.path.join(memory_path, "memory.limit_in_bytes"), memory_bytes)
+    except (OSError, TypeError):
+        remove_cgroup(created)
+        return None
+    return created
+
+
+# -------------------------------
+# Move the calling process into cgroups created above
+# -------------------------------
+def join_cgroup(paths):
+    for path in paths:
+        _write(os.path.join(path, "cgroup.procs"), os.getpid())
+
+
+def remove_cgroup(paths):
+    for path in reversed(paths or []):
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
@@ -0,0 +1,375 @@
+import math
+import os
+import time
+from statistics import NormalDist, linear_regression
+
+from bench_cgroup import CHUNK_NS
+from bench_cgroup import delta as cgroup_delta
+from bench_cgroup import snapshot as cgroup_snapshot
+from bench_env import timed_region
+from bench_timer import calibration
+
+# -------------------------------
+# Sampling configuration
+# Can be overridden at runtime like PROFILE, e.g. -e BENCH_ITERATIONS=100
+# -------------------------------
+WARMUP = int(os.environ.get("BENCH_WARMUP", "3"))
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", "30"))
+
+# -------------------------------
+# Adaptive sampling configuration (BENCH_MODE=adaptive)
+# Sampling of one (algorithm, operation) pair stops as soon as the
+# confidence interval of the median is narrower than BENCH_TARGET_CI
+# (relative to the median) or its time budget is used up.
+# -------------------------------
+MODE = os.environ.get("BENCH_MODE", "fixed")
+TARGET_CI = float(os.environ.get("BENCH_TARGET_CI", "0.02"))
+BUDGET_S = float(os.environ.get("BENCH_BUDGET_S", "2.0"))
+MIN_SAMPLES = int(os.environ.get("BENCH_MIN_SAMPLES", "5"))
+MAX_SAMPLES = int(os.environ.get("BENCH_MAX_SAMPLES", "100000"))
+# Per-algorithm budgets in seconds, matched by name prefix,
+# e.g. BENCH_BUDGETS="McEliece=10,ML-KEM=0.5"
+BUDGETS = os.environ.get("BENCH_BUDGETS", "")
+
+# -------------------------------
+# Batched sampling configuration (bench_batch.py)
+# Batch sizes to sweep and the number of distinct pre-generated inputs
+# (keypairs / ciphertexts) the batches cycle through.
+# -------------------------------
+BATCH_SIZES = tuple(int(b) for b in os.environ.get("BENCH_BATCH_SIZES", "1,4,16,64,256").split(","))
+BATCH_POOL = int(os.environ.get("BENCH_BATCH_POOL", "16"))
+BATCH_REPEATS = int(os.environ.get("BENCH_BATCH_REPEATS", "10"))
+
+_Z = NormalDist().inv_cdf(0.5 + float(os.environ.get("BENCH_CONFIDENCE", "0.95")) / 2)
+
+
+# -------------------------------
+# Time budget for one algorithm (longest matching prefix wins)
+# -------------------------------
+def budget_for(name):
+    best, budget = "", BUDGET_S
+    for entry in BUDGETS.split(","):
+        if "=" not in entry:
+            continue
+        prefix, seconds = (part.strip() for part in entry.split("=", 1))
+        if name.startswith(prefix) and len(prefix) > len(best):
+            best, budget = prefix, float(seconds)
+    return budget
+
+
+# -------------------------------
+# Relative width of the distribution-free CI of the median
+# Uses the order statistics around n/2 (normal approximation of the
+# binomial), so it is cheap enough to evaluate while sampling.
+# -------------------------------
+def median_ci_width(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    half = _Z * math.sqrt(n) / 2
+    lo = max(0, math.floor(n / 2 - half))
+    hi = min(n - 1, math.ceil(n / 2 + half))
+    median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+    if median <= 0:
+        return math.inf
+    return (ordered[hi] - ordered[lo]) / median
+
+
+# -------------------------------
+# Time one operation repeatedly
+# Runs `warmup` untimed calls first (caches, lazy init inside the C library),
+# then takes one sample per timed call. Returns (wall_ms, cpu_ms, info):
+# wall time from perf_counter_ns and CPU time of this thread from
+# thread_time_ns, both with the calibrated cost of the timing frame
+# subtracted. Under a cgroup CPU quota (--cpus=0.5) wall time includes
+# throttling, CPU time not. info["throttled"] tags every sample whose chunk
+# saw CFS throttling, info["cgroup"] holds the cgroup counter deltas
+# (see bench_cgroup.py).
+# -------------------------------
+def sample(func, args=(), warmup=None, iterations=None, budget=None):
+    warmup = WARMUP if warmup is None else warmup
+    iterations = ITERATIONS if iterations is None else iterations
+
+    if MODE == "adaptive":
+        return sample_adaptive(func, args, warmup, budget)
+
+    for _ in range(warmup):
+        func(*args)
+
+    return _sample_loop(func, args, lambda wall, t1: len(wall) >= iterations)
+
+
+# -------------------------------
+# Time one operation until the CI is tight enough or the budget is spent
+# The budget covers the timed calls only (not the warmup). At least
+# MIN_SAMPLES are always taken, even if one call exceeds the budget.
+# The CI is re-checked each time the sample count grows by ~10 %.
+# -------------------------------
+def sample_adaptive(func, args=(), warmup=None, budget=None, target_ci=None):
+    warmup = WARMUP if warmup is None else warmup
+    budget = BUDGET_S if budget is None else budget
+    target_ci = TARGET_CI if target_ci is None else target_ci
+
+    for _ in range(warmup):
+        func(*args)
+
+    next_check = MIN_SAMPLES
+    deadline = time.perf_counter_ns() + int(budget * 1e9)
+
+    def stop(wall, t1):
+        nonlocal next_check
+        if len(wall) >= MAX_SAMPLES:
+            return True
+        if len(wall) < MIN_SAMPLES:
+            return False
+        if t1 >= deadline:
+            return True
+        if len(wall) >= next_check:
+            if median_ci_width(wall) <= target_ci:
+                return True
+            next_check = len(wall) + max(1, len(wall) // 10)
+        return False
+
+    return _sample_loop(func, args, stop)
+
+
+# -------------------------------
+# Sampling loop shared by fixed and adaptive mode
+# cgroup counters are read between chunks of >= CHUNK_NS (outside any
+# timed call); all samples of a chunk that saw throttling are tagged.
+# Without cgroup accounting no files are read at all.
+# -------------------------------
+def _sample_loop(func, args, stop):
+    cal = calibration()
+    wall_off = cal["sample_wall_overhead_ns"]
+    cpu_off = cal["sample_cpu_overhead_ns"]
+    perf_counter_ns = time.perf_counter_ns
+    thread_time_ns = time.thread_time_ns
+
+    wall = []
+    cpu = []
+    throttled = []
+    with timed_region():
+        first = before = cgroup_snapshot()
+        chunk_end = perf_counter_ns() + CHUNK_NS
+        while True:
+            c0 = thread_time_ns()
+            t0 = perf_counter_ns()
+            func(*args)
+            t1 = perf_counter_ns()
+            c1 = thread_time_ns()
+            wall.append(max(0, t1 - t0 - wall_off) / 1e6)
+            cpu.append(max(0, c1 - c0 - cpu_off) / 1e6)
+
+            done = stop(wall, t1)
+            if before is not None and (done or t1 >= chunk_end):
+                after = cgroup_snapshot()
+                hit = after["nr_throttled"] > before["nr_throttled"]
+                throttled.extend([hit] * (len(wall) - len(throttled)))
+                before = after
+                chunk_end = perf_counter_ns() + CHUNK_NS
+            if done:
+                break
+
+    if first is None:
+        throttled = [False] * len(wall)
+    return wall, cpu, {"throttled": throttled, "cgroup": cgroup_delta(first, before)}
+
+
+# -------------------------------
+# Size in bytes of a key / ciphertext
+# ECDH keeps the private key as an object, use its scalar size instead
+# -------------------------------
+def _nbytes(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, tuple):
+        return sum(_nbytes(part) for part in value)
+    if hasattr(value, "private_bytes_raw") and not hasattr(value, "key_size"):
+        return len(value.private_bytes_raw())
+    return (value.key_size + 7) // 8
+
+
+# -------------------------------
+# Prepare the calls of one KEM
+# Runs one keygen -> encaps -> decaps round (and checks the shared keys
+# match), then returns (func, args) per operation plus the sizes of that
+# round. Encaps and decaps reuse this keypair and ciphertext, so every
+# operation can be timed on its own. "Handshake" is one complete round;
+# with static_key=True the keypair is long-lived, so a handshake is only
+# encaps + decaps against it. `keypairs` (see bench_keypool.py) supplies
+# a pre-generated keypair.
+# -------------------------------
+def kem_calls(gen, enc_func, dec_func, keypairs=None, static_key=False):
+    public_key, secret_key = next(keypairs) if keypairs else gen()
+    ciphertext, shared_key_enc = enc_func(public_key)
+    shared_key_dec = dec_func(secret_key, ciphertext)
+
+    # Ensure shared keys match before spending time on sampling
+    assert shared_key_enc == shared_key_dec
+
+    def handshake():
+        pk, sk = (public_key, secret_key) if static_key else gen()
+        ct, _ = enc_func(pk)
+        dec_func(sk, ct)
+
+    sizes = {
+        "PublicKeyBytes": _nbytes(public_key),
+        "SecretKeyBytes": _nbytes(secret_key),
+        "CiphertextBytes": _nbytes(ciphertext),
+        "SharedKeyBytes": _nbytes(shared_key_enc),
+    }
+    calls = {
+        "KeyGen": (gen, ()),
+        "Encaps": (enc_func, (public_key,)),
+        "Decaps": (dec_func, (secret_key, ciphertext)),
+        "Handshake": (handshake, ()),
+    }
+    return calls, sizes
+
+
+# -------------------------------
+# Sample keygen / encaps / decaps of one KEM
+# `ops` restricts sampling to a subset of the operations in kem_calls().
+# Returns sizes and {op: (wall_ms, cpu_ms, info)}.
+# -------------------------------
+def sample_kem(gen, enc_func, dec_func, warmup=None, iterations=None, budget=None,
+               ops=("KeyGen", "Encaps", "Decaps"), keypairs=None, static_key=False):
+    calls, sizes = kem_calls(gen, enc_func, dec_func, keypairs, static_key)
+    samples = {}
+    for op in ops:
+        func, args = calls[op]
+        samples[op] = sample(func, args, warmup, iterations, budget)
+    return sizes, samples
+
+
+# -------------------------------
+# Prepare the calls of one signature scheme for one message
+# Runs one keygen -> sign -> verify round (and checks the signature
+# verifies), then returns (func, args) per operation plus the sizes of
+# that round, like kem_calls().
+# -------------------------------
+def signature_calls(gen, sign_func, verify_func, message):
+    public_key, secret_key = gen()
+    signature = sign_func(secret_key, message)
+
+    # Ensure the signature verifies before spending time on sampling
+    assert verify_func(public_key, message, signature)
+
+    sizes = {
+        "PublicKeyBytes": _nbytes(public_key),
+        "SecretKeyBytes": _nbytes(secret_key),
+        "SignatureBytes": _nbytes(signature),
+    }
+    calls = {
+        "KeyGen": (gen, ()),
+        "Sign": (sign_func, (secret_key, message)),
+        "Verify": (verify_func, (public_key, message, signature)),
+    }
+    return calls, sizes
+
+
+# -------------------------------
+# Pre-generated (public key, message, signature) triples from distinct
+# keypairs, for batch verification
+# -------------------------------
+def signature_input_pool(gen, sign_func, message, pool_size=None):
+    pool_size = BATCH_POOL if pool_size is None else pool_size
+    pool = []
+    for _ in range(pool_size):
+        public_key, secret_key = gen()
+        pool.append((public_key, message, sign_func(secret_key, message)))
+    return pool
+
+
+# -------------------------------
+# Pre-generated inputs per operation for batched timing
+# One arg tuple per distinct keypair; keygen takes no arguments.
+# -------------------------------
+def kem_input_pool(gen, enc_func, pool_size=None, keypairs=None):
+    pool_size = BATCH_POOL if pool_size is None else pool_size
+    pool = {"KeyGen": [()], "Encaps": [], "Decaps": [], "Handshake": [()]}
+    for _ in range(pool_size):
+        public_key, secret_key = next(keypairs) if keypairs else gen()
+        ciphertext, _ = enc_func(public_key)
+        pool["Encaps"].append((public_key,))
+        pool["Decaps"].append((secret_key, ciphertext))
+    return pool
+
+
+# -------------------------------
+# Time one block of back-to-back calls, returns seconds
+# Only the loop and the calls are inside the timed region: no dict
+# construction, no list appends, one timer pair per block (its calibrated
+# read cost is subtracted).
+# -------------------------------
+def time_block(func, inputs):
+    perf_counter_ns = time.perf_counter_ns
+    arity = len(inputs[0])
+    if arity == 0:
+        t0 = perf_counter_ns()
+        for _ in inputs:
+            func()
+        t1 = perf_counter_ns()
+    elif arity == 1:
+        t0 = perf_counter_ns()
+        for (a,) in inputs:
+            func(a)
+        t1 = perf_counter_ns()
+    elif arity == 2:
+        t0 = perf_counter_ns()
+        for a, b in inputs:
+            func(a, b)
+        t1 = perf_counter_ns()
+    else:
+        t0 = perf_counter_ns()
+        for a, b, c in inputs:
+            func(a, b, c)
+        t1 = perf_counter_ns()
+    return (t1 - t0 - calibration()["perf_counter_ns"]["overhead_ns"]) / 1e9
+
+
+# -------------------------------
+# Per-op cost (ms) of `func` timed in blocks of `batch_size` calls
+# Inputs are expanded from the pool into a preallocated list before
+# timing; one untimed block serves as warmup. Stops after `repeats`
+# blocks or when the budget is spent (at least one block).
+# -------------------------------
+def sample_batched(func, pool, batch_size, repeats=None, budget=None):
+    repeats = BATCH_REPEATS if repeats is None else repeats
+    budget = BUDGET_S if budget is None else budget
+
+    inputs = [pool[i % len(pool)] for i in range(batch_size)]
+    samples = [0.0] * repeats
+
+    time_block(func, inputs)  # warmup
+    with timed_region():
+        deadline = time.perf_counter() + budget
+        for i in range(repeats):
+            samples[i] = time_block(func, inputs) * 1000 / batch_size
+            if time.perf_counter() >= deadline:
+                del samples[i + 1:]
+                break
+    return samples
+
+
+# -------------------------------
+# Per-op cost (ms) of the harness alone: same loop, no-op function
+# -------------------------------
+def null_call_cost(arity, batch_size, repeats=None):
+    null_funcs = {0: lambda: None, 1: lambda a: None, 2: lambda a, b: None,
+                  3: lambda a, b, c: None}
+    pool = [(None,) * arity]
+    return min(sample_batched(null_funcs[arity], pool, batch_size, repeats))
+
+
+# -------------------------------
+# Split per-op cost into intrinsic cost and fixed per-block overhead
+# Least squares fit of block time = overhead + batch_size * intrinsic
+# over all batch sizes; returns (intrinsic_ms, block_overhead_ms).
+# -------------------------------
+def fit_batch_costs(batch_sizes, per_op_ms):
+    if len(set(batch_sizes)) < 2:
+        return per_op_ms[0], 0.0
+    block_ms = [b * t for b, t in zip(batch_sizes, per_op_ms)]
+    slope, intercept = linear_regression(batch_sizes, block_ms)
+    return slope, intercept
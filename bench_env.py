@@ -0,0 +1,185 @@
+import gc
+import json
+import math
+import os
+import platform
+import socket
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from importlib import metadata
+
+from bench_cgroup import cgroup_files
+from bench_cgroup import snapshot as cgroup_snapshot
+from bench_timer import calibration
+
+# -------------------------------
+# Isolation configuration
+# BENCH_GC=on keeps the garbage collector running while timing
+# BENCH_CPUS pins the benchmark to cores, e.g. "2,3" or "4-7"
+# BENCH_NICE sets the priority (negative values need root / CAP_SYS_NICE)
+# -------------------------------
+GC_DURING_TIMING = os.environ.get("BENCH_GC", "off").lower() == "on"
+CPUS = os.environ.get("BENCH_CPUS", "")
+NICE = int(os.environ.get("BENCH_NICE", "0"))
+
+# Packages whose versions go into every metadata snapshot
+_PACKAGES = ["pqcrypto", "cryptography", "numpy", "pandas", "matplotlib"]
+
+
+# -------------------------------
+# Parse a CPU list like "0-3,6" into a set of core ids
+# -------------------------------
+def parse_cpu_list(text):
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+# -------------------------------
+# Number of CPUs this process may use
+# Affinity mask (docker --cpuset-cpus) capped by the cgroup v2 CPU quota
+# (docker --cpus), rounded up so --cpus=0.5 still gives one worker.
+# -------------------------------
+def allotted_cpus():
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    quota = _read("/sys/fs/cgroup/cpu.max")
+    if quota:
+        limit, period = quota.split()
+        if limit != "max":
+            cpus = min(cpus, math.ceil(int(limit) / int(period)))
+    return max(1, cpus)
+
+
+# -------------------------------
+# Apply CPU pinning and priority to this process (idempotent)
+# Failures are reported, not fatal: an unprivileged container can't
+# raise its priority, but the measurement is still valid.
+# -------------------------------
+def isolate_process(cpus=CPUS, nice=NICE):
+    applied = {}
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, parse_cpu_list(cpus))
+            applied["affinity"] = sorted(os.sched_getaffinity(0))
+        except OSError as exc:
+            print(f"[WARN] CPU pinning to {cpus} failed: {exc}")
+    if nice and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+            applied["nice"] = os.getpriority(os.PRIO_PROCESS, 0)
+        except OSError as exc:
+            print(f"[WARN] Setting priority to {nice} failed: {exc}")
+    return applied
+
+
+# -------------------------------
+# Timed region: collect garbage up front, keep the GC off while timing
+# -------------------------------
+@contextmanager
+def timed_region():
+    if GC_DURING_TIMING:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _cpu_model():
+    for line in (_read("/proc/cpuinfo") or "").splitlines():
+        if line.startswith(("model name", "Hardware", "Processor")):
+            return line.split(":", 1)[1].strip()
+    return platform.processor() or None
+
+
+# -------------------------------
+# Per-core frequency (kHz) and governor of the cores we run on
+# -------------------------------
+def _cpufreq():
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+    freq = {}
+    for core in cores:
+        base = f"/sys/devices/system/cpu/cpu{core}/cpufreq"
+        if not os.path.isdir(base):
+            continue
+        freq[core] = {
+            "cur_khz": _read(f"{base}/scaling_cur_freq"),
+            "min_khz": _read(f"{base}/scaling_min_freq"),
+            "max_khz": _read(f"{base}/scaling_max_freq"),
+            "governor": _read(f"{base}/scaling_governor"),
+        }
+    return freq
+
+
+def _package_versions():
+    versions = {}
+    for name in _PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+# -------------------------------
+# Snapshot of the measurement environment
+# -------------------------------
+def environment_snapshot():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "hostname": socket.gethostname(),
+        "profile": os.environ.get("PROFILE", "default"),
+        "platform": platform.platform(),
+        "python": sys.version,
+        "cpu_model": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "affinity": sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None,
+        "allotted_cpus": allotted_cpus(),
+        "cpufreq": _cpufreq(),
+        "smt_active": _read("/sys/devices/system/cpu/smt/active"),
+        "cgroup": {
+            "cpu.max": _read("/sys/fs/cgroup/cpu.max"),
+            "memory.max": _read("/sys/fs/cgroup/memory.max"),
+            "cpuset.cpus.effective": _read("/sys/fs/cgroup/cpuset.cpus.effective"),
+            "version": cgroup_files()["version"],
+            "counters": cgroup_snapshot(),
+        },
+        "loadavg": os.getloadavg() if hasattr(os, "getloadavg") else None,
+        "nice": os.getpriority(os.PRIO_PROCESS, 0) if hasattr(os, "getpriority") else None,
+        "gc_during_timing": GC_DURING_TIMING,
+        "bench_settings": {k: v for k, v in os.environ.items() if k.startswith("BENCH_")},
+        "packages": _package_versions(),
+        "timer_calibration": calibration(),
+    }
+
+
+# -------------------------------
+# Write the snapshot next to a result file: foo.csv -> foo.meta.json
+# -------------------------------
+def write_metadata(result_path, metadata=None):
+    meta_path = os.path.splitext(result_path)[0] + ".meta.json"
+    with open(meta_path, "w") as f:
+        json.dump(environment_snapshot() if metadata is None else metadata, f, indent=2, default=str)
+    return meta_path
@@ -0,0 +1,232 @@
+import os
+import numpy as np
+import pandas as pd
+
+from bench_cgroup import THROTTLE_POLICY
+from bench_stats import CONFIDENCE, t_quantile
+from bench_store import STORE_PATH, latest_run_id, load_results, load_run_samples
+
+# -------------------------------
+# Extrapolation configuration
+# BENCH_EXTRAPOLATE_FACTOR: grid runs from the smallest measured key size
+#                           to this multiple of the largest one
+# BENCH_EXTRAPOLATE_POINTS: grid points (log-spaced)
+# -------------------------------
+GRID_FACTOR = float(os.environ.get("BENCH_EXTRAPOLATE_FACTOR", "2"))
+GRID_POINTS = int(os.environ.get("BENCH_EXTRAPOLATE_POINTS", "50"))
+
+# -------------------------------
+# Scaling models, all linear in (a, b) after transforming x and t:
+# target(t) = a + b * feature(x); inverse() maps a fitted target back to ms
+# power:  t = e^a * x^b      (least squares in log-log space)
+# linear: t = a + b * x
+# nlogn:  t = a + b * x log x
+# -------------------------------
+MODELS = {
+    "power": (np.log, np.log, np.exp),
+    "linear": (lambda x: x, lambda t: t, lambda t: t),
+    "nlogn": (lambda x: x * np.log(x), lambda t: t, lambda t: t),
+}
+
+GROUP = ["Profile", "Operation"]
+
+
+# -------------------------------
+# (x = PublicKeyBytes, t = ms) points of one profile's result rows
+# Raw samples where the run has them, otherwise one point per algorithm,
+# the stored median (CSVs imported into the store, store disabled). With
+# BENCH_THROTTLE=reject throttled samples are dropped, as they are for the
+# medians in the CSV. None if no operation has a positive time.
+# -------------------------------
+def series_from_results(results, profile, samples=None, ops=("Encaps", "Decaps")):
+    sizes = dict(zip(results["Algorithm"], results["PublicKeyBytes"]))
+    frames = []
+    for op in ops:
+        raw = None
+        if samples is not None:
+            raw = samples[(samples["operation"] == op) & samples["algorithm"].isin(sizes)]
+            if THROTTLE_POLICY == "reject":
+                raw = raw[raw["throttled"] == 0]
+        if raw is not None and len(raw):
+            algorithms, times = raw["algorithm"].to_numpy(), raw["wall_ms"].to_numpy()
+        elif f"{op}_ms" in results:
+            algorithms, times = results["Algorithm"].to_numpy(), results[f"{op}_ms"].to_numpy()
+        else:
+            continue
+        frames.append(pd.DataFrame({
+            "Profile": profile, "Operation": op, "Algorithm": algorithms,
+            "x": [sizes[a] for a in algorithms], "t": times,
+        }))
+    if not frames:
+        return None
+    series = pd.concat(frames, ignore_index=True)
+    series = series[series["t"] > 0].reset_index(drop=True)
+    return series if len(series) else None
+
+
+# -------------------------------
+# Points of one result set from the store, latest run per profile
+# -------------------------------
+def load_series(result_set, profiles, ops=("Encaps", "Decaps")):
+    frames = []
+    for profile in profiles:
+        run_id = latest_run_id(result_set, profile)
+        if run_id is None:
+            continue
+        results = load_results(result_set, profile, run_id)
+        frames.append(series_from_results(results, profile, load_run_samples([run_id]), ops))
+    frames = [frame for frame in frames if frame is not None]
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+# -------------------------------
+# Fit every model to every (profile, operation) series in one pass
+# Raw samples are first reduced to one median per key size (key = one key
+# size of one series). The samples of one key size share that size's
+# systematic error (code path, cache fit), so they are not independent
+# points of the curve; the fits, the residual scatter and the
+# leave-one-key-out cross-validation all use the medians. Per-series sums
+# come from np.bincount, without a Python loop over series.
+# CV_rmse: RMS log error of predicting the held-out key size's median
+# from the other key sizes (needs >= 3 key sizes, i.e. extrapolation the
+# way the plots use it). The model with the lowest CV_rmse is Selected;
+# without CV (< 3 key sizes) the power law is kept.
+# Keys: key sizes in the series, Samples: raw samples behind them.
+# -------------------------------
+def fit_models(series, group=GROUP):
+    keys = series.groupby(group + ["x"], sort=True)["t"]
+    key_frame = keys.median().reset_index()
+    key_samples = keys.size().to_numpy()
+    group_of_key = key_frame.groupby(group, sort=True).ngroup().to_numpy()
+    n_groups, n_models = group_of_key.max() + 1, len(MODELS)
+
+    x_key = key_frame["x"].to_numpy(dtype=float)
+    median_key = key_frame["t"].to_numpy(dtype=float)
+    f = np.stack([feature(x_key) for feature, _, _ in MODELS.values()])
+    y = np.stack([target(median_key) for _, target, _ in MODELS.values()])
+
+    # Per-series sums, shape (models, groups)
+    g = group_of_key
+
+    def group_sums(values):
+        return np.stack([np.bincount(g, weights=row, minlength=n_groups) for row in values])
+
+    n, sf, sff, sy, sfy, syy = (group_sums(v) for v in (np.ones_like(f), f, f * f, y, f * y, y * y))
+
+    def solve(n, sf, sff, sy, sfy):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sxx = sff - sf * sf / n
+            b = (sfy - sf * sy / n) / sxx
+            a = (sy - b * sf) / n
+        return a, b, sxx
+
+    a, b, sxx = solve(n, sf, sff, sy, sfy)
+    sse = np.maximum(syy - a * sy - b * sfy, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = np.sqrt(sse / (n - 2))
+
+    # Leave-one-key-out: series sums minus the held-out key
+    a_cv, b_cv, _ = solve(n[:, g] - 1, sf[:, g] - f, sff[:, g] - f * f, sy[:, g] - y,
+                          sfy[:, g] - f * y)
+    errors = np.empty_like(f)
+    for m, (feature, _, inverse) in enumerate(MODELS.values()):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            predicted = inverse(a_cv[m] + b_cv[m] * feature(x_key))
+            errors[m] = np.where(predicted > 0, np.log(predicted / median_key) ** 2, np.inf)
+    key_count = np.bincount(g, minlength=n_groups)
+    sample_count = np.bincount(g, weights=key_samples, minlength=n_groups).astype(int)
+    cv_sums = group_sums(errors)
+    with np.errstate(invalid="ignore"):
+        cv_rmse = np.where(key_count >= 3, np.sqrt(cv_sums / key_count), np.nan)
+
+    cv_filled = np.where(np.isnan(cv_rmse), np.inf, cv_rmse)
+    selected = np.argmin(cv_filled, axis=0)
+    selected = np.where(np.isinf(cv_filled).all(axis=0), list(MODELS).index("power"), selected)
+
+    groups = key_frame[group].drop_duplicates().reset_index(drop=True)
+    fits = []
+    for m, model in enumerate(MODELS):
+        fits.append(groups.assign(
+            Model=model, a=a[m], b=b[m], s=s[m], Keys=key_count, Samples=sample_count,
+            f_mean=sf[m] / n[m], Sxx=sxx[m], CV_rmse=cv_rmse[m], Selected=selected == m))
+    return pd.concat(fits, ignore_index=True)
+
+
+# -------------------------------
+# Log-spaced key sizes from the smallest measured one to GRID_FACTOR x
+# the largest
+# -------------------------------
+def extrapolation_grid(x_measured, factor=GRID_FACTOR, points=GRID_POINTS):
+    return np.geomspace(np.min(x_measured), np.max(x_measured) * factor, points)
+
+
+# -------------------------------
+# Predictions with prediction intervals on a grid, for all fits at once
+# The interval is for the median time at a new key size (scatter of the
+# key size medians around the curve plus the uncertainty of the fitted
+# line), Student t with Keys - 2 degrees of freedom (Keys = measured key
+# sizes), computed in the model's target space (log space for the power
+# law, so the band is asymmetric in ms). Below 3 key sizes there is no
+# band.
+# Returns one row per (fit, x) with Time_ms, Low_ms, High_ms.
+# -------------------------------
+def predict(fits, x, confidence=None, selected_only=True):
+    confidence = CONFIDENCE if confidence is None else confidence
+    fits = fits[fits["Selected"]] if selected_only else fits
+    x = np.asarray(x, dtype=float)
+    frames = []
+    for model, part in fits.groupby("Model", sort=False):
+        feature, _, inverse = MODELS[model]
+        f0 = feature(x)[None, :]
+        a, b, s = (part[c].to_numpy()[:, None] for c in ("a", "b", "s"))
+        n, f_mean, sxx = (part[c].to_numpy(dtype=float)[:, None] for c in ("Keys", "f_mean", "Sxx"))
+        center = a + b * f0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            half = t_quantile(0.5 + confidence / 2, n - 2) * s * np.sqrt(
+                1 + 1 / n + (f0 - f_mean) ** 2 / sxx)
+        frame = part.drop(columns=["a", "b", "s", "f_mean", "Sxx"]).loc[part.index.repeat(len(x))]
+        frames.append(frame.assign(x=np.tile(x, len(part)), Time_ms=inverse(center).ravel(),
+                                   Low_ms=np.maximum(inverse(center - half), 0).ravel(),
+                                   High_ms=inverse(center + half).ravel()))
+    return pd.concat(frames, ignore_index=True)
+
+
+# -------------------------------
+# Draw one prediction (Time_ms line + interval band) onto an axis
+# -------------------------------
+def plot_prediction(ax, prediction, color, label, linestyle="--", marker=None):
+    ax.plot(prediction["x"], prediction["Time_ms"], linestyle=linestyle, color=color,
+            marker=marker, markevery=max(1, len(prediction) // 8), label=label)
+    ax.fill_between(prediction["x"], prediction["Low_ms"], prediction["High_ms"],
+                    color=color, alpha=0.15, linewidth=0)
+
+
+# -------------------------------
+# One call for the plot scripts: load, fit and predict one result set
+# Returns (series, fits, predictions) or None without results.
+# -------------------------------
+def extrapolate(result_set, profiles, ops=("Encaps", "Decaps"), factor=GRID_FACTOR):
+    series = load_series(result_set, profiles, ops)
+    if series is None:
+        return None
+    fits = fit_models(series)
+    predictions = predict(fits, extrapolation_grid(series["x"], factor))
+    return series, fits, predictions
+
+
+# -------------------------------
+# Same for the benchmark scripts: the table just saved to csv_path, with
+# the raw samples this process recorded for it. None if there is nothing
+# to fit (no encaps / decaps times); the scripts skip that plot.
+# -------------------------------
+def extrapolate_results(df, csv_path, ops=("Encaps", "Decaps"), factor=GRID_FACTOR):
+    profile = os.path.basename(os.path.dirname(os.path.abspath(csv_path)))
+    result_set = os.path.splitext(os.path.basename(csv_path))[0]
+    run_id = latest_run_id(result_set, profile) if STORE_PATH else None
+    samples = load_run_samples([run_id]) if run_id else None
+    series = series_from_results(df, profile, samples, ops)
+    if series is None:
+        return None
+    fits = fit_models(series)
+    predictions = predict(fits, extrapolation_grid(series["x"], factor))
+    return series, fits, predictions
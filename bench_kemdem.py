@@ -0,0 +1,211 @@
+import argparse
+import math
+import os
+import struct
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from bench_engine import ITERATIONS, kem_calls
+from bench_env import isolate_process, timed_region
+from bench_keypool import pool_keypairs
+from bench_registry import load, select
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+# -------------------------------
+# KEM-DEM configuration
+# BENCH_KEMDEM_SIZES: payload sizes in bytes
+# BENCH_KEMDEM_CHUNK: AEAD chunk size (each chunk has its own nonce + tag)
+# BENCH_KEMDEM_BYTES: payload bytes per (algorithm, size) point, bounds
+# the iterations for large payloads (at least 3, at most BENCH_ITERATIONS)
+# -------------------------------
+SIZES = tuple(int(s) for s in os.environ.get(
+    "BENCH_KEMDEM_SIZES", "1024,16384,262144,1048576,16777216,104857600").split(","))
+CHUNK = int(os.environ.get("BENCH_KEMDEM_CHUNK", "65536"))
+BYTES_PER_POINT = int(os.environ.get("BENCH_KEMDEM_BYTES", str(1024 ** 3)))
+
+LABEL = b"pqc-benchmark kem-dem v1"
+_NONCE = struct.Struct(">8sI")  # 8 byte prefix from HKDF + chunk counter
+_TAG = 16
+
+
+# -------------------------------
+# AEAD key and nonce prefix from the KEM shared secret
+# -------------------------------
+def derive(shared_key):
+    okm = HKDF(algorithm=hashes.SHA256(), length=40, salt=None, info=LABEL).derive(shared_key)
+    return okm[:32], okm[32:]
+
+
+# -------------------------------
+# Stream `payload` through chunked AEAD encryption and straight back
+# through decryption (sender and receiver of one pipe), chunk by chunk
+# AES-256-GCM: update_into() into two preallocated buffers, no per-chunk
+# allocation. ChaCha20-Poly1305 only has a one-shot API in cryptography,
+# so each chunk allocates its output there (the input is a memoryview).
+# -------------------------------
+def stream_aes_gcm(key, prefix, payload, buffers):
+    ct_buf, pt_buf = buffers
+    aes = algorithms.AES(key)
+    for counter, start in enumerate(range(0, len(payload), CHUNK)):
+        chunk = payload[start:start + CHUNK]
+        nonce = _NONCE.pack(prefix, counter)
+        encryptor = Cipher(aes, modes.GCM(nonce)).encryptor()
+        n = encryptor.update_into(chunk, ct_buf)
+        encryptor.finalize()
+        decryptor = Cipher(aes, modes.GCM(nonce, encryptor.tag)).decryptor()
+        decryptor.update_into(memoryview(ct_buf)[:n], pt_buf)
+        decryptor.finalize()
+    return memoryview(pt_buf)[:n]
+
+
+def stream_chacha(key, prefix, payload, buffers):
+    aead = ChaCha20Poly1305(key)
+    for counter, start in enumerate(range(0, len(payload), CHUNK)):
+        nonce = _NONCE.pack(prefix, counter)
+        plaintext = aead.decrypt(nonce, aead.encrypt(nonce, payload[start:start + CHUNK], None), None)
+    return plaintext
+
+
+AEADS = {"AES-256-GCM": stream_aes_gcm, "ChaCha20-Poly1305": stream_chacha}
+
+
+# -------------------------------
+# Time the pipeline for one backend, AEAD and payload size
+# Per iteration: encaps + HKDF (sender), decaps + HKDF (receiver) against
+# a static recipient key, then the payload through the AEAD stream.
+# Returns (kem_ms, dem_ms) sample lists.
+# -------------------------------
+def time_pipeline(enc_func, dec_func, public_key, secret_key, stream, payload, buffers,
+                  iterations):
+    kem_ms, dem_ms = [], []
+    with timed_region():
+        for i in range(iterations + 1):
+            t0 = time.perf_counter_ns()
+            ciphertext, shared_key = enc_func(public_key)
+            key, prefix = derive(shared_key)
+            receiver_key, _ = derive(dec_func(secret_key, ciphertext))
+            t1 = time.perf_counter_ns()
+            last = stream(receiver_key, prefix, payload, buffers)
+            t2 = time.perf_counter_ns()
+            if i == 0:  # warmup, also checks the round trip
+                tail = len(payload) - (len(payload) - 1) // CHUNK * CHUNK
+                assert key == receiver_key and bytes(last) == bytes(payload[-tail:])
+                continue
+            kem_ms.append((t1 - t0) / 1e6)
+            dem_ms.append((t2 - t1) / 1e6)
+    return kem_ms, dem_ms
+
+
+# -------------------------------
+# All payload sizes and AEADs for one backend
+# BreakEven1pct_bytes: payload size from which the KEM is < 1 % of the
+# pipeline, from a linear fit DEM_ms = a + b * bytes over all sizes.
+# -------------------------------
+def benchmark_kemdem(backend, aeads, sizes=SIZES):
+    gen, enc_func, dec_func = load(backend)
+    calls, _ = kem_calls(gen, enc_func, dec_func, pool_keypairs(backend))
+    public_key = calls["Encaps"][1][0]
+    secret_key = calls["Decaps"][1][0]
+
+    payload = memoryview(bytearray(os.urandom(1024)) * (max(sizes) // 1024 + 1))
+    buffers = (bytearray(CHUNK + 15), bytearray(CHUNK + 15))
+
+    rows = []
+    for aead in aeads:
+        aead_rows = []
+        for size in sizes:
+            iterations = max(3, min(ITERATIONS, BYTES_PER_POINT // size))
+            kem_ms, dem_ms = time_pipeline(enc_func, dec_func, public_key, secret_key,
+                                           AEADS[aead], payload[:size], buffers, iterations)
+            kem, dem = float(np.median(kem_ms)), float(np.median(dem_ms))
+            total = float(np.median(np.add(kem_ms, dem_ms)))
+            aead_rows.append({
+                "Algorithm": backend["name"],
+                "Family": backend["family"],
+                "AEAD": aead,
+                "PayloadBytes": size,
+                "ChunkBytes": CHUNK,
+                "Iterations": iterations,
+                "KEM_ms": kem,
+                "DEM_ms": dem,
+                "Total_ms": total,
+                "KEMShare": kem / (kem + dem),
+                "Throughput_MBps": size / 1e6 / (total / 1000),
+                "WireOverheadBytes": len(calls["Decaps"][1][1]) + math.ceil(size / CHUNK) * _TAG,
+            })
+
+        slope, intercept = np.polyfit([r["PayloadBytes"] for r in aead_rows],
+                                      [r["DEM_ms"] for r in aead_rows], 1)
+        kem = float(np.median([r["KEM_ms"] for r in aead_rows]))
+        break_even = max(0.0, (99 * kem - intercept) / slope) if slope > 0 else float("nan")
+        for row in aead_rows:
+            row["BreakEven1pct_bytes"] = break_even
+        rows.extend(aead_rows)
+        print(f"{backend['name']} {aead}: KEM {kem:.3f} ms, < 1 % of the pipeline from "
+              f"{break_even / 1e6:.2f} MB")
+    return rows
+
+
+# -------------------------------
+# Plot: KEM share of the pipeline over payload size, per algorithm
+# -------------------------------
+def plot_amortization(df, plot_path, aead):
+    part = df[df["AEAD"] == aead]
+    plt.figure(figsize=(10, 6))
+    for name, group in part.groupby("Algorithm", sort=False):
+        plt.plot(group["PayloadBytes"], group["KEMShare"] * 100, "o-", label=name)
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.axhline(1, color="grey", linestyle="--", linewidth=1)
+    plt.xlabel("Payload Size (Bytes)")
+    plt.ylabel("KEM Share of Pipeline Time (%)")
+    plt.title(f"KEM-DEM: KEM Cost Amortization over Payload Size ({aead})")
+    plt.grid(True)
+    plt.legend(fontsize=8)
+    plt.tight_layout()
+    plt.savefig(plot_path, dpi=300)
+    plt.close()
+    print(f"Plot saved: {plot_path}")
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KEM + HKDF + chunked AEAD pipeline over payload sizes")
+    add_selection_args(parser)
+    parser.add_argument("--aead", choices=list(AEADS) + ["both"], default="AES-256-GCM",
+                        help="AEAD for the payload (default: AES-256-GCM)")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated payload sizes in bytes (default: $BENCH_KEMDEM_SIZES)")
+    args = parser.parse_args(argv)
+    backends, _ = parse_selection(parser, args)
+    if not args.algo and not args.family:
+        backends = select(families=["HQC", "ML-KEM", "McEliece"], discovered=args.all_params)
+    aeads = list(AEADS) if args.aead == "both" else [args.aead]
+    sizes = tuple(int(s) for s in args.sizes.split(","))
+    isolate_process()
+
+    rows = []
+    for backend in backends:
+        rows.extend(benchmark_kemdem(backend, aeads, sizes))
+    df = pd.DataFrame(rows)
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "kemdem_benchmark.csv")
+    save_results(df, csv_path)
+    print(f"CSV saved: {csv_path}")
+    for aead in aeads:
+        suffix = aead.split("-")[0].lower()
+        plot_amortization(df, os.path.join(args.profile, f"kemdem_amortization_{suffix}.png"), aead)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import mmap
+import multiprocessing
+import os
+import statistics
+import struct
+import time
+
+from bench_env import allotted_cpus
+from bench_registry import load
+
+# bench_runner / pandas are imported in main(): bench_runner itself uses
+# pool_keypairs() below.
+
+# -------------------------------
+# Keypair pool configuration
+# BENCH_KEYPOOL: directory with pre-generated pools. When set, benchmarks
+# take their encaps / decaps keypairs from <dir>/<algorithm>.kpool
+# instead of calling keygen (keygen itself is still timed with keygen).
+# -------------------------------
+KEYPOOL_DIR = os.environ.get("BENCH_KEYPOOL", "")
+
+# -------------------------------
+# File format (little endian), one file per parameter set:
+#   64 byte header: magic, version, header size, public key size,
+#                   secret key size, key count, algorithm name
+#   count fixed-size records: public key || secret key
+# Record i starts at HEADER_SIZE + i * (public key size + secret key size).
+# -------------------------------
+MAGIC = b"PQKP"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sHHIII32s")
+
+# Keypairs per generation task (bounds the memory of one task result)
+_CHUNK_KEYS = 8
+
+
+def pool_path(backend, directory=None):
+    return os.path.join(directory or KEYPOOL_DIR or "keypools", f"{backend['name']}.kpool")
+
+
+# -------------------------------
+# Only byte-string keys fit fixed-size records (not the ECDH key objects)
+# -------------------------------
+def poolable(backend):
+    return backend["module"].startswith("pqcrypto.")
+
+
+def _generate(task):
+    backend, count = task
+    gen = load(backend)[0]
+    records = bytearray()
+    for _ in range(count):
+        public_key, secret_key = gen()
+        assert len(public_key) == backend["public_key"] and len(secret_key) == backend["secret_key"]
+        records += public_key
+        records += secret_key
+    return bytes(records)
+
+
+# -------------------------------
+# Generate `count` keypairs in parallel and write them to `path`
+# Chunks are written as they arrive (a full McEliece-8192128 pool does not
+# need to fit in memory) into a temporary file that replaces `path` at the
+# end. Returns the wall time in seconds.
+# -------------------------------
+def generate_pool(backend, count, path, workers=None):
+    workers = workers or allotted_cpus()
+    tasks = [(backend, min(_CHUNK_KEYS, count - start)) for start in range(0, count, _CHUNK_KEYS)]
+    header = _HEADER.pack(MAGIC, VERSION, HEADER_SIZE, backend["public_key"], backend["secret_key"],
+                          count, backend["name"].encode())
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    t0 = time.perf_counter()
+    with open(tmp_path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        with multiprocessing.Pool(workers) as pool:
+            for records in pool.imap_unordered(_generate, tasks):
+                f.write(records)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return time.perf_counter() - t0
+
+
+# -------------------------------
+# Memory-map a pool file (read-only)
+# Raises ValueError if the file is not a pool or belongs to another
+# parameter set. "view" is a zero-copy memoryview over the whole file.
+# -------------------------------
+def open_pool(path, backend=None):
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < HEADER_SIZE:
+        mm.close()
+        raise ValueError(f"{path}: not a keypair pool")
+    magic, version, header_size, pk_size, sk_size, count, name = _HEADER.unpack_from(mm)
+    name = name.rstrip(b"\0").decode()
+    record = pk_size + sk_size
+
+    error = None
+    if magic != MAGIC or version != VERSION:
+        error = "not a keypair pool (or unsupported version)"
+    elif len(mm) < header_size + count * record:
+        error = "truncated"
+    elif backend is not None and (name, pk_size, sk_size) != (
+            backend["name"], backend["public_key"], backend["secret_key"]):
+        error = f"pool for {name}, not {backend['name']}"
+    if error:
+        mm.close()
+        raise ValueError(f"{path}: {error}")
+
+    return {"name": name, "count": count, "public_key": pk_size, "secret_key": sk_size,
+            "offset": header_size, "record": record, "mmap": mm, "view": memoryview(mm)}
+
+
+def close_pool(pool):
+    pool["view"].release()
+    pool["mmap"].close()
+
+
+# -------------------------------
+# Keypair i of an open pool
+# Slicing the view is zero-copy; pqcrypto only accepts bytes, so the
+# single copy per key happens here.
+# -------------------------------
+def pool_keypair(pool, index):
+    start = pool["offset"] + index * pool["record"]
+    split = start + pool["public_key"]
+    return bytes(pool["view"][start:split]), bytes(pool["view"][split:start + pool["record"]])
+
+
+# -------------------------------
+# Number of keypairs in a pool file, 0 if missing or not usable
+# -------------------------------
+def pool_count(path, backend):
+    try:
+        pool = open_pool(path, backend)
+    except (OSError, ValueError):
+        return 0
+    count = pool["count"]
+    close_pool(pool)
+    return count
+
+
+# -------------------------------
+# Endless iterator over the pooled keypairs of one backend, or None when
+# BENCH_KEYPOOL is not set or has no pool for it (callers then use keygen)
+# -------------------------------
+def pool_keypairs(backend, directory=None):
+    path = pool_path(backend, directory)
+    if not (directory or KEYPOOL_DIR) or not poolable(backend) or not os.path.exists(path):
+        return None
+    pool = open_pool(path, backend)
+
+    def cycle():
+        try:
+            while True:
+                for index in range(pool["count"]):
+                    yield pool_keypair(pool, index)
+        finally:
+            close_pool(pool)
+
+    return cycle()
+
+
+# -------------------------------
+# Drop the file from the page cache, so the next load reads from disk
+# Returns False where that is not possible (no posix_fadvise, ...).
+# -------------------------------
+def evict(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        return True
+    except (AttributeError, OSError):
+        return False
+    finally:
+        os.close(fd)
+
+
+# -------------------------------
+# Time loading `keys` keypairs: open + mmap + copy each key out, in ms
+# -------------------------------
+def time_load(path, backend, keys):
+    t0 = time.perf_counter_ns()
+    pool = open_pool(path, backend)
+    for index in range(keys):
+        pool_keypair(pool, index)
+    elapsed = time.perf_counter_ns() - t0
+    close_pool(pool)
+    return elapsed / 1e6
+
+
+# -------------------------------
+# Cold (evicted from the page cache) vs warm load times of one pool
+# FirstKey = one long-lived key as a server loads it at startup,
+# Load = every key in the pool. Medians over `repeats` runs.
+# -------------------------------
+def benchmark_loading(backend, path, repeats=5):
+    count = pool_count(path, backend)
+    results = {"ColdFirstKey_ms": [], "WarmFirstKey_ms": [], "ColdLoad_ms": [], "WarmLoad_ms": []}
+    evicted = True
+    for _ in range(repeats):
+        for keys, label in ((1, "FirstKey"), (count, "Load")):
+            evicted &= evict(path)
+            results[f"Cold{label}_ms"].append(time_load(path, backend, keys))
+            results[f"Warm{label}_ms"].append(time_load(path, backend, keys))
+
+    row = {name: statistics.median(values) for name, values in results.items()}
+    row["ColdLoadPerKey_ms"] = row["ColdLoad_ms"] / count
+    row["WarmLoadPerKey_ms"] = row["WarmLoad_ms"] / count
+    row["Evicted"] = evicted
+    return row
+
+
+# -------------------------------
+# Make sure a pool with at least `keys` keypairs exists, then time loading
+# -------------------------------
+def prepare_and_benchmark(backend, keys, directory, workers, regenerate=False, repeats=5):
+    path = pool_path(backend, directory)
+    generate_s = None
+    if regenerate or pool_count(path, backend) < keys:
+        generate_s = generate_pool(backend, keys, path, workers)
+        print(f"{backend['name']}: {keys} keypairs generated in {generate_s:.1f} s -> {path}")
+
+    count = pool_count(path, backend)
+    row = {
+        "Algorithm": backend["name"],
+        "Keys": count,
+        "RecordBytes": backend["public_key"] + backend["secret_key"],
+        "FileBytes": os.path.getsize(path),
+        "Workers": workers,
+        "Generate_s": generate_s,
+        "GeneratePerKey_ms": generate_s * 1000 / count if generate_s is not None else None,
+    }
+    row.update(benchmark_loading(backend, path, repeats))
+    print(f"{backend['name']}: first key cold {row['ColdFirstKey_ms']:.3f} ms, "
+          f"warm {row['WarmFirstKey_ms']:.3f} ms")
+    return row
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    import pandas as pd
+
+    from bench_registry import select
+    from bench_runner import add_selection_args, parse_selection
+    from bench_store import save_results
+
+    parser = argparse.ArgumentParser(description="Pre-generate keypair pools and time cold/warm loading")
+    add_selection_args(parser)
+    parser.add_argument("--keys", type=int, default=64, help="keypairs per pool (default: 64)")
+    parser.add_argument("--dir", default=KEYPOOL_DIR or "keypools",
+                        help="pool directory (default: $BENCH_KEYPOOL or keypools)")
+    parser.add_argument("--workers", type=int, default=allotted_cpus(),
+                        help="parallel keygen processes (default: allotted CPUs)")
+    parser.add_argument("--repeats", type=int, default=5, help="load timings per pool (default: 5)")
+    parser.add_argument("--regenerate", action="store_true", help="regenerate existing pools")
+    args = parser.parse_args(argv)
+    backends, _ = parse_selection(parser, args)
+    if not args.algo and not args.family:
+        backends = select(families=["McEliece"], discovered=args.all_params)
+
+    rows = []
+    for backend in backends:
+        if not poolable(backend):
+            print(f"[WARN] {backend['name']}: keys are not byte strings, no pool")
+            continue
+        rows.append(prepare_and_benchmark(backend, args.keys, args.dir, args.workers,
+                                          args.regenerate, args.repeats))
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "keypool_benchmark.csv")
+    save_results(pd.DataFrame(rows), csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import time
+
+# Harness import time is taken from here to the end of the imports
+_T_IMPORT = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+
+from bench_engine import budget_for, kem_calls, sample
+from bench_env import environment_snapshot, isolate_process
+from bench_keypool import pool_keypairs
+from bench_registry import FAMILIES, codec_calls, load, select
+from bench_timer import floor_ms
+
+_T_READY = time.perf_counter()
+
+# The measurement process imports only the standard library, the timing
+# harness and the selected crypto backends: no numpy / pandas /
+# matplotlib (their import time, RSS and allocator state would sit under
+# the timed calls). Summaries, CSVs, the store and plots come later, in
+# bench_runner.py / bench_report.py.
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "scipy")
+
+# Command line operation names -> CSV column prefixes
+OPS = {"keygen": "KeyGen", "encaps": "Encaps", "decaps": "Decaps", "handshake": "Handshake"}
+DEFAULT_OPS = ("KeyGen", "Encaps", "Decaps")
+
+
+# -------------------------------
+# Command line options shared by all runners
+# -------------------------------
+def add_selection_args(parser):
+    parser.add_argument("--algo", action="append",
+                        help="algorithm name, e.g. ML-KEM-768 (repeatable, default: all)")
+    parser.add_argument("--family", action="append", choices=list(FAMILIES),
+                        help="algorithm family (repeatable, default: all)")
+    parser.add_argument("--op", action="append", choices=list(OPS),
+                        help="operation to time (repeatable, default: keygen, encaps, decaps)")
+    parser.add_argument("--profile", default=os.environ.get("PROFILE", "default"),
+                        help="results directory (default: $PROFILE)")
+    parser.add_argument("--all-params", action="store_true",
+                        help="include every KEM parameter set shipped in pqcrypto.kem "
+                             "(e.g. the McEliece f variants), not only the registered ones")
+
+
+def parse_selection(parser, args):
+    try:
+        backends = select(args.algo, args.family, args.all_params)
+    except ValueError as exc:
+        parser.error(str(exc))
+    ops = tuple(OPS[op] for op in args.op) if args.op else DEFAULT_OPS
+    return backends, ops
+
+
+def _status_kb(key):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+# -------------------------------
+# Startup cost of this process
+# Startup_ms: process start -> first line of this module (interpreter
+#             start-up, from /proc, 10 ms resolution)
+# HarnessImport_ms: imports of this module
+# HarnessRSS_MB: resident set size once the harness is imported
+# Other lean entry points (bench_sigmeasure.py) pass their own import
+# bracket.
+# -------------------------------
+def startup_report(t_import=_T_IMPORT, t_ready=_T_READY):
+    startup_ms = None
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        age_s = time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / os.sysconf("SC_CLK_TCK")
+        startup_ms = max(0.0, (age_s - (time.perf_counter() - t_import)) * 1000)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    rss_kb = _status_kb("VmRSS")
+    return {
+        "Startup_ms": startup_ms,
+        "HarnessImport_ms": (t_ready - t_import) * 1000,
+        "HarnessRSS_MB": rss_kb / 1024 if rss_kb is not None else None,
+        "Modules": len(sys.modules),
+        "HeavyModules": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+
+# -------------------------------
+# One JSON line per record, flushed right away: a crash or a kill only
+# loses the operation being timed
+# -------------------------------
+def emit(sink, record):
+    sink.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+    sink.flush()
+
+
+# -------------------------------
+# Last record of a run: peak RSS and any heavy module that got imported
+# -------------------------------
+def end_record():
+    return {"type": "end", "max_rss_mb": (_status_kb("VmHWM") or 0) / 1024,
+            "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules]}
+
+
+# -------------------------------
+# Time the backends and stream everything to the sink
+# Records: "run" (startup cost, timer floor, environment), per backend
+# "backend" (sizes, backend import time) and one "samples" record per
+# operation (raw wall / CPU ms, throttling flags, cgroup delta), "end".
+# The backend record goes out before its first operation is timed and
+# each samples record as soon as its operation is done.
+# Encaps / decaps use a pooled keypair when BENCH_KEYPOOL has one. ECDH
+# backends also time public key encode / decode on their own.
+# -------------------------------
+def measure(backends, ops, sink):
+    startup = startup_report()
+    isolate_process()
+    emit(sink, {"type": "run", "argv": sys.argv[1:], "ops": list(ops), "startup": startup,
+                "floor_ms": floor_ms(), "environment": environment_snapshot()})
+
+    for backend in backends:
+        t0 = time.perf_counter()
+        gen, enc_func, dec_func = load(backend)
+        import_ms = (time.perf_counter() - t0) * 1000
+
+        budget = budget_for(backend["name"])
+        calls, sizes = kem_calls(gen, enc_func, dec_func, keypairs=pool_keypairs(backend),
+                                 static_key=backend.get("static_key", False))
+        emit(sink, {"type": "backend", "name": backend["name"], "family": backend["family"],
+                    "level": backend["level"], "mode": backend.get("mode"), "sizes": sizes,
+                    "import_ms": import_ms})
+        timed = [(op, calls[op]) for op in ops] + list(codec_calls(backend).items())
+        for op, (func, args) in timed:
+            wall, cpu, info = sample(func, args, budget=budget)
+            emit(sink, {"type": "samples", "name": backend["name"], "operation": op, "wall_ms": wall,
+                        "cpu_ms": cpu, "throttled": info["throttled"], "cgroup": info["cgroup"]})
+        print(f"{backend['name']} done", flush=True)
+
+    emit(sink, end_record())
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time KEM / ECDH backends and stream the raw samples as JSON lines")
+    add_selection_args(parser)
+    parser.add_argument("--output",
+                        help="JSON-lines file (default: <profile>/measure_samples.jsonl)")
+    args = parser.parse_args(argv)
+    backends, ops = parse_selection(parser, args)
+
+    output = args.output or os.path.join(args.profile, "measure_samples.jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as sink:
+        measure(backends, ops, sink)
+    print(f"Samples saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
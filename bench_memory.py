@@ -0,0 +1,199 @@
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+
+from bench_engine import kem_calls
+from bench_env import allotted_cpus
+from bench_registry import load
+
+# pandas / bench_runner are only imported in main(), so the spawned
+# measurement children (which re-import this module) stay lean and
+# their baseline RSS is close to "interpreter + crypto backend".
+
+# Memory budgets for the "max concurrent handshakes" estimate (MB)
+BUDGETS_MB = [int(mb) for mb in os.environ.get("BENCH_MEMORY_BUDGETS_MB", "500").split(",")]
+
+
+def _status_bytes(key):
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# -------------------------------
+# Resident set size now / peak of this process
+# Peak falls back to ru_maxrss (KB on Linux, bytes on macOS).
+# -------------------------------
+def rss_bytes():
+    return _status_bytes("VmRSS")
+
+
+def peak_rss_bytes():
+    peak = _status_bytes("VmHWM")
+    if peak is None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = maxrss if sys.platform == "darwin" else maxrss * 1024
+    return peak
+
+
+# -------------------------------
+# Reset the peak RSS (VmHWM) to the current RSS (Linux >= 4.0)
+# Without it only increases of the lifetime peak (ru_maxrss) are visible.
+# -------------------------------
+def reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+# -------------------------------
+# Peak of Python-level allocations during one call (tracemalloc)
+# Allocations inside the C library (malloc, stack) are not traced.
+# -------------------------------
+def python_peak_bytes(func, args=()):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return peak
+
+
+# -------------------------------
+# Runs in a freshly spawned process: nothing has touched the heap or stack
+# yet, so the RSS peak of the first call is what the operation needs.
+# op "Handshake" runs `workers` complete handshakes concurrently in threads.
+# It runs one handshake before the baseline, so one-time library init
+# (e.g. OpenSSL's lazy init for ECDH) is not divided over the workers.
+# The threads start after the baseline, so their stacks count in full.
+# -------------------------------
+def _rss_child(backend, op, inputs, workers, conn):
+    gen, enc_func, dec_func = load(backend)
+    if inputs is None:
+        # Unpicklable inputs (ECDH private key objects): prepare them here
+        calls, _ = kem_calls(gen, enc_func, dec_func)
+        inputs = calls[op][1] if op in calls else ()
+    funcs = {"KeyGen": gen, "Encaps": enc_func, "Decaps": dec_func}
+
+    def handshake():
+        public_key, secret_key = gen()
+        ciphertext, _ = enc_func(public_key)
+        dec_func(secret_key, ciphertext)
+
+    if op == "Handshake":
+        handshake()
+        barrier = threading.Barrier(workers)
+
+        def worker():
+            barrier.wait()
+            handshake()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+
+    base_rss = rss_bytes() or peak_rss_bytes()
+    precise = reset_peak_rss()
+    before = peak_rss_bytes()
+
+    if op == "Handshake":
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    else:
+        funcs[op](*inputs)
+
+    after = peak_rss_bytes()
+    peak = after - base_rss if precise else after - before
+    conn.send({"base_rss": base_rss, "peak": max(0, peak), "precise": precise})
+
+
+def rss_peak(backend, op, inputs=(), workers=1):
+    if not all(isinstance(value, bytes) for value in inputs):
+        inputs = None
+    ctx = multiprocessing.get_context("spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_rss_child, args=(backend, op, inputs, workers, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+
+# -------------------------------
+# Memory profile of one backend
+# Per operation: Python-level peak (tracemalloc) and RSS peak of the
+# first call in a fresh process (covers malloc / stack use in C). Then
+# `workers` concurrent handshakes give the memory per in-flight handshake
+# (never less than the key material it holds) and how many fit in each
+# budget on top of the process baseline.
+# -------------------------------
+def profile_backend(backend, ops, workers, budgets_mb=BUDGETS_MB):
+    gen, enc_func, dec_func = load(backend)
+    calls, sizes = kem_calls(gen, enc_func, dec_func)
+
+    row = {"Algorithm": backend["name"], "Family": backend["family"], **sizes}
+    for op in ops:
+        func, args = calls[op]
+        row[f"{op}_py_peak_bytes"] = python_peak_bytes(func, args)
+        row[f"{op}_rss_peak_bytes"] = rss_peak(backend, op, args)["peak"]
+
+    concurrent = rss_peak(backend, "Handshake", workers=workers)
+    key_material = sum(sizes.values())
+    per_handshake = max(concurrent["peak"] / workers, key_material)
+    row.update({
+        "PeakPrecise": concurrent["precise"],
+        "BaseRSS_bytes": concurrent["base_rss"],
+        "Workers": workers,
+        "ConcurrentPeak_bytes": concurrent["peak"],
+        "PerHandshake_bytes": per_handshake,
+    })
+    for budget in budgets_mb:
+        free = budget * 1024 * 1024 - concurrent["base_rss"]
+        row[f"MaxConcurrent_{budget}MB"] = max(0, int(free // per_handshake))
+
+    print(f"{backend['name']} done: {per_handshake / 1024:.0f} KiB per handshake")
+    return row
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    import pandas as pd
+
+    from bench_runner import add_selection_args, parse_selection
+    from bench_store import save_results
+
+    parser = argparse.ArgumentParser(description="Per-operation peak memory and handshake capacity")
+    add_selection_args(parser)
+    parser.add_argument("--workers", type=int, default=allotted_cpus(),
+                        help="concurrent handshakes for the per-handshake peak (default: allotted CPUs)")
+    parser.add_argument("--budget-mb", type=int, action="append",
+                        help="memory budget for the capacity estimate (repeatable, default: "
+                             "$BENCH_MEMORY_BUDGETS_MB or 500)")
+    args = parser.parse_args(argv)
+    backends, ops = parse_selection(parser, args)
+
+    rows = [profile_backend(backend, ops, args.workers, args.budget_mb or BUDGETS_MB)
+            for backend in backends]
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "memory_benchmark.csv")
+    save_results(pd.DataFrame(rows), csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
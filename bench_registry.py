@@ -0,0 +1,263 @@
+import importlib
+import pkgutil
+
+# -------------------------------
+# Result file per algorithm family (one CSV per family and profile)
+# -------------------------------
+FAMILIES = {
+    "HQC": "pqc_hqc_benchmark.csv",
+    "ML-KEM": "pqc_mlkem_benchmark.csv",
+    "McEliece": "pqc_mceliece_benchmark.csv",
+    "ECC": "ecc_benchmark.csv",
+    "Hybrid": "hybrid_benchmark.csv",
+}
+
+# -------------------------------
+# Registry of all KEM / ECDH backends
+# level = NIST security category (ECC: comparable classical strength)
+# Sizes in bytes; modules are only imported when a backend is selected.
+# -------------------------------
+BACKENDS = [
+    {"name": "HQC-128", "family": "HQC", "level": 1, "module": "pqcrypto.kem.hqc_128",
+     "public_key": 2249, "secret_key": 2305, "ciphertext": 4433, "shared_key": 64},
+    {"name": "HQC-192", "family": "HQC", "level": 3, "module": "pqcrypto.kem.hqc_192",
+     "public_key": 4522, "secret_key": 4586, "ciphertext": 8978, "shared_key": 64},
+    {"name": "HQC-256", "family": "HQC", "level": 5, "module": "pqcrypto.kem.hqc_256",
+     "public_key": 7245, "secret_key": 7317, "ciphertext": 14421, "shared_key": 64},
+
+    {"name": "ML-KEM-512", "family": "ML-KEM", "level": 1, "module": "pqcrypto.kem.ml_kem_512",
+     "public_key": 800, "secret_key": 1632, "ciphertext": 768, "shared_key": 32},
+    {"name": "ML-KEM-768", "family": "ML-KEM", "level": 3, "module": "pqcrypto.kem.ml_kem_768",
+     "public_key": 1184, "secret_key": 2400, "ciphertext": 1088, "shared_key": 32},
+    {"name": "ML-KEM-1024", "family": "ML-KEM", "level": 5, "module": "pqcrypto.kem.ml_kem_1024",
+     "public_key": 1568, "secret_key": 3168, "ciphertext": 1568, "shared_key": 32},
+
+    {"name": "McEliece-348864", "family": "McEliece", "level": 1, "module": "pqcrypto.kem.mceliece348864",
+     "public_key": 261120, "secret_key": 6492, "ciphertext": 96, "shared_key": 32},
+    {"name": "McEliece-6688128", "family": "McEliece", "level": 5, "module": "pqcrypto.kem.mceliece6688128",
+     "public_key": 1044992, "secret_key": 13932, "ciphertext": 208, "shared_key": 32},
+    {"name": "McEliece-8192128", "family": "McEliece", "level": 5, "module": "pqcrypto.kem.mceliece8192128",
+     "public_key": 1357824, "secret_key": 14120, "ciphertext": 208, "shared_key": 32},
+
+    # ECDH wrapped as a KEM (see ecdh_kem.py), secret key = private scalar
+    # Ephemeral-static: the KeyGen key is long-lived, so a handshake is
+    # encaps + decaps only. Ephemeral-ephemeral variants ("-EE") follow below.
+    {"name": "secp256r1", "family": "ECC", "level": 1, "module": "ecdh_kem", "curve": "SECP256R1",
+     "public_key": 65, "secret_key": 32, "ciphertext": 65, "shared_key": 32},
+    {"name": "secp384r1", "family": "ECC", "level": 3, "module": "ecdh_kem", "curve": "SECP384R1",
+     "public_key": 97, "secret_key": 48, "ciphertext": 97, "shared_key": 48},
+    {"name": "secp521r1", "family": "ECC", "level": 5, "module": "ecdh_kem", "curve": "SECP521R1",
+     "public_key": 133, "secret_key": 66, "ciphertext": 133, "shared_key": 66},
+    {"name": "X25519", "family": "ECC", "level": 1, "module": "ecdh_kem", "curve": "X25519",
+     "public_key": 32, "secret_key": 32, "ciphertext": 32, "shared_key": 32},
+    {"name": "X448", "family": "ECC", "level": 3, "module": "ecdh_kem", "curve": "X448",
+     "public_key": 56, "secret_key": 56, "ciphertext": 56, "shared_key": 56},
+]
+
+for _backend in [b for b in BACKENDS if b["family"] == "ECC"]:
+    _backend.update(mode="ephemeral-static", static_key=True)
+    BACKENDS.append({**_backend, "name": f"{_backend['name']}-EE", "mode": "ephemeral-ephemeral",
+                     "static_key": False})
+
+_BY_NAME = {backend["name"]: backend for backend in BACKENDS}
+
+# -------------------------------
+# Hybrid KEMs (see hybrid_kem.py): (classical, PQ) pairs, each once with
+# the halves run one after the other and once concurrently.
+# Sizes are the sums of both halves, level is the PQ part's.
+# -------------------------------
+HYBRIDS = [("secp256r1", "ML-KEM-768"), ("X25519", "ML-KEM-768"), ("secp384r1", "ML-KEM-1024")]
+
+for _classical, _pq in HYBRIDS:
+    for _concurrent in (False, True):
+        BACKENDS.append({
+            "name": f"{_classical}+{_pq}" + ("-concurrent" if _concurrent else ""),
+            "family": "Hybrid", "level": _BY_NAME[_pq]["level"], "module": "hybrid_kem",
+            "classical": _classical, "pq": _pq, "concurrent": _concurrent,
+            **{size: _BY_NAME[_classical][size] + _BY_NAME[_pq][size]
+               for size in ("public_key", "secret_key", "ciphertext")},
+            "shared_key": 32,
+        })
+
+
+# -------------------------------
+# Parameter-set discovery: every KEM module in the installed pqcrypto.kem
+# package (including the McEliece "f" variants and 460896 / 6960119),
+# with sizes from the module constants. Registered backends keep their
+# entry; modules of an unknown family are skipped.
+# -------------------------------
+_DISCOVERY_PREFIXES = {"hqc_": ("HQC", "HQC-"), "ml_kem_": ("ML-KEM", "ML-KEM-"),
+                       "mceliece": ("McEliece", "McEliece-")}
+
+# NIST category per parameter set (suffix without "f")
+_LEVELS = {"128": 1, "192": 3, "256": 5, "512": 1, "768": 3, "1024": 5,
+           "348864": 1, "460896": 3, "6688128": 5, "6960119": 5, "8192128": 5}
+
+_discovered = None
+
+
+def discover():
+    global _discovered
+    if _discovered is not None:
+        return _discovered
+
+    import pqcrypto.kem
+    by_module = {backend["module"]: backend for backend in BACKENDS}
+    _discovered = []
+    for info in sorted(pkgutil.iter_modules(pqcrypto.kem.__path__), key=lambda m: m.name):
+        module_name = f"pqcrypto.kem.{info.name}"
+        if module_name in by_module:
+            _discovered.append(by_module[module_name])
+            continue
+        prefix = next((p for p in _DISCOVERY_PREFIXES if info.name.startswith(p)), None)
+        if prefix is None:
+            continue
+        family, name_prefix = _DISCOVERY_PREFIXES[prefix]
+        params = info.name[len(prefix):]
+        module = importlib.import_module(module_name)
+        _discovered.append({
+            "name": name_prefix + params, "family": family,
+            "level": _LEVELS.get(params.removesuffix("f")), "module": module_name,
+            "public_key": module.PUBLIC_KEY_SIZE, "secret_key": module.SECRET_KEY_SIZE,
+            "ciphertext": module.CIPHERTEXT_SIZE, "shared_key": module.PLAINTEXT_SIZE,
+        })
+    _discovered.sort(key=lambda b: (list(FAMILIES).index(b["family"]), b["public_key"], b["name"]))
+    return _discovered
+
+
+# -------------------------------
+# Select backends by name and/or family (case-insensitive)
+# discovered=True adds every parameter set found by discover()
+# -------------------------------
+def select(algos=None, families=None, discovered=False):
+    algos = {a.lower() for a in algos} if algos else None
+    families = {f.lower() for f in families} if families else None
+    candidates = BACKENDS
+    if discovered:
+        candidates = discover() + [b for b in BACKENDS if b not in discover()]
+
+    selected = []
+    for backend in candidates:
+        if algos is not None and backend["name"].lower() not in algos:
+            continue
+        if families is not None and backend["family"].lower() not in families:
+            continue
+        selected.append(backend)
+
+    if algos is not None:
+        unknown = algos - {b["name"].lower() for b in candidates}
+        if unknown:
+            raise ValueError(f"Unknown algorithm(s): {', '.join(sorted(unknown))}")
+    return selected
+
+
+# -------------------------------
+# Import a backend lazily and return (generate_keypair, encrypt, decrypt)
+# -------------------------------
+def load(backend):
+    module = importlib.import_module(backend["module"])
+    if "curve" in backend:
+        return module.ecdh_kem(backend["curve"])
+    if "pq" in backend:
+        classical, pq = _BY_NAME[backend["classical"]], _BY_NAME[backend["pq"]]
+        return module.hybrid_kem(load(classical), load(pq), pq["public_key"], pq["ciphertext"],
+                                 backend["concurrent"])
+    return module.generate_keypair, module.encrypt, module.decrypt
+
+
+# -------------------------------
+# Extra (func, args) calls timed next to keygen / encaps / decaps:
+# public key encode / decode for ECDH, nothing for byte-string keys
+# -------------------------------
+def codec_calls(backend):
+    if "curve" not in backend:
+        return {}
+    return importlib.import_module(backend["module"]).ecdh_codec_calls(backend["curve"])
+
+
+# -------------------------------
+# Signature suites: result file per family (see bench_signatures.py)
+# -------------------------------
+SIGNATURE_FAMILIES = {
+    "ML-DSA": "pqc_mldsa_signature_benchmark.csv",
+    "Falcon": "pqc_falcon_signature_benchmark.csv",
+    "SPHINCS+": "pqc_sphincs_signature_benchmark.csv",
+    "ECC": "ecc_signature_benchmark.csv",
+}
+
+# -------------------------------
+# Registry of all signature backends
+# Sizes in bytes; "signature" is the maximum (Falcon and ECDSA signatures
+# vary in length, "padded" Falcon has fixed-size signatures).
+# -------------------------------
+SIGNATURES = [
+    {"name": "ML-DSA-44", "family": "ML-DSA", "level": 2, "module": "pqcrypto.sign.ml_dsa_44",
+     "public_key": 1312, "secret_key": 2560, "signature": 2420},
+    {"name": "ML-DSA-65", "family": "ML-DSA", "level": 3, "module": "pqcrypto.sign.ml_dsa_65",
+     "public_key": 1952, "secret_key": 4032, "signature": 3309},
+    {"name": "ML-DSA-87", "family": "ML-DSA", "level": 5, "module": "pqcrypto.sign.ml_dsa_87",
+     "public_key": 2592, "secret_key": 4896, "signature": 4627},
+
+    {"name": "Falcon-512", "family": "Falcon", "level": 1, "module": "pqcrypto.sign.falcon_512",
+     "public_key": 897, "secret_key": 1281, "signature": 752},
+    {"name": "Falcon-1024", "family": "Falcon", "level": 5, "module": "pqcrypto.sign.falcon_1024",
+     "public_key": 1793, "secret_key": 2305, "signature": 1462},
+    {"name": "Falcon-padded-512", "family": "Falcon", "level": 1, "module": "pqcrypto.sign.falcon_padded_512",
+     "public_key": 897, "secret_key": 1281, "signature": 666},
+    {"name": "Falcon-padded-1024", "family": "Falcon", "level": 5, "module": "pqcrypto.sign.falcon_padded_1024",
+     "public_key": 1793, "secret_key": 2305, "signature": 1280},
+
+    # ECDSA (NIST curves) and EdDSA, see ec_sign.py
+    {"name": "ECDSA-P256", "family": "ECC", "level": 1, "module": "ec_sign", "curve": "SECP256R1",
+     "public_key": 65, "secret_key": 32, "signature": 72},
+    {"name": "ECDSA-P384", "family": "ECC", "level": 3, "module": "ec_sign", "curve": "SECP384R1",
+     "public_key": 97, "secret_key": 48, "signature": 104},
+    {"name": "ECDSA-P521", "family": "ECC", "level": 5, "module": "ec_sign", "curve": "SECP521R1",
+     "public_key": 133, "secret_key": 66, "signature": 139},
+    {"name": "Ed25519", "family": "ECC", "level": 1, "module": "ec_sign", "curve": "Ed25519",
+     "public_key": 32, "secret_key": 32, "signature": 64},
+    {"name": "Ed448", "family": "ECC", "level": 3, "module": "ec_sign", "curve": "Ed448",
+     "public_key": 57, "secret_key": 57, "signature": 114},
+]
+
+# SPHINCS+ "simple" parameter sets: SHA2 and SHAKE, small ("s") and fast
+# ("f") signatures per level: (public key, secret key, s / f signature)
+_SPHINCS_SIZES = {128: (1, 32, 64, 7856, 17088), 192: (3, 48, 96, 16224, 35664),
+                  256: (5, 64, 128, 29792, 49856)}
+
+for _hash in ("sha2", "shake"):
+    for _bits, (_level, _pk, _sk, _sig_s, _sig_f) in _SPHINCS_SIZES.items():
+        for _variant, _sig in (("s", _sig_s), ("f", _sig_f)):
+            SIGNATURES.append({
+                "name": f"SPHINCS+-{_hash.upper()}-{_bits}{_variant}", "family": "SPHINCS+",
+                "level": _level, "module": f"pqcrypto.sign.sphincs_{_hash}_{_bits}{_variant}_simple",
+                "public_key": _pk, "secret_key": _sk, "signature": _sig,
+            })
+
+
+# -------------------------------
+# Select signature backends by name and/or family (case-insensitive)
+# -------------------------------
+def select_signatures(algos=None, families=None):
+    algos = {a.lower() for a in algos} if algos else None
+    families = {f.lower() for f in families} if families else None
+
+    selected = [backend for backend in SIGNATURES
+                if (algos is None or backend["name"].lower() in algos)
+                and (families is None or backend["family"].lower() in families)]
+
+    if algos is not None:
+        unknown = algos - {b["name"].lower() for b in SIGNATURES}
+        if unknown:
+            raise ValueError(f"Unknown signature algorithm(s): {', '.join(sorted(unknown))}")
+    return selected
+
+
+# -------------------------------
+# Import a signature backend lazily and return (generate_keypair, sign, verify)
+# -------------------------------
+def load_signature(backend):
+    module = importlib.import_module(backend["module"])
+    if "curve" in backend:
+        return module.ec_signature(backend["curve"])
+    return module.generate_keypair, module.sign, module.verify
@@ -0,0 +1,188 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from bench_stats import bootstrap_ratio_ci, mann_whitney_greater
+from bench_store import (STORE_PATH, baseline_profiles, baseline_runs, latest_sample_runs,
+                         load_run_samples, pin_baseline)
+
+# -------------------------------
+# Regression gate configuration
+# BENCH_REGRESS_THRESHOLD: relative slowdown of the median that counts
+#                          (0.10 = 10 % slower)
+# BENCH_REGRESS_ALPHA:     significance level of the Mann-Whitney test
+# BENCH_REGRESS_METHOD:    mannwhitney, bootstrap or both (both must agree)
+# -------------------------------
+THRESHOLD = float(os.environ.get("BENCH_REGRESS_THRESHOLD", "0.10"))
+ALPHA = float(os.environ.get("BENCH_REGRESS_ALPHA", "0.01"))
+METHOD = os.environ.get("BENCH_REGRESS_METHOD", "both")
+METHODS = ("mannwhitney", "bootstrap", "both")
+
+
+# -------------------------------
+# Compare two sample series of one algorithm / operation
+# mannwhitney: one-sided test significant and median ratio beyond the
+#              threshold
+# bootstrap:   the whole CI of the median ratio beyond the threshold
+# "faster" is the mirror image; it is reported but never fails the gate.
+# -------------------------------
+def compare_samples(baseline, candidate, threshold=THRESHOLD, alpha=ALPHA, method=METHOD):
+    ratio, ci_low, ci_high = bootstrap_ratio_ci(baseline, candidate)
+    _, p_slower = mann_whitney_greater(baseline, candidate)
+    _, p_faster = mann_whitney_greater(candidate, baseline)
+
+    slower = {"mannwhitney": p_slower < alpha and ratio > 1 + threshold,
+              "bootstrap": ci_low > 1 + threshold}
+    faster = {"mannwhitney": p_faster < alpha and ratio < 1 - threshold,
+              "bootstrap": ci_high < 1 - threshold}
+    if method == "both":
+        is_slower, is_faster = all(slower.values()), all(faster.values())
+    else:
+        is_slower, is_faster = slower[method], faster[method]
+
+    return {
+        "Base_n": len(baseline),
+        "New_n": len(candidate),
+        "Base_ms": float(np.median(baseline)),
+        "New_ms": float(np.median(candidate)),
+        "Ratio": ratio,
+        "Ratio_ci_low": ci_low,
+        "Ratio_ci_high": ci_high,
+        "p_slower": p_slower,
+        "Status": "REGRESSION" if is_slower else "faster" if is_faster else "ok",
+    }
+
+
+# -------------------------------
+# Compare the candidate runs of one profile against its baseline runs
+# Samples that ran into CFS throttling are left out on both sides.
+# Operations only in the baseline are reported as "missing", operations
+# with no unthrottled sample left on either side as "all-throttled";
+# both fail the gate like a regression (nothing was compared).
+# -------------------------------
+FAILING = ("REGRESSION", "missing", "all-throttled")
+
+
+def check_profile(profile, baseline, candidate, threshold=THRESHOLD, alpha=ALPHA, method=METHOD):
+    base = load_run_samples(baseline.values())
+    new = load_run_samples(candidate.values())
+    base = base[base["result_set"].isin(candidate)]
+    new_groups = dict(list(new.groupby(["result_set", "algorithm", "operation"])))
+
+    rows = []
+    for key, group in base.groupby(["result_set", "algorithm", "operation"]):
+        result_set, algorithm, operation = key
+        row = {"Profile": profile, "ResultSet": result_set, "Algorithm": algorithm,
+               "Operation": operation, "BaseRun": baseline[result_set],
+               "NewRun": candidate[result_set]}
+        if key not in new_groups:
+            rows.append({**row, "Status": "missing"})
+            continue
+        base_ms = group.loc[group["throttled"] == 0, "wall_ms"].to_numpy()
+        new_group = new_groups[key]
+        new_ms = new_group.loc[new_group["throttled"] == 0, "wall_ms"].to_numpy()
+        if not len(base_ms) or not len(new_ms):
+            rows.append({**row, "Base_n": len(base_ms), "New_n": len(new_ms),
+                         "Status": "all-throttled"})
+            continue
+        rows.append({**row, **compare_samples(base_ms, new_ms, threshold, alpha, method)})
+    return rows
+
+
+# -------------------------------
+# Readable diff table, gate failures first
+# Fixed columns, so a table of only missing / all-throttled rows prints too
+# -------------------------------
+TABLE_COLUMNS = ["Profile", "Algorithm", "Operation", "Base_n", "New_n", "Base_ms", "New_ms", "Ratio",
+                 "Ratio_ci_low", "Ratio_ci_high", "p_slower", "Status"]
+
+
+def format_table(df):
+    order = {"REGRESSION": 0, "missing": 1, "all-throttled": 2, "faster": 3, "ok": 4}
+    df = df.reindex(columns=TABLE_COLUMNS).sort_values(
+        ["Status", "Profile", "Algorithm", "Operation"],
+        key=lambda col: col.map(order) if col.name == "Status" else col)
+    table = pd.DataFrame({
+        "Profile": df["Profile"],
+        "Algorithm": df["Algorithm"],
+        "Operation": df["Operation"],
+        "Base ms": df["Base_ms"].map("{:.4f}".format),
+        "New ms": df["New_ms"].map("{:.4f}".format),
+        "Change": df["Ratio"].map(lambda r: f"{(r - 1) * 100:+.1f} %"),
+        "Ratio CI": [f"[{low:.3f}, {high:.3f}]" for low, high in zip(df["Ratio_ci_low"], df["Ratio_ci_high"])],
+        "p": df["p_slower"].map("{:.2g}".format),
+        "Status": df["Status"],
+    })
+    return table.replace({"nan": "", "+nan %": "", "[nan, nan]": ""}).to_string(index=False)
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare benchmark runs in the results store against a pinned baseline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pin = sub.add_parser("pin", help="pin the latest run of every result set as baseline")
+    pin.add_argument("--profile", action="append", required=True, help="profile (repeatable)")
+    pin.add_argument("--name", default="default", help="baseline name (default: default)")
+    pin.add_argument("--run", action="append", help="pin these run ids instead of the latest runs")
+
+    check = sub.add_parser("check", help="compare the latest runs against the baseline")
+    check.add_argument("--profile", action="append",
+                       help="profile (repeatable, default: all profiles with this baseline)")
+    check.add_argument("--name", default="default", help="baseline name (default: default)")
+    check.add_argument("--run", action="append", help="candidate run ids (default: latest runs)")
+    check.add_argument("--threshold", type=float, default=THRESHOLD,
+                       help="relative slowdown that counts (default: $BENCH_REGRESS_THRESHOLD or 0.10)")
+    check.add_argument("--alpha", type=float, default=ALPHA,
+                       help="Mann-Whitney significance level (default: $BENCH_REGRESS_ALPHA or 0.01)")
+    check.add_argument("--method", choices=METHODS, default=METHOD,
+                       help="decision rule (default: $BENCH_REGRESS_METHOD or both)")
+    check.add_argument("--output", help="also write the full comparison to this CSV")
+    args = parser.parse_args(argv)
+
+    if args.command == "pin":
+        for profile in args.profile:
+            runs = latest_sample_runs(profile, include=args.run)
+            if not runs:
+                sys.exit(f"No runs with samples for profile {profile} in {STORE_PATH}")
+            for result_set, run_id in pin_baseline(profile, args.name, runs).items():
+                print(f"Pinned {args.name} baseline: {profile} {result_set} -> {run_id}")
+        return
+
+    rows = []
+    for profile in args.profile or baseline_profiles(args.name):
+        baseline = baseline_runs(profile, args.name)
+        if not baseline:
+            sys.exit(f"No {args.name} baseline pinned for profile {profile}")
+        candidate = latest_sample_runs(profile, exclude=set(baseline.values()), include=args.run)
+        candidate = {result_set: run_id for result_set, run_id in candidate.items()
+                     if result_set in baseline}
+        if not candidate:
+            print(f"[WARN] {profile}: no new runs to compare against the baseline")
+            continue
+        rows.extend(check_profile(profile, baseline, candidate, args.threshold, args.alpha,
+                                  args.method))
+
+    if not rows:
+        sys.exit("Nothing to compare")
+    df = pd.DataFrame(rows)
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"CSV saved: {args.output}")
+    print(format_table(df))
+
+    regressions = df[df["Status"] == "REGRESSION"]
+    uncompared = df[df["Status"].isin(["missing", "all-throttled"])]
+    print(f"\n{len(df)} comparisons ({args.method}, threshold {args.threshold:.0%}, "
+          f"alpha {args.alpha}): {len(regressions)} regression(s), {len(uncompared)} not compared "
+          f"(missing / all-throttled)")
+    sys.exit(1 if df["Status"].isin(FAILING).any() else 0)
+
+
+if __name__ == "__main__":
+    main()
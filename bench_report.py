@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from bench_extrapolate import (GRID_FACTOR, extrapolation_grid, fit_models, plot_prediction, predict,
+                               series_from_results)
+from bench_registry import FAMILIES
+from bench_store import latest_run_id, load_results, load_run_samples
+
+# -------------------------------
+# Reporting configuration
+# BENCH_REPORT_JOBS: render worker processes (default: one per CPU)
+# Figures whose input data (and this file) are unchanged since the last
+# render are skipped; the hashes are kept in <output dir>/.report_cache.json.
+# -------------------------------
+JOBS = int(os.environ.get("BENCH_REPORT_JOBS", "0")) or os.cpu_count() or 1
+CACHE_NAME = ".report_cache.json"
+
+PROFILES = ["Mobile", "Laptop", "Server"]
+REPORT_FAMILIES = ("HQC", "ML-KEM", "McEliece")
+FIGURES = ("comparison", "combined")
+
+# Per family: title, (encaps, decaps) colors, output name of the combined
+# plots and of the per-profile subplots (HQC keeps its original names)
+FAMILY_PLOTS = {
+    "HQC": ("HQC KEM", ("green", "red"), "combined_hqc", "per_profile"),
+    "ML-KEM": ("ML-KEM", ("blue", "orange"), "combined_mlkem", "mlkem_per_profile"),
+    "McEliece": ("Classic McEliece", ("purple", "brown"), "combined_mceliece", "mceliece_per_profile"),
+}
+
+# Comparison plot: one style per family, distinguishable in black and white
+FAMILY_STYLES = {
+    "HQC": {"color": "green", "marker": "o", "linestyle": "-"},
+    "ML-KEM": {"color": "blue", "marker": "s", "linestyle": "--"},
+    "McEliece": {"color": "red", "marker": "D", "linestyle": "-."},
+}
+PROFILE_MARKERS = {"Mobile": "o", "Laptop": "^", "Server": "s"}
+PROFILE_LINESTYLES = {"Mobile": ":", "Laptop": "--", "Server": "-."}
+OPS = (("Encaps", "Encapsulation"), ("Decaps", "Decapsulation"))
+
+with open(os.path.abspath(__file__), "rb") as _f:
+    _CODE_HASH = hashlib.sha256(_f.read()).hexdigest()
+
+
+# -------------------------------
+# Load everything once: the latest run of every (profile, family) result
+# set, and the raw samples of all those runs in a single query
+# Returns the measured medians and the extrapolation points, one frame each.
+# -------------------------------
+def load_all(profiles, families):
+    runs = []
+    for profile in profiles:
+        for family in families:
+            result_set = os.path.splitext(FAMILIES[family])[0]
+            run_id = latest_run_id(result_set, profile)
+            if run_id is None:
+                print(f"[WARN] No {result_set} results for {profile} in the store, skipping")
+                continue
+            runs.append((profile, family, run_id, load_results(result_set, profile, run_id)))
+    if not runs:
+        return None, None
+
+    samples = load_run_samples({run_id for _, _, run_id, _ in runs})
+    measured, series = [], []
+    for profile, family, run_id, results in runs:
+        measured.append(results.assign(Profile=profile, Family=family).reindex(
+            columns=["Profile", "Family", "Algorithm", "PublicKeyBytes", "Encaps_ms", "Decaps_ms"]))
+        points = series_from_results(results, profile, samples[samples["run_id"] == run_id])
+        if points is not None:
+            series.append(points.assign(Family=family))
+    measured = pd.concat(measured, ignore_index=True).sort_values(
+        ["Family", "Profile", "PublicKeyBytes"], kind="stable")
+    return measured, pd.concat(series, ignore_index=True) if series else None
+
+
+# -------------------------------
+# Fit all families, profiles and operations in one pass; predictions on
+# one grid per family (key size ranges differ by orders of magnitude)
+# -------------------------------
+def extrapolate_all(series, factor=GRID_FACTOR):
+    if series is None:
+        return None
+    fits = fit_models(series, group=["Family", "Profile", "Operation"])
+    return pd.concat([predict(fits[fits["Family"] == family],
+                              extrapolation_grid(group["x"], factor))
+                      for family, group in series.groupby("Family", sort=False)], ignore_index=True)
+
+
+# -------------------------------
+# Draw one profile's encaps / decaps of one family onto an axis
+# -------------------------------
+def _draw(ax, data, profile, colors, extrapolated, prefix=""):
+    for (op, name), color in zip(OPS, colors):
+        if extrapolated:
+            prediction = data[(data["Profile"] == profile) & (data["Operation"] == op)]
+            if len(prediction):
+                plot_prediction(ax, prediction, color,
+                                f"{prefix}{name} ({prediction['Model'].iloc[0]})",
+                                linestyle=PROFILE_LINESTYLES[profile], marker=PROFILE_MARKERS[profile])
+        else:
+            rows = data[data["Profile"] == profile]
+            if len(rows):
+                ax.plot(rows["PublicKeyBytes"], rows[f"{op}_ms"], marker=PROFILE_MARKERS[profile],
+                        linestyle="-", color=color, label=f"{prefix}{name}")
+
+
+# -------------------------------
+# Renderers (run in the worker processes)
+# -------------------------------
+def render_combined(path, data, title, colors, extrapolated):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for profile in data["Profile"].unique():
+        _draw(ax, data, profile, colors, extrapolated, f"{profile} ")
+    kind = "Extrapolated" if extrapolated else "Measured"
+    ax.set(xlabel="Public Key Size (Bytes)", ylabel="Time (ms)", title=f"{title}: All Profiles ({kind} Values)")
+    ax.grid(True)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=300)
+    plt.close(fig)
+
+
+def render_per_profile(path, data, profiles, colors, extrapolated):
+    fig, axes = plt.subplots(len(profiles), 1, figsize=(10, 6 * len(profiles)), sharex=True,
+                             sharey=True, squeeze=False)
+    kind = "Extrapolated" if extrapolated else "Measured"
+    for ax, profile in zip(axes[:, 0], profiles):
+        _draw(ax, data, profile, colors, extrapolated)
+        ax.set_title(f"{profile} ({kind} Values)")
+        ax.set_ylabel("Time (ms)")
+        ax.grid(True)
+        if ax.has_data():
+            ax.legend()
+    axes[-1, 0].set_xlabel("Public Key Size (Bytes)")
+    fig.tight_layout()
+    fig.savefig(path, dpi=300)
+    plt.close(fig)
+
+
+def render_comparison(path, data, profiles):
+    fig, axes = plt.subplots(len(profiles), 1, figsize=(12, 6 * len(profiles)), sharex=True,
+                             squeeze=False)
+    for ax, profile in zip(axes[:, 0], profiles):
+        for family, rows in data[data["Profile"] == profile].groupby("Family", sort=False):
+            style = FAMILY_STYLES[family]
+            for op in ("Encaps", "Decaps"):
+                ax.plot(rows["PublicKeyBytes"], rows[f"{op}_ms"], label=f"{family} {op}", **style)
+        ax.set_title(f"{profile} Profile: Key Size vs Encapsulation/Decapsulation Time")
+        ax.set_ylabel("Time (ms)")
+        ax.grid(True)
+        if ax.has_data():
+            ax.legend(fontsize=9)
+    axes[-1, 0].set_xlabel("Public Key Size (Bytes)")
+    fig.tight_layout()
+    fig.savefig(path, dpi=300)
+    plt.close(fig)
+
+
+RENDERERS = {"combined": render_combined, "per_profile": render_per_profile,
+             "comparison": render_comparison}
+
+
+def _render(job):
+    path, renderer, kwargs = job
+    RENDERERS[renderer](path, **kwargs)
+    return path
+
+
+# -------------------------------
+# All figures as (path, renderer, arguments) jobs
+# -------------------------------
+def figure_jobs(measured, predictions, profiles, families, figures, output_dir):
+    jobs = []
+    if "comparison" in figures:
+        jobs.append((os.path.join(output_dir, "comparison_all_profiles.png"), "comparison",
+                     {"data": measured[measured["Family"].isin(families)], "profiles": profiles}))
+    if "combined" not in figures:
+        return jobs
+    for family in families:
+        title, colors, combined, per_profile = FAMILY_PLOTS[family]
+        data = {False: measured[measured["Family"] == family]}
+        if predictions is not None:
+            data[True] = predictions[predictions["Family"] == family]
+        for extrapolated, frame in data.items():
+            if frame.empty:
+                continue
+            kind = "extrapolated" if extrapolated else "measured"
+            jobs.append((os.path.join(output_dir, f"{combined}_{kind}.png"), "combined",
+                         {"data": frame, "title": title, "colors": colors, "extrapolated": extrapolated}))
+            jobs.append((os.path.join(output_dir, f"{kind}_{per_profile}.png"), "per_profile",
+                         {"data": frame, "profiles": profiles, "colors": colors,
+                          "extrapolated": extrapolated}))
+    return jobs
+
+
+# -------------------------------
+# Hash of one figure's inputs: renderer, arguments, data and this file
+# -------------------------------
+def job_hash(job):
+    path, renderer, kwargs = job
+    digest = hashlib.sha256(f"{_CODE_HASH}|{os.path.basename(path)}|{renderer}".encode())
+    for key in sorted(kwargs):
+        value = kwargs[key]
+        digest.update(key.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(",".join(value.columns).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+# -------------------------------
+# Render the changed figures, in parallel worker processes
+# Returns (rendered paths, skipped paths).
+# -------------------------------
+def render_all(jobs, output_dir, jobs_n=JOBS, force=False):
+    cache_path = os.path.join(output_dir, CACHE_NAME)
+    cache = {}
+    if os.path.exists(cache_path) and not force:
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    hashes = {job[0]: job_hash(job) for job in jobs}
+    todo = [job for job in jobs if force or cache.get(job[0]) != hashes[job[0]]
+            or not os.path.exists(job[0])]
+    todo_paths = {job[0] for job in todo}
+    skipped = [job[0] for job in jobs if job[0] not in todo_paths]
+
+    workers = min(jobs_n, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(_render, todo))
+    else:
+        rendered = [_render(job) for job in todo]
+
+    cache.update({path: hashes[path] for path in rendered})
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    return rendered, skipped
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render the cross-profile KEM plots from the results store")
+    parser.add_argument("--profile", action="append",
+                        help="profile (repeatable, default: Mobile, Laptop, Server)")
+    parser.add_argument("--family", action="append", choices=REPORT_FAMILIES,
+                        help="KEM family (repeatable, default: all)")
+    parser.add_argument("--figure", action="append", choices=FIGURES,
+                        help="figure group (repeatable, default: all)")
+    parser.add_argument("--output-dir", default=".", help="output directory (default: .)")
+    parser.add_argument("--jobs", type=int, default=JOBS,
+                        help="render processes (default: $BENCH_REPORT_JOBS or one per CPU)")
+    parser.add_argument("--force", action="store_true", help="render unchanged figures too")
+    args = parser.parse_args(argv)
+    profiles = args.profile or PROFILES
+    families = args.family or list(REPORT_FAMILIES)
+    figures = args.figure or FIGURES
+
+    t0 = time.perf_counter()
+    measured, series = load_all(profiles, families)
+    if measured is None:
+        parser.exit(1, "No results in the store for these profiles\n")
+    predictions = extrapolate_all(series) if "combined" in figures else None
+    t_load = time.perf_counter() - t0
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = figure_jobs(measured, predictions, profiles, families, figures, args.output_dir)
+    rendered, skipped = render_all(jobs, args.output_dir, args.jobs, args.force)
+    for path in rendered:
+        print(f"Plot saved: {path}")
+    for path in skipped:
+        print(f"Plot unchanged: {path}")
+    print(f"{len(rendered)} rendered, {len(skipped)} unchanged "
+          f"(load + fit {t_load:.2f} s, total {time.perf_counter() - t0:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
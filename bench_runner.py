@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+
+from bench_cgroup import THROTTLE_POLICY, drop_throttled, throttle_columns
+from bench_measure import DEFAULT_OPS, OPS, add_selection_args, parse_selection
+from bench_registry import BACKENDS, FAMILIES, select
+from bench_stats import summary_columns
+from bench_store import save_results, stage_samples
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------
+# Read a bench_measure.py / bench_sigmeasure.py JSON-lines file
+# Returns the run record and {name: (backend record, {op: samples or batch
+# record})} in measurement order; a truncated file (killed run) keeps its
+# complete lines.
+# -------------------------------
+def read_samples(path):
+    run_record, backends = None, {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record["type"] == "run":
+                run_record = record
+            elif record["type"] == "backend":
+                backends[record["name"]] = (record, {})
+            elif record["type"] in ("samples", "batch"):
+                backends[record["name"]][1][record["operation"]] = record
+    return run_record, backends
+
+
+# -------------------------------
+# Summary row of one backend: sizes plus median/mean/stddev/p95/p99/CI,
+# CPU time and cgroup throttling per operation, and the cost of the
+# measurement process (startup, harness import, backend import, RSS)
+# -------------------------------
+def summary_row(run_record, backend, samples):
+    row = {"Algorithm": backend["name"], "Level": backend["level"], **backend["sizes"]}
+    if backend["mode"] is not None:
+        row["Mode"] = backend["mode"]
+    for op, record in samples.items():
+        wall, cpu, throttled = record["wall_ms"], record["cpu_ms"], record["throttled"]
+        stage_samples(backend["name"], op, wall, cpu, throttled)
+        if THROTTLE_POLICY == "reject":
+            wall, cpu = drop_throttled(wall, cpu, throttled)
+        row.update(summary_columns(op, wall, cpu, run_record["floor_ms"]))
+        row.update(throttle_columns(op, throttled, record["cgroup"]))
+    startup = run_record["startup"]
+    row.update({"Startup_ms": startup["Startup_ms"], "HarnessImport_ms": startup["HarnessImport_ms"],
+                "BackendImport_ms": backend["import_ms"], "HarnessRSS_MB": startup["HarnessRSS_MB"]})
+    return row
+
+
+# -------------------------------
+# Aggregate one JSON-lines file into one DataFrame per family
+# Returns (run record, {family: DataFrame}).
+# -------------------------------
+def aggregate(path):
+    run_record, backends = read_samples(path)
+    if run_record is None:
+        raise ValueError(f"{path}: no run record")
+    rows = {}
+    for backend, samples in backends.values():
+        rows.setdefault(backend["family"], []).append(summary_row(run_record, backend, samples))
+    results = {}
+    for family, family_rows in rows.items():
+        results[family] = pd.DataFrame(family_rows)
+        # Metadata of the measuring process, not of this one (write_results)
+        results[family].attrs["metadata"] = run_record["environment"]
+    return run_record, results
+
+
+# -------------------------------
+# One line on how lean the measurement process was
+# -------------------------------
+def startup_summary(run_record):
+    startup = run_record["startup"]
+    heavy = ", ".join(startup["HeavyModules"]) or "none"
+    started = f"{startup['Startup_ms']:.0f} ms" if startup["Startup_ms"] is not None else "n/a"
+    rss = f"{startup['HarnessRSS_MB']:.1f} MB" if startup["HarnessRSS_MB"] is not None else "n/a"
+    return (f"Measurement process: startup {started}, harness import "
+            f"{startup['HarnessImport_ms']:.0f} ms, RSS {rss}, heavy modules: {heavy}")
+
+
+# -------------------------------
+# Pass on how a measurement process ended: killed by a signal, this
+# process is killed by the same one (a segfault in a C binding stays a
+# SIGSEGV for bench_sweep.py), a nonzero exit code becomes ours, instead
+# of a CalledProcessError traceback and exit 1. Called once the scratch
+# directory is gone.
+# -------------------------------
+def exit_like(returncode):
+    if returncode < 0:
+        sys.stdout.flush()
+        signal.signal(-returncode, signal.SIG_DFL)
+        os.kill(os.getpid(), -returncode)
+    if returncode:
+        sys.exit(returncode)
+
+
+# -------------------------------
+# Benchmark a list of backends, one DataFrame per family
+# The timing runs in a separate bench_measure.py process that never
+# imports pandas / numpy / matplotlib; this process only aggregates its
+# samples. Pinning / priority from BENCH_CPUS / BENCH_NICE apply there.
+# -------------------------------
+def run(backends, ops=DEFAULT_OPS):
+    inverse_ops = {column: name for name, column in OPS.items()}
+    with tempfile.TemporaryDirectory(prefix="pqc-measure-") as scratch:
+        output = os.path.join(scratch, "samples.jsonl")
+        cmd = [sys.executable, os.path.join(_HERE, "bench_measure.py"), "--output", output]
+        if any(backend not in BACKENDS for backend in backends):
+            # Discovery imports every unregistered parameter set; only
+            # when the selection needs it
+            cmd.append("--all-params")
+        for backend in backends:
+            cmd += ["--algo", backend["name"]]
+        for op in ops:
+            cmd += ["--op", inverse_ops[op]]
+        returncode = subprocess.run(cmd).returncode
+        if not returncode:
+            run_record, results = aggregate(output)
+    exit_like(returncode)
+    print(startup_summary(run_record))
+    return results
+
+
+# -------------------------------
+# Benchmark every backend of one family (used by the benchmark_*.py scripts)
+# -------------------------------
+def benchmark_family(family, ops=DEFAULT_OPS):
+    return run(select(families=[family]), ops)[family]
+
+
+# -------------------------------
+# Save one family's results to <profile>/<family csv>
+# plus the environment snapshot next to it (<family>.meta.json), and
+# append them with their raw samples to the results store
+# -------------------------------
+def write_results(df, profile, family):
+    os.makedirs(profile, exist_ok=True)
+    csv_path = os.path.join(profile, FAMILIES[family])
+    save_results(df, csv_path, df.attrs.get("metadata"))
+    return csv_path
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run KEM / ECDH benchmarks from the backend registry")
+    add_selection_args(parser)
+    parser.add_argument("--list", action="store_true", help="list registered backends and exit")
+    parser.add_argument("--aggregate", metavar="JSONL",
+                        help="only aggregate the samples of an earlier bench_measure.py run")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for backend in select(discovered=args.all_params):
+            print(f"{backend['name']:<18} {backend['family']:<9} level {backend['level']}  "
+                  f"pk={backend['public_key']} ct={backend['ciphertext']}  ({backend['module']})")
+        return
+
+    if args.aggregate:
+        run_record, results = aggregate(args.aggregate)
+        print(startup_summary(run_record))
+    else:
+        backends, ops = parse_selection(parser, args)
+        results = run(backends, ops)
+    for family, df in results.items():
+        csv_path = write_results(df, args.profile, family)
+        print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
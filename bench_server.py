@@ -0,0 +1,327 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import struct
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from bench_engine import kem_calls, sample
+from bench_env import allotted_cpus, isolate_process, parse_cpu_list
+from bench_keypool import pool_keypairs, poolable
+from bench_registry import load, select
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+# -------------------------------
+# Load configuration
+# BENCH_SERVER_LOADS: offered rates as fractions of the estimated capacity
+# (executor workers / decaps time), swept from low to overload.
+# -------------------------------
+LOADS = tuple(float(x) for x in os.environ.get("BENCH_SERVER_LOADS",
+                                               "0.25,0.5,0.7,0.8,0.9,1.0,1.2").split(","))
+DURATION_S = float(os.environ.get("BENCH_SERVER_S", "3.0"))
+
+# Distinct ciphertexts the clients cycle through
+_CIPHERTEXTS = 64
+
+# Wire format (little endian)
+#   request: ciphertext length, request id, ciphertext
+#   reply:   request id, queueing delay ns, decaps time ns, key length, shared key
+_REQUEST = struct.Struct("<IQ")
+_REPLY = struct.Struct("<QQQH")
+
+_loaded = {}
+
+
+# -------------------------------
+# Decaps as run by the executor, with its start / end timestamps
+# perf_counter_ns is CLOCK_MONOTONIC on Linux, so timestamps from
+# executor processes are comparable with the event loop's.
+# -------------------------------
+def _timed_decaps(backend, secret_key, ciphertext):
+    if backend["name"] not in _loaded:
+        _loaded[backend["name"]] = load(backend)[2]
+    started = time.perf_counter_ns()
+    shared_key = _loaded[backend["name"]](secret_key, ciphertext)
+    return started, time.perf_counter_ns(), shared_key
+
+
+# -------------------------------
+# Server: one task per request, decaps in the executor
+# Requests on a connection are handled concurrently (multiplexed by id),
+# so a slow decaps does not block the next request on that connection.
+# When the client stops sending, the replies still in flight are sent
+# before the connection is closed.
+# -------------------------------
+async def _handle(reader, writer, backend, secret_key, executor):
+    loop = asyncio.get_running_loop()
+    tasks = set()
+
+    async def respond(request_id, ciphertext, received):
+        started, done, shared_key = await loop.run_in_executor(
+            executor, _timed_decaps, backend, secret_key, ciphertext)
+        writer.write(_REPLY.pack(request_id, started - received, done - started, len(shared_key))
+                     + shared_key)
+
+    try:
+        while True:
+            length, request_id = _REQUEST.unpack(await reader.readexactly(_REQUEST.size))
+            ciphertext = await reader.readexactly(length)
+            task = loop.create_task(respond(request_id, ciphertext, time.perf_counter_ns()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def _serve_async(backend, secret_key, transport, address, workers, executor_kind, conn):
+    if executor_kind == "process":
+        executor = ProcessPoolExecutor(workers)
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    def handler(reader, writer):
+        return _handle(reader, writer, backend, secret_key, executor)
+
+    if transport == "unix":
+        server = await asyncio.start_unix_server(handler, path=address)
+    else:
+        server = await asyncio.start_server(handler, "127.0.0.1", 0)
+        address = server.sockets[0].getsockname()[:2]
+    conn.send(address)
+
+    # SIGTERM from the load generator: stop serving, shut the executor down
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    async with server:
+        await stop.wait()
+    executor.shutdown(cancel_futures=True)
+
+
+# -------------------------------
+# Server process entry: static keypair (pooled if BENCH_KEYPOOL has one),
+# public key goes back to the load generator before the address
+# -------------------------------
+def _serve(backend, transport, address, workers, executor_kind, cpus, conn):
+    if cpus:
+        os.sched_setaffinity(0, parse_cpu_list(cpus))
+    gen = load(backend)[0]
+    keypairs = pool_keypairs(backend)
+    public_key, secret_key = next(keypairs) if keypairs else gen()
+    conn.send(public_key)
+    asyncio.run(_serve_async(backend, secret_key, transport, address, workers, executor_kind, conn))
+
+
+def start_server(backend, transport, workers, executor_kind, cpus=None):
+    address = os.path.join(tempfile.mkdtemp(), "kem.sock") if transport == "unix" else None
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_serve, args=(backend, transport, address, workers, executor_kind, cpus, sender))
+    process.start()
+    public_key = receiver.recv()
+    address = receiver.recv()
+    return process, public_key, address
+
+
+# -------------------------------
+# Load generator: open loop, Poisson arrivals at `rate` per second
+# Latency is measured from the *scheduled* send time, so a load generator
+# that falls behind does not hide queueing (no coordinated omission).
+# Requests are spread round-robin over `connections` persistent
+# connections. Returns per-request (latency, queueing, decaps, completion
+# time since the first send) in ns and the number of requests still
+# unanswered after the drain timeout.
+# -------------------------------
+async def _generate_load(transport, address, ciphertexts, rate, duration, connections, seed):
+    if transport == "unix":
+        streams = [await asyncio.open_unix_connection(address) for _ in range(connections)]
+    else:
+        streams = [await asyncio.open_connection(*address) for _ in range(connections)]
+
+    pending = {}
+    results = []
+    mismatches = 0
+    drained = asyncio.Event()
+    sending = True
+
+    async def read_replies(reader):
+        nonlocal mismatches
+        while True:
+            request_id, queue_ns, service_ns, length = _REPLY.unpack(
+                await reader.readexactly(_REPLY.size))
+            shared_key = await reader.readexactly(length)
+            now = time.perf_counter_ns()
+            scheduled, expected = pending.pop(request_id)
+            mismatches += shared_key != expected
+            results.append((now - scheduled, queue_ns, service_ns, now - start))
+            if not sending and not pending:
+                drained.set()
+
+    readers = [asyncio.create_task(read_replies(reader)) for reader, _ in streams]
+
+    rng = random.Random(seed)
+    start = time.perf_counter_ns()
+    end = start + int(duration * 1e9)
+    scheduled = start
+    request_id = 0
+    while True:
+        scheduled += int(rng.expovariate(rate) * 1e9)
+        if scheduled >= end:
+            break
+        await asyncio.sleep(max(0.0, (scheduled - time.perf_counter_ns()) / 1e9))
+        ciphertext, expected = ciphertexts[request_id % len(ciphertexts)]
+        pending[request_id] = (scheduled, expected)
+        streams[request_id % connections][1].write(
+            _REQUEST.pack(len(ciphertext), request_id) + ciphertext)
+        request_id += 1
+    sending = False
+
+    if pending:
+        try:
+            await asyncio.wait_for(drained.wait(), timeout=max(10.0, duration))
+        except asyncio.TimeoutError:
+            pass
+    for task in readers:
+        task.cancel()
+    for _, writer in streams:
+        writer.close()
+
+    if mismatches:
+        raise RuntimeError(f"{mismatches} shared keys did not match")
+    return results, len(pending)
+
+
+# -------------------------------
+# Latency / queueing percentiles of one rate step
+# Achieved_rps counts only replies completed inside the send window:
+# replies that drain after sending stopped would otherwise let an
+# overloaded server "achieve" its offered rate. Without any reply the
+# percentiles are NaN.
+# -------------------------------
+def rate_row(backend, rate, load_factor, duration, results, unfinished):
+    columns = np.array(results, dtype=float).reshape(-1, 4).T
+    latency, queueing, service = columns[:3] / 1e6
+    in_window = int(np.count_nonzero(columns[3] <= duration * 1e9))
+    if len(results):
+        p50, p99, p999 = np.percentile(latency, [50, 99, 99.9])
+        latency_max = latency.max()
+        queue_p50, queue_p99 = np.percentile(queueing, [50, 99])
+        decaps_p50 = float(np.median(service))
+    else:
+        p50 = p99 = p999 = latency_max = queue_p50 = queue_p99 = decaps_p50 = float("nan")
+    return {
+        "Algorithm": backend["name"],
+        "Family": backend["family"],
+        "Load": load_factor,
+        "Offered_rps": rate,
+        "Achieved_rps": in_window / duration,
+        "Completed": len(results),
+        "Completed_in_window": in_window,
+        "Unfinished": unfinished,
+        "Latency_p50_ms": p50,
+        "Latency_p99_ms": p99,
+        "Latency_p999_ms": p999,
+        "Latency_max_ms": latency_max,
+        "Queue_p50_ms": queue_p50,
+        "Queue_p99_ms": queue_p99,
+        "Decaps_p50_ms": decaps_p50,
+    }
+
+
+# -------------------------------
+# Sweep offered rates for one backend
+# Capacity estimate = executor workers (capped by the allotted CPUs) /
+# median decaps time measured here; rates are LOADS times that.
+# Saturation_rps is the highest achieved rate of the sweep (replies
+# inside the send window only, see rate_row).
+# -------------------------------
+def benchmark_server(backend, transport, workers, executor_kind, loads=LOADS,
+                     duration=DURATION_S, connections=100, server_cpus=None):
+    gen, enc_func, dec_func = load(backend)
+    calls, _ = kem_calls(gen, enc_func, dec_func)
+    wall, _, _ = sample(*calls["Decaps"], iterations=20)
+    capacity = min(workers, allotted_cpus()) / (float(np.median(wall)) / 1000)
+
+    process, public_key, address = start_server(backend, transport, workers, executor_kind,
+                                                server_cpus)
+    try:
+        ciphertexts = [enc_func(public_key) for _ in range(_CIPHERTEXTS)]
+        rows = []
+        for i, load_factor in enumerate(loads):
+            rate = capacity * load_factor
+            results, unfinished = asyncio.run(_generate_load(
+                transport, address, ciphertexts, rate, duration, connections, seed=i))
+            row = rate_row(backend, rate, load_factor, duration, results, unfinished)
+            row.update({"Transport": transport, "Executor": executor_kind, "Workers": workers,
+                        "Connections": connections, "Capacity_rps": capacity})
+            rows.append(row)
+            print(f"{backend['name']} {rate:9.1f} req/s offered: {row['Achieved_rps']:9.1f} achieved, "
+                  f"p50 {row['Latency_p50_ms']:.2f} ms, p99 {row['Latency_p99_ms']:.2f} ms, "
+                  f"p99.9 {row['Latency_p999_ms']:.2f} ms")
+    finally:
+        process.terminate()
+        process.join()
+        if transport == "unix":
+            shutil.rmtree(os.path.dirname(address), ignore_errors=True)
+
+    saturation = max(row["Achieved_rps"] for row in rows)
+    for row in rows:
+        row["Saturation_rps"] = saturation
+    return rows
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Handshake server under open-loop load")
+    add_selection_args(parser)
+    parser.add_argument("--transport", choices=["tcp", "unix"], default="tcp",
+                        help="loopback TCP or Unix socket (default: tcp)")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread",
+                        help="executor for decaps (default: thread)")
+    parser.add_argument("--workers", type=int, default=allotted_cpus(),
+                        help="executor workers (default: allotted CPUs)")
+    parser.add_argument("--connections", type=int, default=100,
+                        help="concurrent client connections (default: 100)")
+    parser.add_argument("--loads", default=",".join(map(str, LOADS)),
+                        help="offered load as fractions of the estimated capacity "
+                             "(default: $BENCH_SERVER_LOADS)")
+    parser.add_argument("--duration", type=float, default=DURATION_S,
+                        help="seconds per rate step (default: $BENCH_SERVER_S or 3)")
+    parser.add_argument("--server-cpus", help="pin the server process, e.g. 2-3")
+    args = parser.parse_args(argv)
+    backends, _ = parse_selection(parser, args)
+    if not args.algo and not args.family:
+        backends = select(families=["ML-KEM", "HQC", "McEliece"], discovered=args.all_params)
+    loads = tuple(float(x) for x in args.loads.split(","))
+    isolate_process()
+
+    rows = []
+    for backend in backends:
+        if args.executor == "process" and not poolable(backend):
+            print(f"[WARN] {backend['name']}: secret key can't be sent to executor processes, skipped")
+            continue
+        rows.extend(benchmark_server(backend, args.transport, args.workers, args.executor, loads,
+                                     args.duration, args.connections, args.server_cpus))
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "server_benchmark.csv")
+    save_results(pd.DataFrame(rows), csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import time
+
+# Harness import time is taken from here to the end of the imports
+_T_IMPORT = time.perf_counter()
+
+import argparse
+import os
+import sys
+
+from bench_engine import (BATCH_POOL, budget_for, sample, sample_batched, signature_calls,
+                          signature_input_pool)
+from bench_env import environment_snapshot, isolate_process
+from bench_measure import emit, end_record, startup_report
+from bench_registry import SIGNATURE_FAMILIES, load_signature, select_signatures
+from bench_timer import floor_ms
+
+_T_READY = time.perf_counter()
+
+# Same rules as bench_measure.py: standard library, timing harness and the
+# selected signature backends only. bench_signatures.py aggregates.
+
+# -------------------------------
+# Signature configuration
+# BENCH_SIG_SIZES: message sizes in bytes (the first one is the
+# handshake transcript size used for the per-handshake columns)
+# BENCH_SIG_BATCH: signatures verified back to back per batch-verify block
+# -------------------------------
+SIZES = tuple(int(s) for s in os.environ.get("BENCH_SIG_SIZES", "32,1024,65536,1048576").split(","))
+BATCH = int(os.environ.get("BENCH_SIG_BATCH", "64"))
+
+# Command line operation names -> CSV column prefixes
+OPS = {"keygen": "KeyGen", "sign": "Sign", "verify": "Verify"}
+DEFAULT_OPS = ("KeyGen", "Sign", "Verify")
+
+
+# -------------------------------
+# Command line options shared with bench_signatures.py
+# -------------------------------
+def add_selection_args(parser):
+    parser.add_argument("--algo", action="append",
+                        help="algorithm name, e.g. ML-DSA-65 (repeatable, default: all)")
+    parser.add_argument("--family", action="append", choices=list(SIGNATURE_FAMILIES),
+                        help="signature family (repeatable, default: all)")
+    parser.add_argument("--op", action="append", choices=list(OPS),
+                        help="operation to time (repeatable, default: keygen, sign, verify)")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="comma separated message sizes in bytes (default: $BENCH_SIG_SIZES)")
+    parser.add_argument("--batch", type=int, default=BATCH,
+                        help="signatures per batch-verify block, 0 to skip (default: $BENCH_SIG_BATCH or 64)")
+    parser.add_argument("--profile", default=os.environ.get("PROFILE", "default"),
+                        help="results directory (default: $PROFILE)")
+
+
+def parse_selection(parser, args):
+    try:
+        backends = select_signatures(args.algo, args.family)
+    except ValueError as exc:
+        parser.error(str(exc))
+    ops = tuple(OPS[op] for op in args.op) if args.op else DEFAULT_OPS
+    sizes = tuple(int(s) for s in args.sizes.split(","))
+    return backends, ops, sizes
+
+
+# -------------------------------
+# Time the signature backends over all message sizes and stream the
+# samples to the sink
+# Records as in bench_measure.py. "backend" carries the key / signature
+# sizes per message size; "samples" operations are KeyGen (sampled once,
+# it does not depend on the message) and "<Op>@<size>". "batch": per-op
+# times of BatchVerify@<size>, blocks of `batch` signatures verified back
+# to back, cycling over min(batch, BENCH_BATCH_POOL) distinct keypairs
+# ("keypairs"; signing a fresh pool per message size is what bounds it,
+# SPHINCS+ signs take up to seconds). As in bench_measure.py, the backend
+# record goes out first (all message sizes are prepared up front) and
+# each samples / batch record as soon as it is done.
+# -------------------------------
+def measure_signatures(backends, ops, sizes, batch, sink):
+    startup = startup_report(_T_IMPORT, _T_READY)
+    isolate_process()
+    emit(sink, {"type": "run", "argv": sys.argv[1:], "ops": list(ops), "sizes": list(sizes),
+                "batch": batch, "startup": startup, "floor_ms": floor_ms(),
+                "environment": environment_snapshot()})
+
+    for backend in backends:
+        t0 = time.perf_counter()
+        gen, sign_func, verify_func = load_signature(backend)
+        import_ms = (time.perf_counter() - t0) * 1000
+
+        budget = budget_for(backend["name"])
+        message = os.urandom(max(sizes))
+        calls, key_sizes = {}, {}
+        for size in sizes:
+            calls[size], key_sizes[size] = signature_calls(gen, sign_func, verify_func, message[:size])
+        emit(sink, {"type": "backend", "name": backend["name"], "family": backend["family"],
+                    "level": backend["level"], "mode": None, "sizes": key_sizes,
+                    "import_ms": import_ms})
+
+        for size in sizes:
+            for op in ops:
+                if op == "KeyGen" and size != sizes[0]:
+                    continue
+                func, args = calls[size][op]
+                wall, cpu, info = sample(func, args, budget=budget)
+                emit(sink, {"type": "samples", "name": backend["name"],
+                            "operation": op if op == "KeyGen" else f"{op}@{size}",
+                            "wall_ms": wall, "cpu_ms": cpu, "throttled": info["throttled"],
+                            "cgroup": info["cgroup"]})
+
+            if "Verify" in ops and batch > 0:
+                pool = signature_input_pool(gen, sign_func, message[:size], min(batch, BATCH_POOL))
+                emit(sink, {"type": "batch", "name": backend["name"], "operation": f"BatchVerify@{size}",
+                            "keypairs": len(pool),
+                            "per_op_ms": sample_batched(verify_func, pool, batch, budget=budget)})
+        print(f"{backend['name']} done", flush=True)
+
+    emit(sink, end_record())
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time signature backends over message sizes and stream the raw samples as JSON lines")
+    add_selection_args(parser)
+    parser.add_argument("--output",
+                        help="JSON-lines file (default: <profile>/sigmeasure_samples.jsonl)")
+    args = parser.parse_args(argv)
+    backends, ops, sizes = parse_selection(parser, args)
+
+    output = args.output or os.path.join(args.profile, "sigmeasure_samples.jsonl")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as sink:
+        measure_signatures(backends, ops, sizes, args.batch, sink)
+    print(f"Samples saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from bench_cgroup import THROTTLE_POLICY, drop_throttled, throttle_columns
+from bench_registry import SIGNATURE_FAMILIES
+from bench_runner import exit_like, read_samples, startup_summary
+from bench_sigmeasure import DEFAULT_OPS, OPS, add_selection_args, parse_selection
+from bench_stats import summary_columns
+from bench_store import save_results, stage_samples
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------
+# Rows of one signature backend, one per message size
+# KeyGen does not depend on the message, so it is sampled once and its
+# columns repeat in every row. BatchVerify: a block of BENCH_SIG_BATCH
+# signatures verified back to back, cycling over BatchVerifyKeys distinct
+# keypairs (no scheme here has a real batch API, so this is the sustained
+# verify rate without per-call harness overhead). Operations missing from a truncated file
+# are left out.
+# -------------------------------
+def signature_rows(run_record, backend, samples):
+    startup = run_record["startup"]
+    rows = []
+    keygen_columns = {}
+    for size in run_record["sizes"]:
+        row = {"Algorithm": backend["name"], "Family": backend["family"], "Level": backend["level"],
+               "MessageBytes": size, **backend["sizes"][str(size)]}
+
+        for op in run_record["ops"]:
+            if op == "KeyGen" and keygen_columns:
+                row.update(keygen_columns)
+                continue
+            name = op if op == "KeyGen" else f"{op}@{size}"
+            if name not in samples:
+                continue
+            record = samples[name]
+            wall, cpu, throttled = record["wall_ms"], record["cpu_ms"], record["throttled"]
+            stage_samples(backend["name"], name, wall, cpu, throttled)
+            if THROTTLE_POLICY == "reject":
+                wall, cpu = drop_throttled(wall, cpu, throttled)
+            columns = {**summary_columns(op, wall, cpu, run_record["floor_ms"]),
+                       **throttle_columns(op, throttled, record["cgroup"])}
+            if op == "KeyGen":
+                keygen_columns = columns
+            row.update(columns)
+
+        if f"BatchVerify@{size}" in samples:
+            batch = samples[f"BatchVerify@{size}"]
+            row["BatchVerify_ms"] = statistics.median(batch["per_op_ms"])
+            row["BatchVerify_per_s"] = 1000 / row["BatchVerify_ms"]
+            row["BatchVerifyKeys"] = batch["keypairs"]
+        if "Sign_ms" in row and "Verify_ms" in row:
+            # CPU cost of authenticating one handshake: sign on one side,
+            # verify on the other
+            row["Auth_ms"] = row["Sign_ms"] + row["Verify_ms"]
+        row.update({"Startup_ms": startup["Startup_ms"], "HarnessImport_ms": startup["HarnessImport_ms"],
+                    "BackendImport_ms": backend["import_ms"], "HarnessRSS_MB": startup["HarnessRSS_MB"]})
+        rows.append(row)
+    return rows
+
+
+# -------------------------------
+# Aggregate one bench_sigmeasure.py JSON-lines file, one DataFrame per family
+# Returns (run record, {family: DataFrame}).
+# -------------------------------
+def aggregate(path):
+    run_record, backends = read_samples(path)
+    if run_record is None:
+        raise ValueError(f"{path}: no run record")
+    rows = {}
+    for backend, samples in backends.values():
+        rows.setdefault(backend["family"], []).extend(signature_rows(run_record, backend, samples))
+    results = {}
+    for family, family_rows in rows.items():
+        results[family] = pd.DataFrame(family_rows)
+        results[family].attrs["metadata"] = run_record["environment"]
+    return run_record, results
+
+
+# -------------------------------
+# Benchmark a list of signature backends, one DataFrame per family
+# The timing runs in a separate bench_sigmeasure.py process (no pandas /
+# numpy / matplotlib), as for the KEMs in bench_runner.py.
+# -------------------------------
+def run(backends, ops=DEFAULT_OPS, sizes=None, batch=None):
+    inverse_ops = {column: name for name, column in OPS.items()}
+    with tempfile.TemporaryDirectory(prefix="pqc-sigmeasure-") as scratch:
+        output = os.path.join(scratch, "samples.jsonl")
+        cmd = [sys.executable, os.path.join(_HERE, "bench_sigmeasure.py"), "--output", output]
+        if sizes is not None:
+            cmd += ["--sizes", ",".join(map(str, sizes))]
+        if batch is not None:
+            cmd += ["--batch", str(batch)]
+        for backend in backends:
+            cmd += ["--algo", backend["name"]]
+        for op in ops:
+            cmd += ["--op", inverse_ops[op]]
+        returncode = subprocess.run(cmd).returncode
+        if not returncode:
+            run_record, results = aggregate(output)
+    exit_like(returncode)
+    print(startup_summary(run_record))
+    return run_record, results
+
+
+# -------------------------------
+# Save one family's results to <profile>/<family csv> plus metadata,
+# and to the results store
+# -------------------------------
+def write_results(df, profile, family):
+    os.makedirs(profile, exist_ok=True)
+    csv_path = os.path.join(profile, SIGNATURE_FAMILIES[family])
+    save_results(df, csv_path, df.attrs.get("metadata"))
+    return csv_path
+
+
+# -------------------------------
+# Plot: keygen / sign / verify per algorithm at the handshake message size
+# -------------------------------
+def plot_operations(df, plot_path, ops):
+    first = df[df["MessageBytes"] == df["MessageBytes"].min()].reset_index(drop=True)
+    x = np.arange(len(first))
+    width = 0.8 / len(ops)
+
+    plt.figure(figsize=(14, 6))
+    for i, op in enumerate(ops):
+        plt.bar(x + (i - (len(ops) - 1) / 2) * width, first[f"{op}_ms"], width, label=op)
+    plt.xticks(x, first["Algorithm"], rotation=60, ha="right", fontsize=8)
+    plt.yscale("log")
+    plt.ylabel("Time (ms)")
+    plt.title(f"Signatures: KeyGen / Sign / Verify ({first['MessageBytes'].iloc[0]} byte message)")
+    plt.grid(True, axis="y")
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(plot_path, dpi=300)
+    plt.close()
+    print(f"Plot saved: {plot_path}")
+
+
+# -------------------------------
+# Plot: sign and verify time over message size, per algorithm
+# -------------------------------
+def plot_message_sizes(df, plot_path, op):
+    plt.figure(figsize=(10, 6))
+    for name, group in df.groupby("Algorithm", sort=False):
+        plt.plot(group["MessageBytes"], group[f"{op}_ms"], "o-", label=name)
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Message Size (Bytes)")
+    plt.ylabel(f"{op} Time (ms)")
+    plt.title(f"Signatures: Message Size vs {op} Time")
+    plt.grid(True)
+    plt.legend(fontsize=7, ncol=2)
+    plt.tight_layout()
+    plt.savefig(plot_path, dpi=300)
+    plt.close()
+    print(f"Plot saved: {plot_path}")
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Signature keygen / sign / verify over message sizes")
+    add_selection_args(parser)
+    parser.add_argument("--list", action="store_true", help="list registered signature backends and exit")
+    parser.add_argument("--aggregate", metavar="JSONL",
+                        help="only aggregate the samples of an earlier bench_sigmeasure.py run")
+    args = parser.parse_args(argv)
+
+    backends, ops, sizes = parse_selection(parser, args)
+    if args.list:
+        for backend in backends:
+            print(f"{backend['name']:<20} {backend['family']:<8} level {backend['level']}  "
+                  f"pk={backend['public_key']} sig={backend['signature']}  ({backend['module']})")
+        return
+
+    if args.aggregate:
+        run_record, results = aggregate(args.aggregate)
+        print(startup_summary(run_record))
+    else:
+        run_record, results = run(backends, ops, sizes, args.batch)
+    for family, df in results.items():
+        csv_path = write_results(df, args.profile, family)
+        print(f"CSV saved: {csv_path}")
+    if not results:
+        return
+
+    ops, sizes = tuple(run_record["ops"]), run_record["sizes"]
+    df = pd.concat(results.values(), ignore_index=True)
+    plot_operations(df, os.path.join(args.profile, "signature_operations.png"), ops)
+    for op in ("Sign", "Verify"):
+        if op in ops and len(sizes) > 1:
+            plot_message_sizes(df, os.path.join(args.profile, f"signature_{op.lower()}_msgsize.png"), op)
+
+
+if __name__ == "__main__":
+    main()
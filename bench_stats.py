@@ -0,0 +1,187 @@
+import math
+import os
+from statistics import NormalDist
+import numpy as np
+
+# -------------------------------
+# Bootstrap configuration
+# -------------------------------
+CONFIDENCE = float(os.environ.get("BENCH_CONFIDENCE", "0.95"))
+BOOTSTRAP_RESAMPLES = int(os.environ.get("BENCH_BOOTSTRAP", "2000"))
+
+# Upper bound for one resampling matrix (rows * samples), keeps memory flat
+# inside the 500 MB Mobile container even for long sample series
+_BOOTSTRAP_CHUNK_ELEMENTS = 1_000_000
+
+
+# -------------------------------
+# Percentile bootstrap confidence interval for the median
+# -------------------------------
+def bootstrap_ci(samples, confidence=None, resamples=None, seed=0):
+    confidence = CONFIDENCE if confidence is None else confidence
+    resamples = BOOTSTRAP_RESAMPLES if resamples is None else resamples
+
+    data = np.asarray(samples, dtype=float)
+    if data.size < 2:
+        value = float(data[0]) if data.size else float("nan")
+        return value, value
+
+    rng = np.random.default_rng(seed)
+    rows_per_chunk = max(1, _BOOTSTRAP_CHUNK_ELEMENTS // data.size)
+    medians = np.empty(resamples)
+    for start in range(0, resamples, rows_per_chunk):
+        rows = min(rows_per_chunk, resamples - start)
+        idx = rng.integers(0, data.size, size=(rows, data.size))
+        medians[start:start + rows] = np.median(data[idx], axis=1)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(medians, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+# -------------------------------
+# Percentile bootstrap CI for the ratio of medians candidate / baseline
+# Both series are resampled independently (same chunking as above).
+# Returns (ratio, ci_low, ci_high); ratio > 1 means the candidate is slower.
+# -------------------------------
+def bootstrap_ratio_ci(baseline, candidate, confidence=None, resamples=None, seed=0):
+    confidence = CONFIDENCE if confidence is None else confidence
+    resamples = BOOTSTRAP_RESAMPLES if resamples is None else resamples
+
+    base = np.asarray(baseline, dtype=float)
+    cand = np.asarray(candidate, dtype=float)
+    ratio = float(np.median(cand) / np.median(base))
+    if base.size < 2 or cand.size < 2:
+        return ratio, ratio, ratio
+
+    rng = np.random.default_rng(seed)
+    rows_per_chunk = max(1, _BOOTSTRAP_CHUNK_ELEMENTS // max(base.size, cand.size))
+    ratios = np.empty(resamples)
+    for start in range(0, resamples, rows_per_chunk):
+        rows = min(rows_per_chunk, resamples - start)
+        base_medians = np.median(base[rng.integers(0, base.size, size=(rows, base.size))], axis=1)
+        cand_medians = np.median(cand[rng.integers(0, cand.size, size=(rows, cand.size))], axis=1)
+        ratios[start:start + rows] = cand_medians / base_medians
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(ratios, [alpha, 1 - alpha])
+    return ratio, float(low), float(high)
+
+
+# -------------------------------
+# One-sided Mann-Whitney U test: is the candidate stochastically larger
+# (slower) than the baseline? Normal approximation with tie correction
+# and continuity correction, fine from ~10 samples per side.
+# Returns (U of the candidate, p-value).
+# -------------------------------
+def mann_whitney_greater(baseline, candidate):
+    base = np.asarray(baseline, dtype=float)
+    cand = np.asarray(candidate, dtype=float)
+    n1, n2 = cand.size, base.size
+    if n1 == 0 or n2 == 0:
+        return float("nan"), float("nan")
+
+    # Average ranks (ties share the mean of their rank positions)
+    data = np.concatenate([cand, base])
+    values, inverse, counts = np.unique(data, return_inverse=True, return_counts=True)
+    upper = np.cumsum(counts)
+    ranks = (upper - (counts - 1) / 2)[inverse]
+
+    u = float(ranks[:n1].sum() - n1 * (n1 + 1) / 2)
+    n = n1 + n2
+    tie_term = float((counts ** 3 - counts).sum()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 1 - NormalDist().cdf(z)
+
+
+# -------------------------------
+# Quantile of Student's t distribution (vectorized over dof)
+# Exact for 1 to 4 degrees of freedom: closed forms for 1, 2 and 4, Newton
+# iteration on the closed-form CDF for 3. From 5 on, a Cornish-Fisher
+# expansion around the normal quantile (relative error < 0.1 % for
+# 0.005 <= p <= 0.995, about 0.5 % at p = 0.9995 and dof 5). Normal for
+# dof > 1e6.
+# -------------------------------
+def t_quantile(p, dof):
+    dof = np.asarray(dof, dtype=float)
+    z = NormalDist().inv_cdf(p)
+
+    def cornish_fisher(v):
+        return (z + (z ** 3 + z) / (4 * v)
+                + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * v ** 2)
+                + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * v ** 3)
+                + (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / (92160 * v ** 4))
+
+    q = cornish_fisher(np.maximum(dof, 1.0))
+
+    # dof 3: F(t) = 1/2 + (atan(u) + u / (1 + u^2)) / pi with u = t / sqrt(3),
+    # dF/du = 2 / (pi (1 + u^2)^2); the expansion is a close starting point
+    u = cornish_fisher(3.0) / math.sqrt(3)
+    for _ in range(50):
+        step = ((math.atan(u) + u / (1 + u * u)) / math.pi + 0.5 - p) * math.pi * (1 + u * u) ** 2 / 2
+        u -= step
+        if abs(step) < 1e-13 * max(1.0, abs(u)):
+            break
+    t3 = u * math.sqrt(3)
+
+    # dof 4: closed form (Shaw 2006)
+    alpha = 4 * p * (1 - p)
+    t4 = math.copysign(2 * math.sqrt(math.cos(math.acos(math.sqrt(alpha)) / 3) / math.sqrt(alpha) - 1),
+                       p - 0.5)
+
+    q = np.where(dof == 1, math.tan(math.pi * (p - 0.5)), q)
+    q = np.where(dof == 2, (2 * p - 1) / math.sqrt(2 * p * (1 - p)), q)
+    q = np.where(dof == 3, t3, q)
+    q = np.where(dof == 4, t4, q)
+    q = np.where(dof > 1e6, z, q)
+    return np.where(dof >= 1, q, np.nan)
+
+
+# -------------------------------
+# Distribution summary of one sample series (all values in ms)
+# -------------------------------
+def summarize(samples, confidence=None, resamples=None):
+    data = np.asarray(samples, dtype=float)
+    ci_low, ci_high = bootstrap_ci(data, confidence, resamples)
+    p95, p99 = np.percentile(data, [95, 99])
+    return {
+        "n": int(data.size),
+        "median": float(np.median(data)),
+        "mean": float(np.mean(data)),
+        "std": float(np.std(data, ddof=1)) if data.size > 1 else 0.0,
+        "p95": float(p95),
+        "p99": float(p99),
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+    }
+
+
+# -------------------------------
+# Flatten a summary into CSV columns
+# "<Op>_ms" stays the headline number (now the median), so existing
+# plots that read KeyGen_ms / Encaps_ms / Decaps_ms keep working.
+# With CPU samples, "<Op>_cpu_ms" (median CPU time) sits next to it.
+# With a timer floor, "<Op>_near_floor" flags medians the timer can't
+# resolve reliably (see bench_timer.py).
+# -------------------------------
+def summary_columns(op, samples, cpu_samples=None, floor_ms=None):
+    s = summarize(samples)
+    columns = {
+        f"{op}_ms": s["median"],
+        f"{op}_mean_ms": s["mean"],
+        f"{op}_std_ms": s["std"],
+        f"{op}_p95_ms": s["p95"],
+        f"{op}_p99_ms": s["p99"],
+        f"{op}_ci_low_ms": s["ci_low"],
+        f"{op}_ci_high_ms": s["ci_high"],
+        f"{op}_n": s["n"],
+    }
+    if cpu_samples is not None:
+        columns[f"{op}_cpu_ms"] = float(np.median(cpu_samples))
+        columns[f"{op}_cpu_mean_ms"] = float(np.mean(cpu_samples))
+    if floor_ms is not None:
+        columns[f"{op}_near_floor"] = s["median"] < floor_ms
+    return columns
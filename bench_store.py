@@ -0,0 +1,309 @@
+import argparse
+import json
+import math
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+import pandas as pd
+
+from bench_env import environment_snapshot, write_metadata
+
+# -------------------------------
+# Append-only results store (SQLite, one file for all profiles)
+# BENCH_STORE: database path, empty to disable (default: results.sqlite)
+# runs:      one row per benchmark process and profile (metadata, git rev)
+# results:   every summary row ever written, per result set (= CSV name)
+# samples:   every raw timing sample behind those rows
+# baselines: pinned reference runs for bench_regress.py
+# The CSVs stay as a snapshot of the latest run.
+# -------------------------------
+STORE_PATH = os.environ.get("BENCH_STORE", "results.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY, started TEXT, profile TEXT, script TEXT, argv TEXT,
+    git_rev TEXT, host TEXT, metadata TEXT);
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT, profile TEXT, result_set TEXT, algorithm TEXT, row TEXT);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id TEXT, profile TEXT, result_set TEXT, algorithm TEXT, operation TEXT,
+    seq INTEGER, wall_ms REAL, cpu_ms REAL, throttled INTEGER);
+CREATE TABLE IF NOT EXISTS baselines (
+    name TEXT, profile TEXT, result_set TEXT, run_id TEXT,
+    PRIMARY KEY (name, profile, result_set));
+CREATE INDEX IF NOT EXISTS results_key ON results (result_set, profile, run_id);
+CREATE INDEX IF NOT EXISTS samples_key ON samples (algorithm, operation, profile, run_id);
+"""
+
+# CSV names of older runs -> current result set
+LEGACY_RESULT_SETS = {"mlkem_benchmark": "pqc_mlkem_benchmark"}
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_run_ids = {}
+_staged = []
+
+
+# -------------------------------
+# Open the store (created on first use)
+# WAL + busy timeout: run_profiles.py writes from several jobs at once.
+# -------------------------------
+@contextmanager
+def connect(path=None):
+    conn = sqlite3.connect(path or STORE_PATH, timeout=60)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _git_rev():
+    try:
+        rev = subprocess.run(["git", "-C", _HERE, "rev-parse", "HEAD"], capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", _HERE, "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return rev + ("-dirty" if dirty else "")
+
+
+# -------------------------------
+# Run id of this process for one profile, registered on first use
+# -------------------------------
+def run_id_for(conn, profile, script=None, metadata=None):
+    if profile in _run_ids:
+        return _run_ids[profile]
+    run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    metadata = environment_snapshot() if metadata is None else metadata
+    conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+        run_id, metadata.get("timestamp"), profile, script or os.path.basename(sys.argv[0]),
+        json.dumps(sys.argv[1:]), _git_rev(), metadata.get("hostname"),
+        json.dumps(metadata, default=str)))
+    _run_ids[profile] = run_id
+    return run_id
+
+
+# -------------------------------
+# Keep the raw samples of one operation until its results are saved
+# -------------------------------
+def stage_samples(algorithm, operation, wall, cpu, throttled):
+    _staged.append((algorithm, operation, wall, cpu, throttled))
+
+
+def _json_row(row):
+    return json.dumps({k: (None if isinstance(v, float) and math.isnan(v) else v)
+                       for k, v in row.items()}, default=str)
+
+
+# -------------------------------
+# Append summary rows (and the staged samples of their algorithms)
+# Profile = directory of the CSV, result set = CSV name without ".csv".
+# Returns the run id, or None with the store disabled.
+# -------------------------------
+def record(df, csv_path, path=None, metadata=None):
+    global _staged
+    if not (path or STORE_PATH):
+        return None
+    profile = os.path.basename(os.path.dirname(os.path.abspath(csv_path)))
+    result_set = os.path.splitext(os.path.basename(csv_path))[0]
+    algorithms = set(df["Algorithm"]) if "Algorithm" in df else set()
+
+    with connect(path) as conn:
+        run_id = run_id_for(conn, profile, metadata=metadata)
+        conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?)", [
+            (run_id, profile, result_set, row.get("Algorithm"), _json_row(row))
+            for row in df.to_dict("records")])
+        for algorithm, operation, wall, cpu, throttled in _staged:
+            if algorithm not in algorithms:
+                continue
+            conn.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                (run_id, profile, result_set, algorithm, operation, i, w, c, int(t))
+                for i, (w, c, t) in enumerate(zip(wall, cpu, throttled))])
+        _staged = [s for s in _staged if s[0] not in algorithms]
+    return run_id
+
+
+# -------------------------------
+# Save a result table: CSV snapshot + metadata next to it + store
+# metadata: environment snapshot of the measuring process, if that was
+# not this one (default: snapshot of this process)
+# -------------------------------
+def save_results(df, csv_path, metadata=None):
+    df.to_csv(csv_path, index=False)
+    write_metadata(csv_path, metadata)
+    record(df, csv_path, metadata=metadata)
+    return csv_path
+
+
+# -------------------------------
+# Latest run that wrote this result set for a profile, None if none did
+# -------------------------------
+def latest_run_id(result_set, profile, path=None):
+    with connect(path) as conn:
+        latest = conn.execute(
+            "SELECT results.run_id FROM results JOIN runs USING (run_id) "
+            "WHERE result_set = ? AND results.profile = ? ORDER BY runs.rowid DESC LIMIT 1",
+            (result_set, profile)).fetchone()
+    return latest[0] if latest else None
+
+
+# -------------------------------
+# Summary rows of one result set and profile as a DataFrame
+# Default: the latest run that wrote this result set; None if there is
+# none. Column order follows the first row.
+# -------------------------------
+def load_results(result_set, profile, run_id=None, path=None):
+    run_id = latest_run_id(result_set, profile, path) if run_id is None else run_id
+    if run_id is None:
+        return None
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT row FROM results WHERE result_set = ? AND profile = ? AND run_id = ? "
+            "ORDER BY rowid", (result_set, profile, run_id)).fetchall()
+    if not rows:
+        return None
+    return pd.DataFrame([json.loads(row) for (row,) in rows])
+
+
+# -------------------------------
+# Raw samples of one algorithm and operation (all runs unless given)
+# -------------------------------
+def load_samples(algorithm, operation, profile=None, run_id=None, path=None):
+    query = "SELECT * FROM samples WHERE algorithm = ? AND operation = ?"
+    params = [algorithm, operation]
+    if profile is not None:
+        query += " AND profile = ?"
+        params.append(profile)
+    if run_id is not None:
+        query += " AND run_id = ?"
+        params.append(run_id)
+    with connect(path) as conn:
+        return pd.read_sql_query(query + " ORDER BY run_id, seq", conn, params=params)
+
+
+# -------------------------------
+# Latest run with raw samples per result set of one profile
+# Returns {result_set: run_id}; runs in `exclude` are skipped, with
+# `include` only those runs are considered.
+# -------------------------------
+def latest_sample_runs(profile, exclude=(), include=None, path=None):
+    with connect(path) as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT samples.result_set, samples.run_id, runs.rowid FROM samples "
+            "JOIN runs USING (run_id) WHERE samples.profile = ? ORDER BY runs.rowid",
+            (profile,)).fetchall()
+    latest = {}
+    for result_set, run_id, _ in rows:
+        if run_id not in exclude and (include is None or run_id in include):
+            latest[result_set] = run_id
+    return latest
+
+
+# -------------------------------
+# Raw samples of a set of runs
+# -------------------------------
+def load_run_samples(run_ids, path=None):
+    run_ids = list(run_ids)
+    placeholders = ", ".join("?" * len(run_ids))
+    with connect(path) as conn:
+        return pd.read_sql_query(
+            f"SELECT * FROM samples WHERE run_id IN ({placeholders}) ORDER BY run_id, seq",
+            conn, params=run_ids)
+
+
+# -------------------------------
+# Pinned baselines: {result_set: run_id} per name and profile
+# pin_baseline() pins the given runs, or the latest run with samples of
+# every result set; earlier pins of the same result sets are replaced.
+# -------------------------------
+def pin_baseline(profile, name="default", runs=None, path=None):
+    runs = latest_sample_runs(profile, path=path) if runs is None else runs
+    with connect(path) as conn:
+        conn.executemany("INSERT OR REPLACE INTO baselines VALUES (?, ?, ?, ?)",
+                         [(name, profile, result_set, run_id) for result_set, run_id in runs.items()])
+    return runs
+
+
+def baseline_runs(profile, name="default", path=None):
+    with connect(path) as conn:
+        return dict(conn.execute(
+            "SELECT result_set, run_id FROM baselines WHERE name = ? AND profile = ?",
+            (name, profile)).fetchall())
+
+
+def baseline_profiles(name="default", path=None):
+    with connect(path) as conn:
+        return [profile for (profile,) in conn.execute(
+            "SELECT DISTINCT profile FROM baselines WHERE name = ? ORDER BY profile", (name,))]
+
+
+# -------------------------------
+# All runs, oldest first
+# -------------------------------
+def list_runs(profile=None, path=None):
+    query = "SELECT run_id, started, profile, script, argv, git_rev, host FROM runs"
+    params = []
+    if profile is not None:
+        query += " WHERE profile = ?"
+        params.append(profile)
+    with connect(path) as conn:
+        return pd.read_sql_query(query + " ORDER BY rowid", conn, params=params)
+
+
+# -------------------------------
+# Import existing CSVs of profile directories, one run per CSV
+# Legacy names are imported first, so the current file wins as "latest".
+# The *.meta.json snapshot is used as run metadata where it exists.
+# -------------------------------
+def import_csvs(profiles, path=None):
+    imported = 0
+    for profile_dir in profiles:
+        profile = os.path.basename(os.path.abspath(profile_dir))
+        names = sorted((f for f in os.listdir(profile_dir) if f.endswith(".csv")),
+                       key=lambda f: (os.path.splitext(f)[0] not in LEGACY_RESULT_SETS, f))
+        for name in names:
+            csv_path = os.path.join(profile_dir, name)
+            meta_path = os.path.splitext(csv_path)[0] + ".meta.json"
+            metadata = {}
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    metadata = json.load(f)
+            stem = os.path.splitext(name)[0]
+            result_set = LEGACY_RESULT_SETS.get(stem, stem)
+            _run_ids.pop(profile, None)
+            with connect(path) as conn:
+                run_id_for(conn, profile, f"import:{name}", metadata)
+            record(pd.read_csv(csv_path), os.path.join(profile_dir, result_set + ".csv"), path)
+            print(f"Imported {csv_path} as {result_set}")
+            imported += 1
+    return imported
+
+
+# -------------------------------
+# Main execution: import CSVs, list runs
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append-only benchmark results store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import the CSVs of profile directories")
+    imp.add_argument("profiles", nargs="+")
+    runs = sub.add_parser("runs", help="list stored runs")
+    runs.add_argument("--profile")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        print(f"{import_csvs(args.profiles)} CSV(s) imported into {STORE_PATH}")
+    else:
+        print(list_runs(args.profile).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+from bench_registry import FAMILIES, select
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+# Wall-clock limit per parameter set (keygen of the big McEliece sets
+# takes seconds per call on slow profiles)
+TIMEOUT_S = float(os.environ.get("BENCH_SWEEP_TIMEOUT", "1800"))
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------
+# Benchmark one parameter set in its own bench_runner.py process
+# The child writes into a scratch profile directory; a crash (e.g. a
+# segfault in the C binding) or a timeout only loses this one row. On
+# timeout the child's whole process group is killed.
+# Returns the result row (or None) and a status string.
+# -------------------------------
+def run_isolated(backend, ops, log_path, timeout=TIMEOUT_S):
+    with tempfile.TemporaryDirectory(prefix="pqc-sweep-") as scratch, open(log_path, "w") as log:
+        cmd = [sys.executable, os.path.join(_HERE, "bench_runner.py"), "--all-params",
+               "--algo", backend["name"], "--profile", scratch]
+        for op in ops:
+            cmd += ["--op", op.lower()]
+        # The scratch results are not stored; the sweep stores its own table
+        env = dict(os.environ, BENCH_STORE="")
+        process = subprocess.Popen(cmd, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                   start_new_session=True)
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+            return None, "timeout"
+
+        if returncode < 0:
+            return None, f"signal {signal.Signals(-returncode).name}"
+        if returncode:
+            return None, f"exit {returncode}"
+        df = pd.read_csv(os.path.join(scratch, FAMILIES[backend["family"]]))
+        return df.iloc[0].to_dict(), "ok"
+
+
+# -------------------------------
+# Sweep all selected parameter sets one after the other (never in
+# parallel, so they don't compete for cores), saving the CSV after every
+# parameter set so an interrupted sweep keeps what it has
+# -------------------------------
+def sweep(backends, ops, profile, timeout=TIMEOUT_S):
+    log_dir = os.path.join(profile, "sweep_logs")
+    os.makedirs(log_dir, exist_ok=True)
+    csv_path = os.path.join(profile, "sweep_benchmark.csv")
+
+    rows = []
+    for backend in backends:
+        log_path = os.path.join(log_dir, f"{backend['name']}.log")
+        t0 = time.perf_counter()
+        row, status = run_isolated(backend, ops, log_path, timeout)
+        elapsed = time.perf_counter() - t0
+        if row is None:
+            row = {"Algorithm": backend["name"], "Level": backend["level"]}
+        rows.append({**row, "Family": backend["family"], "Status": status, "Elapsed_s": elapsed})
+        print(f"{backend['name']:<18} {elapsed:8.1f} s  {status}  (log: {log_path})")
+
+        pd.DataFrame(rows).to_csv(csv_path, index=False)
+    save_results(pd.DataFrame(rows), csv_path)
+    return csv_path, rows
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark every pqcrypto KEM parameter set, each in an isolated process")
+    add_selection_args(parser)
+    parser.add_argument("--timeout", type=float, default=TIMEOUT_S,
+                        help="seconds per parameter set (default: $BENCH_SWEEP_TIMEOUT or 1800)")
+    args = parser.parse_args(argv)
+    args.all_params = True
+    backends, ops = parse_selection(parser, args)
+    if not args.algo and not args.family:
+        backends = select(families=["ML-KEM", "HQC", "McEliece"], discovered=True)
+
+    csv_path, rows = sweep(backends, ops, args.profile, args.timeout)
+    failed = [row["Algorithm"] for row in rows if row["Status"] != "ok"]
+    print(f"CSV saved: {csv_path}")
+    print(f"{len(rows) - len(failed)} of {len(rows)} parameter sets ok"
+          + (f", failed: {', '.join(failed)}" if failed else ""))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import contextlib
+import multiprocessing
+import os
+import sys
+import sysconfig
+import threading
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_cgroup import delta as cgroup_delta
+from bench_cgroup import snapshot as cgroup_snapshot
+from bench_engine import kem_calls
+from bench_env import allotted_cpus, isolate_process, timed_region
+from bench_keypool import pool_keypairs
+from bench_registry import load
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+# Seconds each worker keeps running one operation
+DURATION_S = float(os.environ.get("BENCH_THROUGHPUT_S", "2.0"))
+
+# Seconds to wait for all workers to finish their setup (McEliece keygen
+# on the Mobile profile takes ~2 s per worker)
+_SETUP_TIMEOUT_S = 300
+
+
+# -------------------------------
+# GIL status of this interpreter
+# A free-threaded build (python3.13t+) can still re-enable the GIL at
+# runtime, e.g. for extensions that are not marked thread-safe.
+# -------------------------------
+def free_threaded_build():
+    return bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+
+
+def gil_enabled():
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+# -------------------------------
+# One worker: prepare inputs, wait for all workers, run `op` for `duration`
+# Returns (completed operations, elapsed seconds). With BENCH_KEYPOOL the
+# keypair comes from the memory-mapped pool (page cache shared by all
+# workers) instead of a keygen per worker. Process workers switch GC off
+# around their own loop; the GC switch is process-global, so thread
+# workers (own_region=False) run inside the one region of run_threads().
+# -------------------------------
+def _worker(backend, op, duration, barrier, own_region=True):
+    func, args = kem_calls(*load(backend), keypairs=pool_keypairs(backend))[0][op]
+    func(*args)  # warmup
+
+    barrier.wait(_SETUP_TIMEOUT_S)
+    count = 0
+    with timed_region() if own_region else contextlib.nullcontext():
+        t0 = time.perf_counter()
+        deadline = t0 + duration
+        while True:
+            func(*args)
+            count += 1
+            t1 = time.perf_counter()
+            if t1 >= deadline:
+                break
+    return count, t1 - t0
+
+
+# -------------------------------
+# Run `workers` processes in parallel, all starting at the same barrier
+# -------------------------------
+def run_processes(backend, op, workers, duration):
+    with multiprocessing.Manager() as manager:
+        barrier = manager.Barrier(workers)
+        with multiprocessing.Pool(workers) as pool:
+            return pool.starmap(_worker, [(backend, op, duration, barrier)] * workers)
+
+
+# -------------------------------
+# Run `workers` threads of this process in parallel
+# Threads only scale if the C binding releases the GIL during the call
+# (or the interpreter is free-threaded). GC is off for the whole pool:
+# per-thread regions would let the first thread to finish re-enable it
+# while the others are still timing, and each thread's gc.collect()
+# would stall the others.
+# -------------------------------
+def run_threads(backend, op, workers, duration):
+    barrier = threading.Barrier(workers)
+    with timed_region(), ThreadPoolExecutor(workers) as pool:
+        futures = [pool.submit(_worker, backend, op, duration, barrier, False) for _ in range(workers)]
+        return [future.result() for future in futures]
+
+
+EXECUTORS = {"process": run_processes, "thread": run_threads}
+
+
+# -------------------------------
+# Aggregate per-worker results into one row
+# ops/sec sums the per-worker rates; efficiency compares against
+# `workers` times the single-worker rate (1.0 = perfect scaling).
+# -------------------------------
+def throughput_row(backend, op, workers, executor, results, base_rate=None):
+    rates = [count / elapsed for count, elapsed in results]
+    latencies = sorted(elapsed / count * 1000 for count, elapsed in results)
+    ops_per_sec = sum(rates)
+    base_rate = ops_per_sec if base_rate is None else base_rate
+    return {
+        "Algorithm": backend["name"],
+        "Family": backend["family"],
+        "Operation": op,
+        "Executor": executor,
+        "Workers": workers,
+        "Ops": sum(count for count, _ in results),
+        "OpsPerSec": ops_per_sec,
+        "Efficiency": ops_per_sec / (workers * base_rate),
+        "WorkerLatency_ms": latencies[len(latencies) // 2],
+        "WorkerLatencyMax_ms": latencies[-1],
+        "GIL": "enabled" if gil_enabled() else "disabled",
+    }
+
+
+# -------------------------------
+# Sweep worker counts for one backend / operation
+# Throttling counters are read around each step (whole cgroup, all workers).
+# -------------------------------
+def sweep(backend, op, worker_counts, duration=DURATION_S, executor="process"):
+    rows = []
+    base_rate = None
+    for workers in worker_counts:
+        before = cgroup_snapshot()
+        results = EXECUTORS[executor](backend, op, workers, duration)
+        row = throughput_row(backend, op, workers, executor, results, base_rate)
+        throttling = cgroup_delta(before, cgroup_snapshot())
+        if throttling is not None:
+            row["NrThrottled"] = throttling["nr_throttled"]
+            row["Throttled_ms"] = throttling["throttled_usec"] / 1000
+        if base_rate is None and workers == 1:
+            base_rate = row["OpsPerSec"]
+        rows.append(row)
+        print(f"{backend['name']} {op} {executor} x{workers}: {row['OpsPerSec']:.1f} ops/s "
+              f"(efficiency {row['Efficiency']:.2f})")
+    return rows
+
+
+# -------------------------------
+# Thread throughput relative to process throughput at the same worker count
+# ~1.0 means the binding releases the GIL (threads scale like processes),
+# ~1/workers means calls are serialized on the GIL.
+# -------------------------------
+def add_thread_vs_process(df):
+    keys = ["Algorithm", "Operation", "Workers"]
+    process = df[df["Executor"] == "process"].set_index(keys)["OpsPerSec"]
+    ratio = df.apply(
+        lambda row: row["OpsPerSec"] / process.get(tuple(row[keys]), float("nan"))
+        if row["Executor"] == "thread" else float("nan"),
+        axis=1,
+    )
+    return df.assign(ThreadVsProcess=ratio)
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate throughput at 1..N parallel workers")
+    add_selection_args(parser)
+    parser.add_argument("--workers", type=int, default=allotted_cpus(),
+                        help="maximum worker count (default: allotted CPUs)")
+    parser.add_argument("--duration", type=float, default=DURATION_S,
+                        help="seconds per worker and step (default: $BENCH_THROUGHPUT_S or 2)")
+    parser.add_argument("--executor", choices=["process", "thread", "both"], default="process",
+                        help="worker type (default: process)")
+    args = parser.parse_args(argv)
+    backends, ops = parse_selection(parser, args)
+    executors = ["process", "thread"] if args.executor == "both" else [args.executor]
+    isolate_process()
+
+    if "thread" in executors:
+        build = "free-threaded" if free_threaded_build() else "standard (GIL)"
+        print(f"Python {sys.version.split()[0]}, {build} build, "
+              f"GIL {'enabled' if gil_enabled() else 'disabled'} at runtime")
+
+    # Always start at 1 worker so efficiency has its baseline
+    worker_counts = range(1, args.workers + 1)
+    rows = []
+    for backend in backends:
+        for op in ops:
+            for executor in executors:
+                rows.extend(sweep(backend, op, worker_counts, args.duration, executor))
+
+    df = pd.DataFrame(rows)
+    if len(executors) > 1:
+        df = add_thread_vs_process(df)
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "throughput_benchmark.csv")
+    save_results(df, csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import os
+import statistics
+import time
+
+# -------------------------------
+# Clocks used by the benchmarks (name -> (time.get_clock_info name, reader))
+# -------------------------------
+CLOCKS = {
+    "perf_counter_ns": ("perf_counter", time.perf_counter_ns),
+    "thread_time_ns": ("thread_time", time.thread_time_ns),
+    "process_time_ns": ("process_time", time.process_time_ns),
+}
+
+# Results below FLOOR_FACTOR x (timer resolution / overhead) are flagged
+FLOOR_FACTOR = float(os.environ.get("BENCH_FLOOR_FACTOR", "100"))
+CALIBRATION_ROUNDS = int(os.environ.get("BENCH_CALIBRATION_ROUNDS", "20000"))
+
+_calibration = None
+
+
+# -------------------------------
+# Smallest observable step of a clock
+# Spins until the value changes and keeps the smallest positive delta.
+# -------------------------------
+def clock_resolution_ns(clock, rounds=CALIBRATION_ROUNDS):
+    best = None
+    for _ in range(max(1, rounds // 100)):
+        t0 = clock()
+        t1 = clock()
+        while t1 == t0:
+            t1 = clock()
+        if best is None or t1 - t0 < best:
+            best = t1 - t0
+    return best
+
+
+# -------------------------------
+# Cost of one clock read (median of back-to-back reads)
+# -------------------------------
+def clock_overhead_ns(clock, rounds=CALIBRATION_ROUNDS):
+    deltas = [0] * rounds
+    for i in range(rounds):
+        t0 = clock()
+        t1 = clock()
+        deltas[i] = t1 - t0
+    return statistics.median(deltas)
+
+
+# -------------------------------
+# Overhead of the sampling frame used by bench_engine.sample()
+#   c0 = thread_time_ns(); t0 = perf_counter_ns(); <op>; t1 = ...; c1 = ...
+# measured with an empty <op>. Returns (wall_ns, cpu_ns) to subtract.
+# -------------------------------
+def sample_frame_overhead_ns(rounds=CALIBRATION_ROUNDS):
+    perf_counter_ns = time.perf_counter_ns
+    thread_time_ns = time.thread_time_ns
+    wall = [0] * rounds
+    cpu = [0] * rounds
+    for i in range(rounds):
+        c0 = thread_time_ns()
+        t0 = perf_counter_ns()
+        t1 = perf_counter_ns()
+        c1 = thread_time_ns()
+        wall[i] = t1 - t0
+        cpu[i] = c1 - c0
+    return statistics.median(wall), statistics.median(cpu)
+
+
+# -------------------------------
+# Calibrate all clocks on this host
+# -------------------------------
+def calibrate(rounds=CALIBRATION_ROUNDS):
+    result = {}
+    for name, (info_name, clock) in CLOCKS.items():
+        result[name] = {
+            "reported_resolution_ns": time.get_clock_info(info_name).resolution * 1e9,
+            "resolution_ns": clock_resolution_ns(clock, rounds),
+            "overhead_ns": clock_overhead_ns(clock, rounds),
+        }
+    wall, cpu = sample_frame_overhead_ns(rounds)
+    result["sample_wall_overhead_ns"] = wall
+    result["sample_cpu_overhead_ns"] = cpu
+    return result
+
+
+# -------------------------------
+# Calibration of this process (computed once, on first use)
+# -------------------------------
+def calibration():
+    global _calibration
+    if _calibration is None:
+        _calibration = calibrate()
+    return _calibration
+
+
+# -------------------------------
+# Timer floor in ms: results below this are dominated by the timer itself
+# -------------------------------
+def floor_ms(clock="perf_counter_ns"):
+    cal = calibration()[clock]
+    return FLOOR_FACTOR * max(cal["resolution_ns"], cal["overhead_ns"]) / 1e6
+
+
+# -------------------------------
+# Main execution: print the calibration of this host
+# -------------------------------
+if __name__ == "__main__":
+    cal = calibration()
+    for name in CLOCKS:
+        c = cal[name]
+        print(f"{name:<16} resolution {c['resolution_ns']:>8} ns "
+              f"(reported {c['reported_resolution_ns']:g} ns), overhead {c['overhead_ns']:>6} ns, "
+              f"floor {floor_ms(name):.4f} ms")
+    print(f"sample frame overhead: wall {cal['sample_wall_overhead_ns']} ns, "
+          f"cpu {cal['sample_cpu_overhead_ns']} ns")
@@ -0,0 +1,230 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import struct
+import time
+import numpy as np
+import pandas as pd
+
+from bench_engine import kem_calls
+from bench_env import isolate_process, timed_region
+from bench_keypool import pool_keypairs
+from bench_registry import load, select
+from bench_runner import add_selection_args, parse_selection
+from bench_store import save_results
+
+# Timed handshakes (public key there, ciphertext back) per strategy
+ROUNDS = int(os.environ.get("BENCH_TRANSPORT_ROUNDS", "200"))
+_WARMUP_ROUNDS = 5
+
+# Frame: 4 byte length prefix + payload
+_HEADER = struct.Struct("<I")
+
+# recv() size of the naive receiver
+_RECV_CHUNK = 65536
+
+
+# -------------------------------
+# Naive framing: concatenate header and payload into a new bytes object,
+# receive by appending chunks to a bytes object
+# -------------------------------
+def send_concat(sock, payload):
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact_concat(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(min(_RECV_CHUNK, size - len(data)))
+        if not chunk:
+            raise ConnectionError("peer closed the connection")
+        data += chunk
+    return data
+
+
+def recv_concat(sock, buffer):
+    (length,) = _HEADER.unpack(_recv_exact_concat(sock, _HEADER.size))
+    return _recv_exact_concat(sock, length)
+
+
+# -------------------------------
+# No copies: header and payload as separate writes of memoryviews, or as
+# one sendmsg() scatter-gather call; receive with recv_into() straight
+# into a preallocated buffer. The result is a view into that buffer, only
+# valid until the next receive (pqcrypto needs bytes(view) for decaps).
+# -------------------------------
+def send_views(sock, payload):
+    sock.sendall(_HEADER.pack(len(payload)))
+    sock.sendall(memoryview(payload))
+
+
+def send_sendmsg(sock, payload):
+    buffers = [memoryview(_HEADER.pack(len(payload))), memoryview(payload)]
+    while buffers:
+        sent = sock.sendmsg(buffers)
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if buffers and sent:
+            buffers[0] = buffers[0][sent:]
+
+
+def _recv_exact_into(sock, view):
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("peer closed the connection")
+        received += count
+
+
+def recv_into(sock, buffer):
+    view = memoryview(buffer)
+    _recv_exact_into(sock, view[:_HEADER.size])
+    (length,) = _HEADER.unpack(view[:_HEADER.size])
+    _recv_exact_into(sock, view[:length])
+    return view[:length]
+
+
+STRATEGIES = {
+    "concat": (send_concat, recv_concat),
+    "views": (send_views, recv_into),
+    "sendmsg": (send_sendmsg, recv_into),
+}
+
+
+# -------------------------------
+# Connected socket pair: AF_UNIX socketpair or TCP over loopback
+# -------------------------------
+def connect_pair(transport, nodelay=False):
+    if transport == "socketpair":
+        return socket.socketpair()
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        client = socket.create_connection(listener.getsockname())
+        server, _ = listener.accept()
+    if nodelay:
+        for sock in (client, server):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return client, server
+
+
+# -------------------------------
+# Server side (own process): receive the public key, answer with the
+# ciphertext; checks the first public key it receives
+# -------------------------------
+def _serve(sock, strategy, public_key, ciphertext, rounds):
+    send, recv = STRATEGIES[strategy]
+    buffer = bytearray(len(public_key) + _HEADER.size)
+    for i in range(rounds):
+        received = recv(sock, buffer)
+        if i == 0 and bytes(received) != public_key:
+            raise SystemExit("public key corrupted in transit")
+        send(sock, ciphertext)
+    sock.close()
+
+
+# -------------------------------
+# Time `rounds` handshake transfers with one framing strategy
+# Returns per-handshake wall times in ms (after warmup rounds).
+# -------------------------------
+def time_transfers(transport, strategy, public_key, ciphertext, rounds=ROUNDS, nodelay=False):
+    send, recv = STRATEGIES[strategy]
+    client, server = connect_pair(transport, nodelay)
+    total = rounds + _WARMUP_ROUNDS
+    process = multiprocessing.get_context("fork").Process(
+        target=_serve, args=(server, strategy, public_key, ciphertext, total))
+    process.start()
+    server.close()
+
+    buffer = bytearray(len(ciphertext) + _HEADER.size)
+    samples = []
+    with timed_region():
+        for i in range(total):
+            t0 = time.perf_counter_ns()
+            send(client, public_key)
+            received = recv(client, buffer)
+            t1 = time.perf_counter_ns()
+            if i >= _WARMUP_ROUNDS:
+                samples.append((t1 - t0) / 1e6)
+    if bytes(received) != ciphertext:
+        raise RuntimeError("ciphertext corrupted in transit")
+    client.close()
+    process.join()
+    if process.exitcode:
+        raise RuntimeError(f"{strategy} server failed (exit {process.exitcode})")
+    return samples
+
+
+# -------------------------------
+# All strategies for one backend with its real public key and ciphertext
+# MBps counts payload bytes in both directions per handshake; Speedup is
+# relative to the naive concat strategy on the same transport.
+# -------------------------------
+def benchmark_transport(backend, transports, strategies=tuple(STRATEGIES), rounds=ROUNDS,
+                        nodelay=False):
+    gen, enc_func, dec_func = load(backend)
+    calls, _ = kem_calls(gen, enc_func, dec_func, pool_keypairs(backend))
+    (public_key,) = calls["Encaps"][1]
+    ciphertext = calls["Decaps"][1][1]
+    payload_mb = (len(public_key) + len(ciphertext)) / 1e6
+
+    rows = []
+    for transport in transports:
+        baseline = None
+        for strategy in strategies:
+            samples = np.array(time_transfers(transport, strategy, public_key, ciphertext,
+                                              rounds, nodelay))
+            median = float(np.median(samples))
+            baseline = median if strategy == "concat" else baseline
+            rows.append({
+                "Algorithm": backend["name"],
+                "Family": backend["family"],
+                "Transport": transport,
+                "Strategy": strategy,
+                "NoDelay": nodelay if transport == "tcp" else None,
+                "PublicKeyBytes": len(public_key),
+                "CiphertextBytes": len(ciphertext),
+                "Rounds": len(samples),
+                "Transfer_ms": median,
+                "Transfer_p99_ms": float(np.percentile(samples, 99)),
+                "Transfer_min_ms": float(samples.min()),
+                "MBps": payload_mb / (median / 1000),
+                "Speedup": baseline / median if baseline else None,
+            })
+            print(f"{backend['name']} {transport} {strategy}: {median:.3f} ms per handshake, "
+                  f"{rows[-1]['MBps']:.0f} MB/s")
+    return rows
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Key / ciphertext transfer cost per framing strategy")
+    add_selection_args(parser)
+    parser.add_argument("--transport", choices=["socketpair", "tcp", "both"], default="both",
+                        help="local socketpair (AF_UNIX) or TCP loopback (default: both)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS,
+                        help="timed handshakes per strategy (default: $BENCH_TRANSPORT_ROUNDS or 200)")
+    parser.add_argument("--nodelay", action="store_true", help="set TCP_NODELAY (disable Nagle)")
+    args = parser.parse_args(argv)
+    backends, _ = parse_selection(parser, args)
+    if not args.algo and not args.family:
+        backends = select(families=["McEliece"], discovered=args.all_params)
+    transports = ["socketpair", "tcp"] if args.transport == "both" else [args.transport]
+    isolate_process()
+
+    rows = []
+    for backend in backends:
+        rows.extend(benchmark_transport(backend, transports, rounds=args.rounds,
+                                        nodelay=args.nodelay))
+
+    os.makedirs(args.profile, exist_ok=True)
+    csv_path = os.path.join(args.profile, "transport_benchmark.csv")
+    save_results(pd.DataFrame(rows), csv_path)
+    print(f"CSV saved: {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
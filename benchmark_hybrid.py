@@ -0,0 +1,66 @@
+import numpy as np
+import matplotlib.pyplot as plt
+import os
+
+from bench_registry import HYBRIDS, select
+from bench_runner import run, write_results
+
+# Get profile from environment variable
+profile = os.environ.get("PROFILE", "default")
+
+# -------------------------------
+# Main execution
+# -------------------------------
+if __name__ == "__main__":
+    # Hybrid KEMs (sequential and concurrent halves) plus their classical
+    # (ephemeral-ephemeral, like the hybrid) and PQ halves on their own,
+    # all with a full handshake
+    ops = ("KeyGen", "Encaps", "Decaps", "Handshake")
+    parts = sorted({f"{classical}-EE" for classical, _ in HYBRIDS} | {pq for _, pq in HYBRIDS})
+    results = run(select(families=["Hybrid"]) + select(algos=parts), ops)
+    df = results["Hybrid"]
+    part_handshake = {name: ms for family, part_df in results.items() if family != "Hybrid"
+                      for name, ms in zip(part_df["Algorithm"], part_df["Handshake_ms"])}
+
+    # -------------------------------
+    # Compare against the halves
+    # CombinerOverhead_ms: hybrid - (classical + PQ), KDF and concatenation
+    # for sequential runs; negative for concurrent runs = time hidden
+    # -------------------------------
+    pairs = [name.removesuffix("-concurrent").split("+") for name in df["Algorithm"]]
+    df["ClassicalHandshake_ms"] = [part_handshake[f"{c}-EE"] for c, _ in pairs]
+    df["PQHandshake_ms"] = [part_handshake[p] for _, p in pairs]
+    df["CombinerOverhead_ms"] = df["Handshake_ms"] - df["ClassicalHandshake_ms"] - df["PQHandshake_ms"]
+    df["Concurrent"] = df["Algorithm"].str.endswith("-concurrent")
+    df["WireBytes"] = df["PublicKeyBytes"] + df["CiphertextBytes"]
+    df["HandshakesPerSec"] = 1000 / df["Handshake_ms"]
+
+    # -------------------------------
+    # Save results to CSV
+    # -------------------------------
+    csv_path = write_results(df, profile, "Hybrid")
+    print(f"CSV saved: {csv_path}")
+
+    # -------------------------------
+    # Plot handshake time: halves vs hybrid (sequential / concurrent)
+    # -------------------------------
+    sequential = df[~df["Concurrent"]].reset_index(drop=True)
+    concurrent = df[df["Concurrent"]].reset_index(drop=True)
+    x = np.arange(len(sequential))
+    width = 0.2
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(x - 1.5 * width, sequential["ClassicalHandshake_ms"], width, label='Classical only')
+    plt.bar(x - 0.5 * width, sequential["PQHandshake_ms"], width, label='PQ only')
+    plt.bar(x + 0.5 * width, sequential["Handshake_ms"], width, label='Hybrid (sequential)')
+    plt.bar(x + 1.5 * width, concurrent["Handshake_ms"], width, label='Hybrid (concurrent)')
+    plt.xticks(x, sequential["Algorithm"])
+    plt.ylabel('Handshake Time (ms)')
+    plt.title(f'Hybrid KEM: Handshake Time vs Classical / PQ Halves ({profile})')
+    plt.grid(True, axis='y')
+    plt.legend()
+    plt.tight_layout()
+    plot_path = os.path.join(profile, "hybrid_handshake.png")
+    plt.savefig(plot_path, dpi=300)
+    plt.close()
+    print(f"Plot saved: {plot_path}")
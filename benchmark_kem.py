@@ -1,73 +1,23 @@
-import time
-import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import os
 
-# Import HQC KEMs from pqcrypto library
-from pqcrypto.kem.hqc_128 import generate_keypair as hqc128_gen, encrypt as hqc128_enc, decrypt as hqc128_dec
-from pqcrypto.kem.hqc_192 import generate_keypair as hqc192_gen, encrypt as hqc192_enc, decrypt as hqc192_dec
-from pqcrypto.kem.hqc_256 import generate_keypair as hqc256_gen, encrypt as hqc256_enc, decrypt as hqc256_dec
+from bench_extrapolate import extrapolate_results, plot_prediction
+from bench_runner import benchmark_family, write_results
 
 # Get profile from environment variable (Mobile, Laptop, Server)
 profile = os.environ.get("PROFILE", "default")
 
-# Make directory for results if it doesn't exist
-os.makedirs(profile, exist_ok=True)
-
-# List to store benchmark results
-results = []
-
-# -------------------------------
-# Benchmark function for a single KEM
-# -------------------------------
-def benchmark_kem(name, gen, enc_func, dec_func):
-    # Measure key generation
-    t0 = time.perf_counter()
-    public_key, secret_key = gen()
-    t1 = time.perf_counter()
-
-    # Measure encapsulation
-    t2 = time.perf_counter()
-    ciphertext, shared_key_enc = enc_func(public_key)
-    t3 = time.perf_counter()
-
-    # Measure decapsulation
-    t4 = time.perf_counter()
-    shared_key_dec = dec_func(secret_key, ciphertext)
-    t5 = time.perf_counter()
-
-    # Ensure shared keys match
-    assert shared_key_enc == shared_key_dec
-
-    # Save results
-    results.append({
-        "Algorithm": name,
-        "PublicKeyBytes": len(public_key),
-        "SecretKeyBytes": len(secret_key),
-        "CiphertextBytes": len(ciphertext),
-        "SharedKeyBytes": len(shared_key_enc),
-        "KeyGen_ms": (t1 - t0) * 1000,
-        "Encaps_ms": (t3 - t2) * 1000,
-        "Decaps_ms": (t5 - t4) * 1000
-    })
-    print(f"{name} KEM done")
-
 # -------------------------------
 # Main execution
 # -------------------------------
 if __name__ == "__main__":
-    # Run benchmarks for each KEM (128, 192, 256) in the current profile
-    benchmark_kem("HQC-128", hqc128_gen, hqc128_enc, hqc128_dec)
-    benchmark_kem("HQC-192", hqc192_gen, hqc192_enc, hqc192_dec)
-    benchmark_kem("HQC-256", hqc256_gen, hqc256_enc, hqc256_dec)
+    # Run benchmarks for each HQC KEM (128, 192, 256) from the backend registry
+    df = benchmark_family("HQC")
 
     # -------------------------------
     # Save results to CSV
     # -------------------------------
-    df = pd.DataFrame(results)
-    csv_path = os.path.join(profile, "pqc_hqc_benchmark.csv")
-    df.to_csv(csv_path, index=False)
+    csv_path = write_results(df, profile, "HQC")
     print(f"CSV saved: {csv_path}")
 
     # -------------------------------
@@ -84,41 +34,40 @@ if __name__ == "__main__":
     plt.tight_layout()
     measured_plot = os.path.join(profile, "hqc_keysize_vs_time_measured.png")
     plt.savefig(measured_plot, dpi=300)
-    plt.show()
+    plt.close()
     print(f"Measured plot saved: {measured_plot}")
 
     # -------------------------------
-    # Extrapolation for larger keys
+    # Extrapolation for larger keys: power / linear / n log n fitted to
+    # the raw samples, model picked by cross-validation, prediction band
     # -------------------------------
-    real_keys = np.array(df['PublicKeyBytes'])
-    enc_times = np.array(df['Encaps_ms'])
-    dec_times = np.array(df['Decaps_ms'])
-
-    # Fit power-law: t ~ key_size^b
-    a_enc, b_enc = np.polyfit(np.log(real_keys), np.log(enc_times), 1)
-    a_dec, b_dec = np.polyfit(np.log(real_keys), np.log(dec_times), 1)
-
-    # Hypothetical future keys (larger sizes)
-    keys_sim = np.array([2249, 4522, 7245, 10240, 14000])
-    enc_sim = np.exp(a_enc * np.log(keys_sim) + b_enc)
-    dec_sim = np.exp(a_dec * np.log(keys_sim) + b_dec)
-
-    # -------------------------------
-    # Plot extrapolated values (lines + markers)
-    # -------------------------------
-    plt.figure(figsize=(10, 6))
-    plt.plot(real_keys, enc_times, 'o', color='green', label='Encapsulation (measured)')
-    plt.plot(real_keys, dec_times, 's', color='red', label='Decapsulation (measured)')
-    plt.plot(keys_sim, enc_sim, '--', color='green', label='Encapsulation (extrapolated)')
-    plt.plot(keys_sim, dec_sim, '--', color='red', label='Decapsulation (extrapolated)')
-    plt.xlabel('Public Key Size (Bytes)')
-    plt.ylabel('Time (ms)')
-    plt.title('HQC KEM: Key Size vs Encapsulation/Decapsulation Time (Extrapolated)')
-    plt.grid(True)
-    plt.legend()
-    plt.tight_layout()
-    extrapolated_plot = os.path.join(profile, "hqc_keysize_vs_time_extrapolated.png")
-    plt.savefig(extrapolated_plot, dpi=300)
-    plt.show()
-    print(f"Extrapolated plot saved: {extrapolated_plot}")
-
+    extrapolation = extrapolate_results(df, csv_path)
+    if extrapolation is None:
+        print('[WARN] No encaps / decaps times to extrapolate, skipping the extrapolated plot')
+    else:
+        series, fits, predictions = extrapolation
+        print(fits[fits['Selected']][['Operation', 'Model', 'CV_rmse']].to_string(index=False))
+
+        # -------------------------------
+        # Plot extrapolated values (measured medians + fitted line and band)
+        # -------------------------------
+        plt.figure(figsize=(10, 6))
+        plt.plot(df['PublicKeyBytes'], df['Encaps_ms'], 'o', color='green', label='Encapsulation (measured)')
+        plt.plot(df['PublicKeyBytes'], df['Decaps_ms'], 's', color='red', label='Decapsulation (measured)')
+        for op, color in (('Encaps', 'green'), ('Decaps', 'red')):
+            prediction = predictions[predictions['Operation'] == op]
+            if prediction.empty:
+                continue
+            name = 'Encapsulation' if op == 'Encaps' else 'Decapsulation'
+            plot_prediction(plt.gca(), prediction, color,
+                            f"{name} (extrapolated, {prediction['Model'].iloc[0]})")
+        plt.xlabel('Public Key Size (Bytes)')
+        plt.ylabel('Time (ms)')
+        plt.title('HQC KEM: Key Size vs Encapsulation/Decapsulation Time (Extrapolated)')
+        plt.grid(True)
+        plt.legend()
+        plt.tight_layout()
+        extrapolated_plot = os.path.join(profile, 'hqc_keysize_vs_time_extrapolated.png')
+        plt.savefig(extrapolated_plot, dpi=300)
+        plt.close()
+        print(f"Extrapolated plot saved: {extrapolated_plot}")
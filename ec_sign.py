@@ -0,0 +1,65 @@
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519
+
+# EdDSA: raw 32 / 57 byte public keys (RFC 8032)
+_EDWARDS = {
+    "Ed25519": (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey),
+    "Ed448": (ed448.Ed448PrivateKey, ed448.Ed448PublicKey),
+}
+
+# ECDSA hash per NIST curve (same strength as the curve)
+_ECDSA_HASHES = {"SECP256R1": hashes.SHA256, "SECP384R1": hashes.SHA384, "SECP521R1": hashes.SHA512}
+
+
+# -------------------------------
+# ECDSA / EdDSA with the same call shape as the pqcrypto signatures
+# KeyGen:  fresh keypair, public key encoded (X9.62 uncompressed / raw)
+# Sign:    signature over the message (ECDSA: DER encoded, variable size)
+# Verify:  decode the public key + verify, returns True / False
+# Like ecdh_kem.py, the secret key stays a private key object and the
+# public key is parsed on every verify, as a receiver of bytes would.
+# -------------------------------
+def ec_signature(curve_name):
+    if curve_name in _EDWARDS:
+        private_cls, public_cls = _EDWARDS[curve_name]
+
+        def generate_keypair():
+            private_key = private_cls.generate()
+            return private_key.public_key().public_bytes_raw(), private_key
+
+        def sign(secret_key, message):
+            return secret_key.sign(message)
+
+        def verify(public_key, message, signature):
+            try:
+                public_cls.from_public_bytes(public_key).verify(signature, message)
+            except InvalidSignature:
+                return False
+            return True
+
+        return generate_keypair, sign, verify
+
+    curve = getattr(ec, curve_name)()
+    algorithm = ec.ECDSA(_ECDSA_HASHES[curve_name]())
+
+    def generate_keypair():
+        private_key = ec.generate_private_key(curve)
+        public_key = private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.X962,
+            format=serialization.PublicFormat.UncompressedPoint
+        )
+        return public_key, private_key
+
+    def sign(secret_key, message):
+        return secret_key.sign(message, algorithm)
+
+    def verify(public_key, message, signature):
+        try:
+            ec.EllipticCurvePublicKey.from_encoded_point(curve, public_key).verify(
+                signature, message, algorithm)
+        except InvalidSignature:
+            return False
+        return True
+
+    return generate_keypair, sign, verify
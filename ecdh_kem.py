@@ -0,0 +1,78 @@
+from cryptography.hazmat.primitives.asymmetric import ec, x448, x25519
+from cryptography.hazmat.primitives import serialization
+
+# Montgomery curves: raw 32 / 56 byte public keys (RFC 7748)
+_MONTGOMERY = {"X25519": x25519.X25519PrivateKey, "X448": x448.X448PrivateKey}
+
+
+# -------------------------------
+# Key generation, encoding and ECDH for one curve
+# NIST curves: X9.62 uncompressed point, Montgomery curves: raw bytes.
+# Returns (generate_private_key, encode, decode, exchange).
+# -------------------------------
+def _curve_ops(curve_name):
+    if curve_name in _MONTGOMERY:
+        private_cls = _MONTGOMERY[curve_name]
+        public_cls = x25519.X25519PublicKey if curve_name == "X25519" else x448.X448PublicKey
+
+        def encode(public_key):
+            return public_key.public_bytes_raw()
+
+        def exchange(private_key, peer_key):
+            return private_key.exchange(peer_key)
+
+        return private_cls.generate, encode, public_cls.from_public_bytes, exchange
+
+    curve = getattr(ec, curve_name)()
+
+    def encode(public_key):
+        return public_key.public_bytes(
+            encoding=serialization.Encoding.X962,
+            format=serialization.PublicFormat.UncompressedPoint
+        )
+
+    def decode(data):
+        return ec.EllipticCurvePublicKey.from_encoded_point(curve, data)
+
+    def exchange(private_key, peer_key):
+        return private_key.exchange(ec.ECDH(), peer_key)
+
+    return lambda: ec.generate_private_key(curve), encode, decode, exchange
+
+
+# -------------------------------
+# ECDH with the same call shape as the pqcrypto KEMs
+# KeyGen:  fresh keypair, public key encoded
+# Encaps:  fresh ephemeral key + ECDH against the peer's public key,
+#          "ciphertext" = encoded ephemeral public key
+# Decaps:  decode ephemeral public key + ECDH with the private key
+# Every call works on fresh peer keys; whether the KeyGen key is static
+# or ephemeral is decided by the handshake (see bench_registry.py).
+# -------------------------------
+def ecdh_kem(curve_name):
+    generate, encode, decode, exchange = _curve_ops(curve_name)
+
+    def generate_keypair():
+        private_key = generate()
+        return encode(private_key.public_key()), private_key
+
+    def encrypt(public_key):
+        peer_key = decode(public_key)
+        ephemeral_key = generate()
+        shared_key = exchange(ephemeral_key, peer_key)
+        return encode(ephemeral_key.public_key()), shared_key
+
+    def decrypt(secret_key, ciphertext):
+        return exchange(secret_key, decode(ciphertext))
+
+    return generate_keypair, encrypt, decrypt
+
+
+# -------------------------------
+# Public key encode / decode on their own, as (func, args) per operation
+# (both are also part of every encaps / decaps)
+# -------------------------------
+def ecdh_codec_calls(curve_name):
+    generate, encode, decode, _ = _curve_ops(curve_name)
+    public_key = generate().public_key()
+    return {"Encode": (encode, (public_key,)), "Decode": (decode, (encode(public_key),))}
@@ -0,0 +1,216 @@
+import argparse
+import math
+import os
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from bench_registry import FAMILIES
+from bench_store import load_results
+
+# -------------------------------
+# Link profiles
+# bandwidth in Mbit/s, RTT in ms, MTU in bytes, initial congestion
+# window in segments (Linux default 10, RFC 6928)
+# -------------------------------
+LINKS = {
+    "Datacenter": {"bandwidth_mbps": 10_000, "rtt_ms": 0.5, "mtu": 1500, "initcwnd": 10},
+    "Broadband": {"bandwidth_mbps": 100, "rtt_ms": 20, "mtu": 1500, "initcwnd": 10},
+    "LTE": {"bandwidth_mbps": 20, "rtt_ms": 60, "mtu": 1500, "initcwnd": 10},
+    "Satellite": {"bandwidth_mbps": 50, "rtt_ms": 600, "mtu": 1500, "initcwnd": 10},
+}
+
+PROFILES = ["Mobile", "Laptop", "Server"]
+
+# Keygen in every handshake (ephemeral) or long-lived keys (static)
+KEY_MODES = ["ephemeral", "static"]
+
+# IPv4 + TCP header per segment (no options)
+HEADER_BYTES = 40
+
+
+# -------------------------------
+# Parse "Name:bandwidth_mbps:rtt_ms[:mtu[:initcwnd]]"
+# -------------------------------
+def parse_link(text):
+    name, *values = text.split(":")
+    if not 2 <= len(values) <= 4:
+        raise ValueError(f"link {text!r}: expected Name:bandwidth_mbps:rtt_ms[:mtu[:initcwnd]]")
+    link = {"bandwidth_mbps": float(values[0]), "rtt_ms": float(values[1]), "mtu": 1500, "initcwnd": 10}
+    if len(values) > 2:
+        link["mtu"] = int(values[2])
+    if len(values) > 3:
+        link["initcwnd"] = int(values[3])
+    return name, link
+
+
+# -------------------------------
+# Time to deliver `nbytes` over a fresh TCP connection in slow start
+# Each round sends one congestion window and waits one RTT for the ACKs
+# (or longer, if serializing the window takes longer than the RTT); the
+# window doubles per round, no loss. The last window needs its
+# serialization time plus the one-way delay.
+# Returns (ms, rounds, bytes on the wire incl. headers).
+# -------------------------------
+def transfer_time(nbytes, link):
+    mss = link["mtu"] - HEADER_BYTES
+    segments = max(1, math.ceil(nbytes / mss))
+    wire_bytes = nbytes + segments * HEADER_BYTES
+    bits_per_ms = link["bandwidth_mbps"] * 1000
+
+    elapsed, sent, cwnd, rounds = 0.0, 0, link["initcwnd"], 1
+    while segments - sent > cwnd:
+        elapsed += max(link["rtt_ms"], cwnd * link["mtu"] * 8 / bits_per_ms)
+        sent += cwnd
+        cwnd *= 2
+        rounds += 1
+    last_bytes = wire_bytes - sent * link["mtu"]
+    elapsed += last_bytes * 8 / bits_per_ms + link["rtt_ms"] / 2
+    return elapsed, rounds, wire_bytes
+
+
+# -------------------------------
+# Measured results of one profile, all families in one DataFrame
+# Older (imported) ECC results have no CiphertextBytes (the ephemeral public key is the
+# ciphertext) and use Encapsulation_ms / Decapsulation_ms.
+# -------------------------------
+def load_profile(profile):
+    frames = []
+    for family, csv_file in FAMILIES.items():
+        df = load_results(os.path.splitext(csv_file)[0], profile)
+        if df is None:
+            print(f"[WARN] no {family} results for {profile} in the store, skipping")
+            continue
+        df = df.rename(
+            columns={"Encapsulation_ms": "Encaps_ms", "Decapsulation_ms": "Decaps_ms"})
+        if "CiphertextBytes" not in df:
+            df["CiphertextBytes"] = df["PublicKeyBytes"]
+        df["Family"] = family
+        frames.append(df[["Algorithm", "Family", "PublicKeyBytes", "CiphertextBytes",
+                          "KeyGen_ms", "Encaps_ms", "Decaps_ms"]])
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+# -------------------------------
+# End-to-end cost of one KEM handshake
+# ephemeral: TCP connect (1 RTT), keygen, public key to the peer, encaps,
+#            ciphertext back, decaps
+# static:    the same with a long-lived key (keygen not on the path),
+#            the public key is still sent in every handshake
+# Both transfers start in slow start, as on a new connection.
+# -------------------------------
+def handshake_row(result, profile, link_name, link, mode="ephemeral"):
+    pk_ms, pk_rounds, pk_wire = transfer_time(result["PublicKeyBytes"], link)
+    ct_ms, ct_rounds, ct_wire = transfer_time(result["CiphertextBytes"], link)
+    compute_ms = result["Encaps_ms"] + result["Decaps_ms"]
+    if mode == "ephemeral":
+        compute_ms += result["KeyGen_ms"]
+    network_ms = link["rtt_ms"] + pk_ms + ct_ms
+    return {
+        "Profile": profile,
+        "Link": link_name,
+        "KeyMode": mode,
+        "Algorithm": result["Algorithm"],
+        "Family": result["Family"],
+        "BandwidthMbps": link["bandwidth_mbps"],
+        "RTT_ms": link["rtt_ms"],
+        "MTU": link["mtu"],
+        "InitCwnd": link["initcwnd"],
+        "PublicKeyBytes": result["PublicKeyBytes"],
+        "CiphertextBytes": result["CiphertextBytes"],
+        "WireBytes": pk_wire + ct_wire,
+        "PublicKeyRounds": pk_rounds,
+        "CiphertextRounds": ct_rounds,
+        "Compute_ms": compute_ms,
+        "Connect_ms": link["rtt_ms"],
+        "PublicKeyTransfer_ms": pk_ms,
+        "CiphertextTransfer_ms": ct_ms,
+        "Total_ms": compute_ms + network_ms,
+        "NetworkShare": network_ms / (compute_ms + network_ms),
+    }
+
+
+def build_model(profiles, links, modes=KEY_MODES):
+    rows = []
+    for profile in profiles:
+        results = load_profile(profile)
+        if results is None:
+            continue
+        for link_name, link in links.items():
+            for mode in modes:
+                rows.extend(handshake_row(result, profile, link_name, link, mode)
+                            for _, result in results.iterrows())
+    return pd.DataFrame(rows)
+
+
+# -------------------------------
+# Plot: one panel per link (rows) and profile (columns),
+# handshake time split into compute and network per algorithm
+# -------------------------------
+def plot_model(df, output_png, mode="ephemeral"):
+    df = df[df["KeyMode"] == mode]
+    profiles = list(dict.fromkeys(df["Profile"]))
+    links = list(dict.fromkeys(df["Link"]))
+    fig, axes = plt.subplots(len(links), len(profiles), squeeze=False,
+                             figsize=(6 * len(profiles), 0.35 * df["Algorithm"].nunique() * len(links) + 2))
+
+    for i, link in enumerate(links):
+        for j, profile in enumerate(profiles):
+            ax = axes[i][j]
+            part = df[(df["Link"] == link) & (df["Profile"] == profile)].sort_values("Total_ms")
+            network = part["Total_ms"] - part["Compute_ms"]
+            ax.barh(part["Algorithm"], part["Compute_ms"], color="tab:blue", label="Compute")
+            ax.barh(part["Algorithm"], network, left=part["Compute_ms"], color="tab:orange",
+                    label="Network")
+            ax.set_xscale("log")
+            ax.set_title(f"{profile} / {link} ({mode} keys)", fontsize=10)
+            ax.tick_params(axis="y", labelsize=8)
+            ax.grid(True, axis="x")
+            if i == len(links) - 1:
+                ax.set_xlabel("Handshake time (ms)")
+    axes[0][0].legend(fontsize=8)
+
+    plt.tight_layout()
+    plt.savefig(output_png, dpi=300)
+    plt.close(fig)
+    print(f"Handshake cost plot saved: {output_png}")
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate end-to-end handshake latency from "
+                                                 "measured compute times and link profiles")
+    parser.add_argument("--profile", action="append",
+                        help="results directory (repeatable, default: Mobile, Laptop, Server)")
+    parser.add_argument("--link", action="append",
+                        help="extra link Name:bandwidth_mbps:rtt_ms[:mtu[:initcwnd]] (repeatable)")
+    parser.add_argument("--only-links", action="store_true",
+                        help="use only the --link profiles, not the built-in ones")
+    parser.add_argument("--key-mode", choices=KEY_MODES + ["both"], default="both",
+                        help="keygen per handshake (ephemeral) or long-lived keys (static) "
+                             "(default: both)")
+    parser.add_argument("--output", default="handshake_cost_model",
+                        help="output name without extension (default: handshake_cost_model)")
+    args = parser.parse_args(argv)
+
+    links = {} if args.only_links else dict(LINKS)
+    try:
+        links.update(parse_link(text) for text in args.link or [])
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    modes = KEY_MODES if args.key_mode == "both" else [args.key_mode]
+    df = build_model(args.profile or PROFILES, links, modes)
+    if df.empty:
+        parser.error("no benchmark results found")
+
+    csv_path = f"{args.output}.csv"
+    df.to_csv(csv_path, index=False)
+    print(f"CSV saved: {csv_path}")
+    for mode in modes:
+        plot_model(df, f"{args.output}_{mode}.png", mode)
+
+
+if __name__ == "__main__":
+    main()
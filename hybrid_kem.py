@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+# Label of the combiner KDF (HKDF info prefix)
+LABEL = b"pqc-benchmark hybrid kem v1"
+
+_executor = None
+
+
+def _pool():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hybrid-classical")
+    return _executor
+
+
+# -------------------------------
+# Hybrid KEM from a classical and a post-quantum KEM (same call shape)
+# KeyGen:  both keypairs, public key = classical || PQ public key,
+#          secret key = (classical, PQ) secret key
+# Encaps:  both encapsulations, ciphertext = classical || PQ ciphertext
+# Decaps:  split the ciphertext, both decapsulations
+# Shared key = HKDF-SHA256(classical || PQ shared secret,
+#                          info = label || ciphertext), 32 bytes
+# The PQ public key / ciphertext sizes (fixed per parameter set) locate
+# the split point. With concurrent=True the classical half runs in a
+# worker thread while the calling thread runs the PQ half; this only
+# overlaps where the bindings release the GIL.
+# -------------------------------
+def hybrid_kem(classical, pq, pq_public_key_size, pq_ciphertext_size, concurrent=False):
+    c_gen, c_enc, c_dec = classical
+    pq_gen, pq_enc, pq_dec = pq
+
+    def both(classical_call, pq_call):
+        if not concurrent:
+            return classical_call(), pq_call()
+        future = _pool().submit(classical_call)
+        pq_result = pq_call()
+        return future.result(), pq_result
+
+    def combine(classical_shared, pq_shared, ciphertext):
+        kdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=LABEL + ciphertext)
+        return kdf.derive(classical_shared + pq_shared)
+
+    def generate_keypair():
+        (c_pk, c_sk), (pq_pk, pq_sk) = both(c_gen, pq_gen)
+        return c_pk + pq_pk, (c_sk, pq_sk)
+
+    def encrypt(public_key):
+        split = len(public_key) - pq_public_key_size
+        (c_ct, c_ss), (pq_ct, pq_ss) = both(lambda: c_enc(public_key[:split]),
+                                            lambda: pq_enc(public_key[split:]))
+        ciphertext = c_ct + pq_ct
+        return ciphertext, combine(c_ss, pq_ss, ciphertext)
+
+    def decrypt(secret_key, ciphertext):
+        c_sk, pq_sk = secret_key
+        split = len(ciphertext) - pq_ciphertext_size
+        c_ss, pq_ss = both(lambda: c_dec(c_sk, ciphertext[:split]),
+                           lambda: pq_dec(pq_sk, ciphertext[split:]))
+        return combine(c_ss, pq_ss, ciphertext)
+
+    return generate_keypair, encrypt, decrypt
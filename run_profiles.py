@@ -0,0 +1,190 @@
+import argparse
+import math
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from bench_cgroup import create_limited_cgroup, join_cgroup, remove_cgroup
+from bench_env import parse_cpu_list
+
+# -------------------------------
+# Profiles (same limits as the docker run examples in the README)
+# -------------------------------
+PROFILES = {
+    "Mobile": {"cpus": 0.5, "memory_mb": 500},
+    "Laptop": {"cpus": 2, "memory_mb": 4096},
+    "Server": {"cpus": 8, "memory_mb": 16384},
+}
+
+# Suite -> the script the Docker image runs for it (same CSVs and plots)
+SUITES = {
+    "HQC": "benchmark_kem.py",
+    "ML-KEM": "benchmark_mlkem.py",
+    "McEliece": "benchmark_mceliece.py",
+    "ECC": "benchmark_ecc.py",
+    "Hybrid": "benchmark_hybrid.py",
+}
+DEFAULT_SUITES = ("HQC", "ML-KEM", "McEliece", "ECC")
+
+# Longest suites first, so they don't end up alone at the end of the run
+SUITE_ORDER = ["McEliece", "HQC", "Hybrid", "ECC", "ML-KEM"]
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# -------------------------------
+# One job = one algorithm suite in one profile
+# -------------------------------
+def plan_jobs(profiles, suites):
+    rank = {suite: i for i, suite in enumerate(SUITE_ORDER)}
+    suites = sorted(suites, key=lambda suite: rank.get(suite, len(rank)))
+    jobs = []
+    for suite in suites:
+        for profile in profiles:
+            limits = PROFILES[profile]
+            jobs.append({
+                "profile": profile,
+                "suite": suite,
+                "cores": max(1, math.ceil(limits["cpus"])),
+                "cpus": limits["cpus"],
+                "memory": limits["memory_mb"] * 1024 * 1024,
+            })
+    return jobs
+
+
+# -------------------------------
+# Can this host give a job a CPU quota? Without one, a fractional --cpus
+# (Mobile: 0.5) would silently become a whole pinned core, without the
+# CFS throttling that profile is about.
+# -------------------------------
+def quota_available():
+    cgroup = create_limited_cgroup(f"pqc-probe-{os.getpid()}", 1, 1 << 30)
+    remove_cgroup(cgroup)
+    return cgroup is not None
+
+
+def _fractional(job):
+    return job["cpus"] != int(job["cpus"])
+
+
+# -------------------------------
+# Runs in the forked child before exec: join the limit cgroup, or fall
+# back to RLIMIT_AS for the memory limit, then pin to the job's cores.
+# RLIMIT_AS limits address space, not RSS, so it is stricter than
+# docker --memory; it is only used when no cgroup can be created.
+# -------------------------------
+def _limit_child(cores, cgroup, memory):
+    def apply():
+        if cgroup:
+            join_cgroup(cgroup)
+        else:
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        os.sched_setaffinity(0, cores)
+    return apply
+
+
+# -------------------------------
+# Start one job on the given cores, returns the running job
+# -------------------------------
+def start_job(job, cores):
+    name = f"pqc-{job['profile']}-{job['suite']}-{os.getpid()}".lower()
+    cgroup = create_limited_cgroup(name, job["cpus"], job["memory"])
+    if cgroup is None and _fractional(job):
+        raise RuntimeError(f"{job['profile']} / {job['suite']}: could not create the cgroup "
+                           f"for the {job['cpus']} CPU quota")
+    limits = "cgroup quota" if cgroup else "affinity + RLIMIT_AS"
+
+    # BENCH_LIMITS ends up in the *.meta.json snapshot of every result file
+    env = dict(os.environ, PROFILE=job["profile"], BENCH_LIMITS=limits)
+    env.setdefault("MPLBACKEND", "Agg")
+    env.pop("BENCH_CPUS", None)  # affinity comes from the orchestrator
+
+    os.makedirs(job["profile"], exist_ok=True)
+    log_path = os.path.join(job["profile"], f"run_{job['suite'].lower()}.log")
+    log = open(log_path, "w")
+    cmd = [sys.executable, os.path.join(_HERE, SUITES[job["suite"]])]
+    process = subprocess.Popen(cmd, cwd=os.getcwd(), env=env, stdout=log, stderr=subprocess.STDOUT,
+                               preexec_fn=_limit_child(cores, cgroup, job["memory"]))
+
+    print(f"[start] {job['profile']:<7} {job['suite']:<9} cores {sorted(cores)} ({limits})")
+    return {**job, "process": process, "assigned": cores, "cgroup": cgroup, "log": log,
+            "log_path": log_path, "started": time.perf_counter()}
+
+
+def _finish(running):
+    running["log"].close()
+    remove_cgroup(running["cgroup"])
+    status = "ok" if running["process"].returncode == 0 else f"exit {running['process'].returncode}"
+    elapsed = time.perf_counter() - running["started"]
+    print(f"[done]  {running['profile']:<7} {running['suite']:<9} {elapsed:7.1f} s  {status}  "
+          f"(log: {running['log_path']})")
+    return running["process"].returncode
+
+
+# -------------------------------
+# Run all jobs concurrently on disjoint core sets
+# Greedy: whenever enough cores are free, the next job in the queue that
+# fits is started; jobs needing more cores than available get all of them.
+# -------------------------------
+def run_jobs(jobs, cores):
+    free = sorted(cores)
+    queue = list(jobs)
+    running = []
+    failures = 0
+    while queue or running:
+        for job in list(queue):
+            need = min(job["cores"], len(cores))
+            if need <= len(free):
+                assigned, free = set(free[:need]), free[need:]
+                running.append(start_job(job, assigned))
+                queue.remove(job)
+
+        time.sleep(0.2)
+        for job in [j for j in running if j["process"].poll() is not None]:
+            running.remove(job)
+            free = sorted(free + list(job["assigned"]))
+            failures += _finish(job) != 0
+    return failures
+
+
+# -------------------------------
+# Main execution
+# -------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run every profile x algorithm suite locally, without Docker")
+    parser.add_argument("--profile", action="append", choices=list(PROFILES),
+                        help="profile to run (repeatable, default: all)")
+    parser.add_argument("--family", action="append", choices=list(SUITES),
+                        help="algorithm suite to run (repeatable, default: HQC, ML-KEM, McEliece, ECC)")
+    parser.add_argument("--cores", help="cores to use, e.g. 0-15 (default: current affinity)")
+    parser.add_argument("--dry-run", action="store_true", help="print the jobs and exit")
+    args = parser.parse_args(argv)
+
+    cores = parse_cpu_list(args.cores) if args.cores else os.sched_getaffinity(0)
+    jobs = plan_jobs(args.profile or list(PROFILES), args.family or list(DEFAULT_SUITES))
+    if args.dry_run:
+        for job in jobs:
+            print(f"{job['profile']:<7} {job['suite']:<9} {SUITES[job['suite']]:<21} "
+                  f"{job['cores']} core(s), {job['cpus']} CPU quota, "
+                  f"{job['memory'] // (1024 * 1024)} MB")
+        return
+
+    fractional = sorted({job["profile"] for job in jobs if _fractional(job)})
+    if fractional and not quota_available():
+        parser.exit(1, f"{', '.join(fractional)}: a fractional CPU quota needs a writable cgroup "
+                       "hierarchy (root, or a delegated cgroup v2 subtree); affinity alone would "
+                       "give a whole core. Leave out --profile " + " / ".join(fractional)
+                       + " or use Docker.\n")
+
+    t0 = time.perf_counter()
+    failures = run_jobs(jobs, cores)
+    print(f"{len(jobs)} jobs on {len(cores)} cores in {time.perf_counter() - t0:.1f} s, "
+          f"{failures} failed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
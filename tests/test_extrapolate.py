@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bench_extrapolate
+from bench_extrapolate import extrapolation_grid, fit_models, predict, series_from_results
+
+SIZES = np.array([800, 1200, 1600, 2400, 3200])
+
+
+def series(times, x=SIZES, repeats=5, profile="P", operation="Encaps"):
+    return pd.DataFrame({
+        "Profile": profile, "Operation": operation,
+        "Algorithm": np.repeat([f"A{i}" for i in range(len(x))], repeats),
+        "x": np.repeat(x, repeats), "t": np.repeat(times, repeats),
+    })
+
+
+def selected(fits):
+    return fits[fits["Selected"]].reset_index(drop=True)
+
+
+def test_exact_power_law_selects_power():
+    fits = fit_models(series(0.002 * SIZES ** 1.5))
+    best = selected(fits)
+    assert len(best) == 1
+    assert best.loc[0, "Model"] == "power"
+    assert best.loc[0, "b"] == pytest.approx(1.5)
+    assert np.exp(best.loc[0, "a"]) == pytest.approx(0.002)
+    assert best.loc[0, "CV_rmse"] == pytest.approx(0, abs=1e-9)
+    assert best.loc[0, "Keys"] == 5
+    assert best.loc[0, "Samples"] == 25
+
+
+def test_exact_linear_series_selects_linear():
+    best = selected(fit_models(series(0.5 + 0.01 * SIZES)))
+    assert best.loc[0, "Model"] == "linear"
+    assert best.loc[0, "a"] == pytest.approx(0.5)
+    assert best.loc[0, "b"] == pytest.approx(0.01)
+
+
+def test_fit_uses_key_size_medians():
+    data = series(0.002 * SIZES ** 1.5, repeats=3)
+    data.loc[::3, "t"] *= 10
+    best = selected(fit_models(data))
+    assert best.loc[0, "b"] == pytest.approx(1.5)
+
+
+def test_two_key_sizes_keep_power_without_cv_or_band():
+    fits = fit_models(series(0.002 * SIZES[:2] ** 1.5, x=SIZES[:2]))
+    best = selected(fits)
+    assert best.loc[0, "Model"] == "power"
+    assert fits["CV_rmse"].isna().all()
+    prediction = predict(fits, [1000, 4000])
+    assert prediction["Time_ms"].notna().all()
+    assert prediction["High_ms"].isna().all()
+
+
+def test_groups_are_fitted_independently():
+    data = pd.concat([
+        series(0.002 * SIZES ** 1.5, operation="Encaps"),
+        series(0.5 + 0.01 * SIZES, operation="Decaps"),
+        series(0.001 * SIZES ** 2, profile="Q"),
+    ], ignore_index=True)
+    best = selected(fit_models(data)).set_index(["Profile", "Operation"])
+    assert len(best) == 3
+    assert best.loc[("P", "Encaps"), "Model"] == "power"
+    assert best.loc[("P", "Decaps"), "Model"] == "linear"
+    assert best.loc[("Q", "Encaps"), "b"] == pytest.approx(2.0)
+
+
+def test_prediction_band_contains_center():
+    rng = np.random.default_rng(4)
+    data = series(0.002 * SIZES ** 1.5)
+    data["t"] *= rng.lognormal(0, 0.05, len(data))
+    grid = extrapolation_grid(data["x"])
+    prediction = predict(fit_models(data), grid)
+    assert len(prediction) == len(grid)
+    assert grid[0] == SIZES[0] and grid[-1] == pytest.approx(2 * SIZES[-1])
+    assert (prediction["Low_ms"] < prediction["Time_ms"]).all()
+    assert (prediction["Time_ms"] < prediction["High_ms"]).all()
+
+
+def results_table():
+    return pd.DataFrame({"Algorithm": ["A", "B"], "PublicKeyBytes": [800, 1600],
+                         "Encaps_ms": [1.0, 2.0], "Decaps_ms": [0.0, 0.0]})
+
+
+def test_series_from_results_uses_medians_without_samples():
+    data = series_from_results(results_table(), "P")
+    assert list(data["Operation"]) == ["Encaps", "Encaps"]
+    assert list(data["x"]) == [800, 1600]
+    assert series_from_results(results_table(), "P", ops=("Decaps",)) is None
+
+
+def test_series_from_results_rejects_throttled_samples(monkeypatch):
+    samples = pd.DataFrame({"algorithm": ["A", "A", "B"], "operation": "Encaps",
+                            "wall_ms": [1.0, 9.0, 2.0], "throttled": [0, 1, 0]})
+    assert len(series_from_results(results_table(), "P", samples, ops=("Encaps",))) == 3
+    monkeypatch.setattr(bench_extrapolate, "THROTTLE_POLICY", "reject")
+    data = series_from_results(results_table(), "P", samples, ops=("Encaps",))
+    assert list(data["t"]) == [1.0, 2.0]
@@ -0,0 +1,56 @@
+import pytest
+
+from handshake_model import HEADER_BYTES, handshake_row, parse_link, transfer_time
+
+# 8 Mbit/s: 1 byte per microsecond
+LINK = {"bandwidth_mbps": 8, "rtt_ms": 10, "mtu": 1500, "initcwnd": 10}
+MSS = 1500 - HEADER_BYTES
+
+
+def test_single_segment():
+    ms, rounds, wire = transfer_time(1000, LINK)
+    assert (rounds, wire) == (1, 1040)
+    assert ms == pytest.approx(1.04 + 5)
+
+
+def test_second_round_waits_for_serialization():
+    # 10 full segments take 15 ms to serialize, longer than the RTT
+    ms, rounds, wire = transfer_time(11 * MSS, LINK)
+    assert (rounds, wire) == (2, 11 * 1500)
+    assert ms == pytest.approx(15 + 1.5 + 5)
+
+
+def test_second_round_waits_for_rtt():
+    fast = dict(LINK, bandwidth_mbps=1000)
+    ms, rounds, _ = transfer_time(11 * MSS, fast)
+    assert rounds == 2
+    assert ms == pytest.approx(10 + 0.012 + 5)
+
+
+@pytest.mark.parametrize("segments, rounds", [(1, 1), (10, 1), (11, 2), (30, 2), (31, 3), (70, 3), (71, 4)])
+def test_slow_start_rounds(segments, rounds):
+    assert transfer_time(segments * MSS, LINK)[1] == rounds
+
+
+def test_initcwnd_and_mtu():
+    link = dict(LINK, mtu=9000, initcwnd=4)
+    assert transfer_time(4 * (9000 - HEADER_BYTES), link)[1] == 1
+    assert transfer_time(4 * (9000 - HEADER_BYTES) + 1, link)[1] == 2
+
+
+def test_parse_link():
+    assert parse_link("Lab:8:10") == ("Lab", LINK)
+    assert parse_link("Jumbo:100:1:9000:4")[1] == {"bandwidth_mbps": 100, "rtt_ms": 1, "mtu": 9000,
+                                                   "initcwnd": 4}
+    with pytest.raises(ValueError):
+        parse_link("Lab:8")
+
+
+def test_handshake_row_key_modes():
+    result = {"Algorithm": "X", "Family": "F", "PublicKeyBytes": 1000, "CiphertextBytes": 1000,
+              "KeyGen_ms": 3.0, "Encaps_ms": 1.0, "Decaps_ms": 2.0}
+    ephemeral = handshake_row(result, "P", "Lab", LINK, "ephemeral")
+    static = handshake_row(result, "P", "Lab", LINK, "static")
+    assert ephemeral["WireBytes"] == 2080
+    assert ephemeral["Total_ms"] == pytest.approx(6.0 + 10 + 2 * 6.04)
+    assert static["Total_ms"] == pytest.approx(3.0 + 10 + 2 * 6.04)
@@ -0,0 +1,75 @@
+import pytest
+
+pytest.importorskip("pqcrypto")
+
+from bench_keypool import (HEADER_SIZE, close_pool, generate_pool, open_pool, pool_count, pool_keypair,
+                           pool_keypairs, pool_path)
+from bench_registry import load, select
+
+
+@pytest.fixture(scope="module")
+def backend():
+    return select(algos=["ML-KEM-512"])[0]
+
+
+@pytest.fixture
+def pool_file(backend, tmp_path):
+    path = pool_path(backend, str(tmp_path))
+    generate_pool(backend, 3, path, workers=1)
+    return path
+
+
+def test_round_trip(backend, pool_file):
+    pool = open_pool(pool_file, backend)
+    try:
+        assert (pool["name"], pool["count"]) == ("ML-KEM-512", 3)
+        record = backend["public_key"] + backend["secret_key"]
+        with open(pool_file, "rb") as f:
+            assert len(f.read()) == HEADER_SIZE + 3 * record
+
+        _, encrypt, decrypt = load(backend)
+        keypairs = [pool_keypair(pool, i) for i in range(3)]
+        assert len({public_key for public_key, _ in keypairs}) == 3
+        for public_key, secret_key in keypairs:
+            assert len(public_key) == backend["public_key"] and len(secret_key) == backend["secret_key"]
+            ciphertext, shared = encrypt(public_key)
+            assert decrypt(secret_key, ciphertext) == shared
+    finally:
+        close_pool(pool)
+
+
+def test_pool_count(backend, pool_file, tmp_path):
+    assert pool_count(pool_file, backend) == 3
+    assert pool_count(str(tmp_path / "missing.kpool"), backend) == 0
+
+
+def test_wrong_backend_is_rejected(pool_file):
+    other = select(algos=["ML-KEM-768"])[0]
+    with pytest.raises(ValueError, match="not ML-KEM-768"):
+        open_pool(pool_file, other)
+    assert pool_count(pool_file, other) == 0
+
+
+def test_truncated_file_is_rejected(backend, pool_file):
+    with open(pool_file, "r+b") as f:
+        f.truncate(HEADER_SIZE + backend["public_key"])
+    with pytest.raises(ValueError, match="truncated"):
+        open_pool(pool_file, backend)
+
+
+def test_not_a_pool_is_rejected(backend, tmp_path):
+    path = tmp_path / "junk.kpool"
+    path.write_bytes(b"\0" * (2 * HEADER_SIZE))
+    with pytest.raises(ValueError, match="not a keypair pool"):
+        open_pool(str(path), backend)
+    path.write_bytes(b"PQKP")
+    with pytest.raises(ValueError, match="not a keypair pool"):
+        open_pool(str(path), backend)
+
+
+def test_pool_keypairs_cycles(backend, pool_file, tmp_path):
+    keypairs = pool_keypairs(backend, str(tmp_path))
+    first = [next(keypairs) for _ in range(3)]
+    assert next(keypairs) == first[0]
+    keypairs.close()
+    assert pool_keypairs(backend, str(tmp_path / "empty")) is None
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import bench_regress
+from bench_regress import check_profile, compare_samples, format_table
+
+BASE = np.random.default_rng(5).normal(1.0, 0.02, 200)
+
+
+@pytest.mark.parametrize("method", bench_regress.METHODS)
+@pytest.mark.parametrize("scale, status", [(1.0, "ok"), (1.02, "ok"), (1.5, "REGRESSION"), (0.5, "faster")])
+def test_compare_samples_classification(method, scale, status):
+    result = compare_samples(BASE, BASE * scale, threshold=0.10, alpha=0.01, method=method)
+    assert result["Status"] == status
+    assert result["Ratio"] == pytest.approx(scale)
+    assert result["Base_n"] == result["New_n"] == len(BASE)
+
+
+def samples(run_id, rows):
+    return pd.DataFrame([{"run_id": run_id, "result_set": "kem_benchmark", "algorithm": algorithm,
+                          "operation": operation, "wall_ms": wall_ms, "throttled": throttled}
+                         for algorithm, operation, wall_ms, throttled in rows])
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    frames = {
+        1: samples(1, [("A", "Encaps", ms, 0) for ms in BASE[:50]]
+                   + [("A", "Decaps", ms, 0) for ms in BASE[:50]]
+                   + [("B", "Encaps", ms, 0) for ms in BASE[:50]]),
+        2: samples(2, [("A", "Encaps", ms * 1.5, 0) for ms in BASE[50:100]]
+                   + [("B", "Encaps", ms, 1) for ms in BASE[50:100]]),
+    }
+    monkeypatch.setattr(bench_regress, "load_run_samples",
+                        lambda run_ids: pd.concat([frames[r] for r in run_ids], ignore_index=True))
+
+
+def test_check_profile_reports_missing_and_all_throttled(runs):
+    rows = check_profile("P", {"kem_benchmark": 1}, {"kem_benchmark": 2})
+    status = {(row["Algorithm"], row["Operation"]): row["Status"] for row in rows}
+    assert status == {("A", "Encaps"): "REGRESSION", ("A", "Decaps"): "missing",
+                      ("B", "Encaps"): "all-throttled"}
+    assert all(s in bench_regress.FAILING for s in status.values())
+
+
+def test_format_table_orders_failures_first(runs):
+    table = format_table(pd.DataFrame(check_profile("P", {"kem_benchmark": 1}, {"kem_benchmark": 2})))
+    lines = table.splitlines()
+    assert lines[0].split()[:3] == ["Profile", "Algorithm", "Operation"]
+    assert [line.split()[-1] for line in lines[1:]] == ["REGRESSION", "missing", "all-throttled"]
+    assert "nan" not in table
+
+
+def test_format_table_with_only_missing_rows():
+    rows = [{"Profile": "P", "Algorithm": "A", "Operation": "Encaps", "Status": "missing"}]
+    table = format_table(pd.DataFrame(rows))
+    assert table.splitlines()[1].split() == ["P", "A", "Encaps", "missing"]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from bench_stats import bootstrap_ci, bootstrap_ratio_ci, mann_whitney_greater, summary_columns, t_quantile
+
+
+# Student t quantiles from the standard tables
+T_TABLE = [
+    (0.975, 1, 12.7062), (0.975, 2, 4.3027), (0.975, 3, 3.1824), (0.975, 4, 2.7764),
+    (0.975, 5, 2.5706), (0.975, 10, 2.2281), (0.975, 30, 2.0423),
+    (0.995, 3, 5.8409), (0.995, 4, 4.6041), (0.995, 10, 3.1693), (0.95, 7, 1.8946),
+]
+
+
+@pytest.mark.parametrize("p, dof, expected", T_TABLE)
+def test_t_quantile_matches_table(p, dof, expected):
+    assert float(t_quantile(p, dof)) == pytest.approx(expected, rel=1e-3)
+
+
+def test_t_quantile_exact_below_five_dof():
+    assert float(t_quantile(0.995, 3)) == pytest.approx(5.840909, rel=1e-6)
+    assert float(t_quantile(0.975, 4)) == pytest.approx(2.776445, rel=1e-6)
+
+
+def test_t_quantile_vectorized_symmetric_and_normal_limit():
+    dof = np.array([0, 1, 3, 4, 10, 1e7])
+    upper, lower = t_quantile(0.975, dof), t_quantile(0.025, dof)
+    assert np.isnan(upper[0])
+    np.testing.assert_allclose(lower[1:], -upper[1:])
+    assert upper[-1] == pytest.approx(1.959964, rel=1e-6)
+
+
+def test_mann_whitney_exact_u():
+    u, p = mann_whitney_greater([1, 2, 3], [4, 5, 6])
+    assert u == 9
+    assert p < 0.05
+
+
+def test_mann_whitney_shifted_samples():
+    rng = np.random.default_rng(1)
+    base = rng.normal(1.0, 0.05, 200)
+    assert mann_whitney_greater(base, base + 0.05)[1] < 1e-6
+    assert mann_whitney_greater(base, base - 0.05)[1] > 0.999
+    assert mann_whitney_greater(base, rng.normal(1.0, 0.05, 200))[1] > 0.01
+
+
+def test_mann_whitney_all_ties_and_empty():
+    assert mann_whitney_greater([1, 1, 1], [1, 1, 1]) == (4.5, 1.0)
+    assert np.isnan(mann_whitney_greater([], [1.0])[1])
+
+
+def test_bootstrap_ci_brackets_the_median():
+    data = np.random.default_rng(2).lognormal(0, 0.2, 500)
+    low, high = bootstrap_ci(data)
+    assert low < np.median(data) < high
+    assert bootstrap_ci([3.0]) == (3.0, 3.0)
+    assert bootstrap_ci(np.full(50, 2.0)) == (2.0, 2.0)
+
+
+def test_bootstrap_ratio_ci_of_scaled_samples():
+    base = np.random.default_rng(3).normal(1.0, 0.01, 300)
+    ratio, low, high = bootstrap_ratio_ci(base, base * 2)
+    assert ratio == pytest.approx(2.0)
+    assert low <= 2.0 <= high
+
+
+def test_summary_columns_flags_near_floor():
+    columns = summary_columns("Encaps", [1.0, 2.0, 3.0], cpu_samples=[1.0, 1.0, 1.0], floor_ms=5.0)
+    assert columns["Encaps_ms"] == 2.0
+    assert columns["Encaps_n"] == 3
+    assert columns["Encaps_cpu_ms"] == 1.0
+    assert columns["Encaps_near_floor"]
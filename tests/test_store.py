@@ -0,0 +1,67 @@
+import math
+
+import pandas as pd
+import pytest
+
+import bench_store
+from bench_store import (baseline_runs, latest_run_id, latest_sample_runs, load_results, load_run_samples,
+                         pin_baseline, record, stage_samples)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench_store, "_run_ids", {})
+    monkeypatch.setattr(bench_store, "_staged", [])
+    return str(tmp_path / "results.sqlite")
+
+
+def new_process(monkeypatch):
+    monkeypatch.setattr(bench_store, "_run_ids", {})
+
+
+def table(encaps):
+    return pd.DataFrame({"Algorithm": ["A", "B"], "Encaps_ms": encaps, "Decaps_ms": [1.0, float("nan")]})
+
+
+def test_results_and_samples_round_trip(store, tmp_path):
+    stage_samples("A", "Encaps", [1.0, 2.0], [0.9, 1.9], [False, True])
+    stage_samples("C", "Encaps", [5.0], [5.0], [False])
+    csv_path = str(tmp_path / "Laptop" / "kem_benchmark.csv")
+    run_id = record(table([1.5, 2.5]), csv_path, path=store, metadata={})
+
+    assert latest_run_id("kem_benchmark", "Laptop", path=store) == run_id
+    results = load_results("kem_benchmark", "Laptop", path=store)
+    assert list(results.columns) == ["Algorithm", "Encaps_ms", "Decaps_ms"]
+    assert list(results["Encaps_ms"]) == [1.5, 2.5]
+    assert math.isnan(results.loc[1, "Decaps_ms"])
+
+    samples = load_run_samples([run_id], path=store)
+    assert list(samples["algorithm"]) == ["A", "A"]
+    assert list(samples["wall_ms"]) == [1.0, 2.0]
+    assert list(samples["throttled"]) == [0, 1]
+    assert bench_store._staged == [("C", "Encaps", [5.0], [5.0], [False])]
+
+
+def test_latest_run_and_baselines(store, tmp_path, monkeypatch):
+    csv_path = str(tmp_path / "Laptop" / "kem_benchmark.csv")
+    stage_samples("A", "Encaps", [1.0], [1.0], [False])
+    first = record(table([1.0, 2.0]), csv_path, path=store, metadata={})
+    new_process(monkeypatch)
+    stage_samples("A", "Encaps", [3.0], [3.0], [False])
+    second = record(table([3.0, 4.0]), csv_path, path=store, metadata={})
+
+    assert first != second
+    assert latest_run_id("kem_benchmark", "Laptop", path=store) == second
+    assert list(load_results("kem_benchmark", "Laptop", first, path=store)["Encaps_ms"]) == [1.0, 2.0]
+    assert load_results("kem_benchmark", "Server", path=store) is None
+
+    assert pin_baseline("Laptop", path=store) == {"kem_benchmark": second}
+    assert latest_sample_runs("Laptop", exclude={second}, path=store) == {"kem_benchmark": first}
+    pin_baseline("Laptop", runs={"kem_benchmark": first}, path=store)
+    assert baseline_runs("Laptop", path=store) == {"kem_benchmark": first}
+
+
+def test_disabled_store_records_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(bench_store, "STORE_PATH", "")
+    assert record(table([1.0, 2.0]), str(tmp_path / "Laptop" / "kem_benchmark.csv")) is None
+    assert list(tmp_path.iterdir()) == []
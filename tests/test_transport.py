@@ -0,0 +1,50 @@
+import os
+import threading
+
+import pytest
+
+from bench_transport import STRATEGIES, connect_pair, recv_concat, recv_into, send_concat
+
+PAYLOADS = [b"", b"\x01", os.urandom(1000), os.urandom(300_000)]
+
+
+def send_all(send, sock, payloads):
+    thread = threading.Thread(target=lambda: [send(sock, payload) for payload in payloads])
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize("transport", ["socketpair", "tcp"])
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_framing_round_trip(strategy, transport):
+    send, recv = STRATEGIES[strategy]
+    client, server = connect_pair(transport, nodelay=True)
+    buffer = bytearray(max(map(len, PAYLOADS)) + 4)
+    with client, server:
+        sender = send_all(send, client, PAYLOADS)
+        received = [bytes(recv(server, buffer)) for _ in PAYLOADS]
+        sender.join()
+    assert received == PAYLOADS
+
+
+@pytest.mark.parametrize("send, recv", [(send_concat, recv_into),
+                                        (STRATEGIES["sendmsg"][0], recv_concat)])
+def test_strategies_share_the_wire_format(send, recv):
+    client, server = connect_pair("socketpair")
+    buffer = bytearray(max(map(len, PAYLOADS)) + 4)
+    with client, server:
+        sender = send_all(send, client, PAYLOADS)
+        received = [bytes(recv(server, buffer)) for _ in PAYLOADS]
+        sender.join()
+    assert received == PAYLOADS
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_closed_peer_raises(strategy):
+    recv = STRATEGIES[strategy][1]
+    client, server = connect_pair("socketpair")
+    with server:
+        client.sendall(b"\x10\x00\x00\x00partial")
+        client.close()
+        with pytest.raises(ConnectionError):
+            recv(server, bytearray(20))